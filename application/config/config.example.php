@@ -238,6 +238,19 @@ $config['log_threshold'] = 0;
 */
 $config['log_path'] = '';
 
+/*
+|--------------------------------------------------------------------------
+| Request Timing Log
+|--------------------------------------------------------------------------
+|
+| Full path of an NDJSON file that the Request_timing hooks append one line
+| per request to: route, total and controller time, query count and time,
+| and outbound curl time. Needs 'save_queries' => TRUE in database.php for
+| the query figures. Leave BLANK to disable.
+|
+*/
+$config['request_timing_log'] = '';
+
 /*
 |--------------------------------------------------------------------------
 | Log File Extension
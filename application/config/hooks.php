@@ -65,3 +65,17 @@ $hook['post_controller_constructor'][] = array(
     'filename' => 'MyConfig.php',
     'filepath' => 'hooks'
 );
+
+$hook['pre_controller'][] = array(
+    'class'    => 'Request_timing',
+    'function' => 'start',
+    'filename' => 'request_timing.php',
+    'filepath' => 'hooks'
+);
+
+$hook['post_controller'][] = array(
+    'class'    => 'Request_timing',
+    'function' => 'record',
+    'filename' => 'request_timing.php',
+    'filepath' => 'hooks'
+);
@@ -306,7 +306,7 @@ class Area extends CI_Controller
             curl_setopt($ch, CURLOPT_POST, true);
             curl_setopt($ch, CURLOPT_POSTFIELDS, $data);
 
-            $response = curl_exec($ch);
+            $response = timed_curl_exec($ch);
 
             if (curl_errno($ch)) {
                 $this->response['error'] = true;
@@ -4032,7 +4032,7 @@ class Api extends CI_Controller
             curl_setopt($ch, CURLOPT_POSTFIELDS, $post_data);
             curl_setopt($ch, CURLOPT_RETURNTRANSFER, true);
             curl_setopt($ch, CURLOPT_HTTPHEADER, array("Content-Type: application/json"));
-            $paytm_response = curl_exec($ch);
+            $paytm_response = timed_curl_exec($ch);
 
             if (!empty($paytm_response)) {
                 $paytm_response = json_decode($paytm_response, true);
@@ -7072,7 +7072,7 @@ class Api extends CI_Controller
             curl_setopt($ch, CURLOPT_POST, true);
             curl_setopt($ch, CURLOPT_POSTFIELDS, $data);
 
-            $response = curl_exec($ch);
+            $response = timed_curl_exec($ch);
 
             if (curl_errno($ch)) {
                 $this->response['error'] = true;
@@ -7171,7 +7171,7 @@ class Api extends CI_Controller
                 ],
             ]);
 
-            $result = curl_exec($ch);
+            $result = timed_curl_exec($ch);
             $http_code = curl_getinfo($ch, CURLINFO_HTTP_CODE);
             $curl_error = curl_error($ch);
             curl_close($ch);
@@ -7225,7 +7225,7 @@ class Api extends CI_Controller
                 CURLOPT_USERAGENT => 'Erestro Application/1.0'
             ]);
 
-            $result = curl_exec($ch);
+            $result = timed_curl_exec($ch);
             $http_code = curl_getinfo($ch, CURLINFO_HTTP_CODE);
             $curl_error = curl_error($ch);
             curl_close($ch);
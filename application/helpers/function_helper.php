@@ -4311,6 +4311,19 @@ function orders_count($status = "", $branch_id = "", $rider_id = "")
     return $result[0]['total'];
 }
 
+function timed_curl_exec($ch)
+{
+    /* curl_exec() that adds its wall time, per host, to the request timing hook's record */
+    $started = microtime(true);
+    $response = curl_exec($ch);
+    if (isset($GLOBALS['request_timing'])) {
+        $host = parse_url((string) curl_getinfo($ch, CURLINFO_EFFECTIVE_URL), PHP_URL_HOST) ?: 'unknown';
+        $call = isset($GLOBALS['request_timing']['outbound'][$host]) ? $GLOBALS['request_timing']['outbound'][$host] : array(0, 0);
+        $GLOBALS['request_timing']['outbound'][$host] = array($call[0] + 1, $call[1] + (microtime(true) - $started) * 1000);
+    }
+    return $response;
+}
+
 function curl($url, $method = 'GET', $data = [], $authorization = "")
 {
     $ch = curl_init();
@@ -4336,7 +4349,7 @@ function curl($url, $method = 'GET', $data = [], $authorization = "")
     curl_setopt_array($ch, $curl_options);
 
     $result = array(
-        'body' => json_decode(curl_exec($ch), true),
+        'body' => json_decode(timed_curl_exec($ch), true),
         'http_code' => curl_getinfo($ch, CURLINFO_HTTP_CODE),
     );
     return $result;
@@ -4949,7 +4962,7 @@ function get_access_token()
     );
     curl_setopt($ch, CURLOPT_POSTFIELDS, $postData);
 
-    $response = curl_exec($ch);
+    $response = timed_curl_exec($ch);
     curl_close($ch);
 
     $responseData = json_decode($response, true);
@@ -5114,10 +5127,17 @@ function sendNotificationToPlatform($platform, $chunk, $url, $headers, $customBo
     }
 
     // Execute multi-curl request
+    $started = microtime(true);
     $running = null;
     do {
         curl_multi_exec($mh, $running);
     } while ($running > 0);
+    if (isset($GLOBALS['request_timing']) && !empty($curl_handles)) {
+        /* the handles run concurrently, so the batch's wall time is counted once against all of its calls */
+        $host = parse_url($url, PHP_URL_HOST) ?: 'unknown';
+        $call = isset($GLOBALS['request_timing']['outbound'][$host]) ? $GLOBALS['request_timing']['outbound'][$host] : array(0, 0);
+        $GLOBALS['request_timing']['outbound'][$host] = array($call[0] + count($curl_handles), $call[1] + (microtime(true) - $started) * 1000);
+    }
 
     // Handle responses
     foreach ($curl_handles as $ch) {
@@ -211,7 +211,7 @@ function curl_sms($url, $method = 'GET', $data = [], $headers = [])
     
 
     $result = array(
-        'body' => json_decode(curl_exec($ch), true),
+        'body' => json_decode(timed_curl_exec($ch), true),
         'http_code' => curl_getinfo($ch, CURLINFO_HTTP_CODE),
     );
     return $result;
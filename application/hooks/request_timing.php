@@ -0,0 +1,78 @@
+<?php
+
+/*
+ * Per-request phase timing.
+ *
+ * start() runs as a pre_controller hook and record() as a post_controller hook;
+ * record() is also registered for shutdown so requests that die() early (a
+ * rejected token in the Api constructor) still leave a line.
+ * When $config['request_timing_log'] names a file, each request appends one
+ * NDJSON line to it:
+ *
+ *   {"id":"<X-Request-Id>","ts":1718000000.123,"m":"api/get_products","st":200,
+ *    "t":41.2,"c":38.9,"q":12,"qt":21.7,"o":1,"ot":9.8,"out":{"maps.googleapis.com":[1,9.8]},
+ *    "mem":6291456}
+ *
+ * t is ms since CodeIgniter started, c the controller's share of it, q/qt the
+ * query count and ms (needs save_queries), o/ot the outbound curl calls made
+ * through timed_curl_exec() and their ms, broken down by host in "out".
+ * request_timing_report.py aggregates the log.
+ */
+class Request_timing
+{
+    function start()
+    {
+        $GLOBALS['request_timing'] = array(
+            'started' => microtime(true),
+            'outbound' => array(),
+            'recorded' => false,
+        );
+        register_shutdown_function(array($this, 'record'));
+    }
+
+    function record()
+    {
+        $CI = &get_instance();
+        $path = $CI->config->item('request_timing_log');
+        if (empty($path) || empty($GLOBALS['request_timing']) || $GLOBALS['request_timing']['recorded']) {
+            return;
+        }
+        $GLOBALS['request_timing']['recorded'] = true;
+        $timing = $GLOBALS['request_timing'];
+
+        $query_ms = 0;
+        $queries = 0;
+        if (isset($CI->db) && !empty($CI->db->query_times)) {
+            $queries = count($CI->db->query_times);
+            $query_ms = array_sum($CI->db->query_times) * 1000;
+        }
+        $outbound = 0;
+        $outbound_ms = 0;
+        $hosts = array();
+        foreach ($timing['outbound'] as $host => $call) {
+            $outbound += $call[0];
+            $outbound_ms += $call[1];
+            $hosts[$host] = array($call[0], round($call[1], 3));
+        }
+
+        $now = microtime(true);
+        $record = array(
+            'id' => (string) $CI->input->get_request_header('X-Request-Id', TRUE),
+            'ts' => round($timing['started'], 3),
+            'm' => strtolower($CI->router->fetch_directory() . $CI->router->fetch_class() . '/' . $CI->router->fetch_method()),
+            'st' => http_response_code(),
+            't' => round(($now - $CI->benchmark->marker['total_execution_time_start']) * 1000, 3),
+            'c' => round(($now - $timing['started']) * 1000, 3),
+            'q' => $queries,
+            'qt' => round($query_ms, 3),
+            'o' => $outbound,
+            'ot' => round($outbound_ms, 3),
+            'mem' => memory_get_peak_usage(),
+        );
+        if (!empty($hosts)) {
+            $record['out'] = $hosts;
+        }
+        // one write per line; O_APPEND keeps lines from concurrent workers whole
+        file_put_contents($path, json_encode($record) . "\n", FILE_APPEND);
+    }
+}
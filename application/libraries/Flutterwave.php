@@ -98,7 +98,7 @@ class Flutterwave
             ),
         ));
 
-        $response = curl_exec($this->curl);
+        $response = timed_curl_exec($this->curl);
         curl_close($this->curl);
         return $response;
     }
@@ -97,7 +97,7 @@ class Google_maps
         curl_setopt($ch, CURLOPT_POST, true);
         curl_setopt($ch, CURLOPT_POSTFIELDS, json_encode($data));
 
-        $response = curl_exec($ch);
+        $response = timed_curl_exec($ch);
 
         if (curl_errno($ch)) {
             echo 'Curl error: ' . curl_error($ch);
@@ -130,7 +130,7 @@ class Google_maps
         }
         curl_setopt_array($ch, $curl_options);
         $result = array(
-            'body' => curl_exec($ch),
+            'body' => timed_curl_exec($ch),
             'http_code' => curl_getinfo($ch, CURLINFO_HTTP_CODE),
         );
         return $result;
@@ -172,7 +172,7 @@ class Paypal_lib
         curl_setopt($ch, CURLOPT_POST, 1);
         curl_setopt($ch, CURLOPT_RETURNTRANSFER, true);
         curl_setopt($ch, CURLOPT_POSTFIELDS, $req);
-        $result = curl_exec($ch);
+        $result = timed_curl_exec($ch);
         curl_close($ch);
 
         return $result;
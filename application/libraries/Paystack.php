@@ -141,7 +141,7 @@ class Paystack{
 			),
 		));
 		
-		$response = curl_exec($this->curl);
+		$response = timed_curl_exec($this->curl);
 		
 		curl_close($this->curl);
 		return $response;
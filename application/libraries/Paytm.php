@@ -85,7 +85,7 @@ class Paytm
         curl_setopt($ch, CURLOPT_POSTFIELDS, $post_data);
         curl_setopt($ch, CURLOPT_RETURNTRANSFER, true);
         curl_setopt($ch, CURLOPT_HTTPHEADER, array("Content-Type: application/json"));
-        $response = curl_exec($ch);
+        $response = timed_curl_exec($ch);
         return json_decode($response,true);
     }
 
@@ -109,7 +109,7 @@ class Paytm
         curl_setopt($ch, CURLOPT_POSTFIELDS, $post_data);
         curl_setopt($ch, CURLOPT_RETURNTRANSFER, true);
         curl_setopt($ch, CURLOPT_HTTPHEADER, array("Content-Type: application/json"));
-        $response = curl_exec($ch);
+        $response = timed_curl_exec($ch);
         print_r($response);
         return false;
         return json_decode($response,true);
@@ -141,7 +141,7 @@ class Paytm
         curl_setopt($ch, CURLOPT_POSTFIELDS, $post_data);
         curl_setopt($ch, CURLOPT_RETURNTRANSFER, true);
         curl_setopt($ch, CURLOPT_HTTPHEADER, array("Content-Type: application/json"));
-        $response = curl_exec($ch);
+        $response = timed_curl_exec($ch);
         return $response;
     }
     static public function generateSignature($params, $key)
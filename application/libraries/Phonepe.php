@@ -187,7 +187,7 @@ class Phonepe
         }
         curl_setopt_array($ch, $curl_options);
         $result = array(
-            'body' => curl_exec($ch),
+            'body' => timed_curl_exec($ch),
             'http_code' => curl_getinfo($ch, CURLINFO_HTTP_CODE),
         );
         return $result;
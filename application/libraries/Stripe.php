@@ -121,7 +121,7 @@ class Stripe
         }
         curl_setopt_array($ch, $curl_options);
         $result = array(
-            'body' => curl_exec($ch),
+            'body' => timed_curl_exec($ch),
             'http_code' => curl_getinfo($ch, CURLINFO_HTTP_CODE),
         );
         return $result;
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Persist load-test runs in SQLite by git commit and flag p95/p99/throughput regressions between builds
+"""
+
+import argparse
+import bisect
+import json
+import math
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+
+from latency_histogram import LatencyHistogram
+
+STORE_FILE = ".bench_results.sqlite"
+BOOTSTRAP = 2000
+CONFIDENCE = 0.95
+THRESHOLD = 0.10
+# absolute rise in error rate treated as a regression
+ERROR_THRESHOLD = 0.01
+METRICS = ("p95", "p99", "throughput", "errors")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    commit_sha TEXT NOT NULL,
+    dirty INTEGER NOT NULL,
+    scenario TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    started REAL NOT NULL,
+    elapsed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_commit ON runs (commit_sha, scenario);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    endpoint TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    failures INTEGER NOT NULL DEFAULT 0,
+    throughput REAL NOT NULL,
+    histogram TEXT NOT NULL,
+    PRIMARY KEY (run_id, endpoint)
+);
+"""
+
+
+def git_commit(ref="HEAD"):
+    """(full sha, dirty) of the working tree; ("unknown", False) outside git"""
+    try:
+        sha = subprocess.run(["git", "rev-parse", ref], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return sha, bool(dirty)
+
+
+def open_store(path=STORE_FILE):
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA foreign_keys = ON")
+    db.executescript(SCHEMA)
+    if "failures" not in {row[1] for row in db.execute("PRAGMA table_info(results)")}:
+        db.execute("ALTER TABLE results ADD COLUMN failures INTEGER NOT NULL DEFAULT 0")
+    return db
+
+
+def save_run(stats, elapsed, scenario, tool, path=STORE_FILE, commit=None):
+    """Store {endpoint: EndpointStats} from one run and return the run id.
+
+    `count` is completed requests and `errors` the HTTP/API errors among
+    them; timeouts and connection failures go to `failures`. Endpoints
+    where every attempt failed are kept so a comparison can flag them.
+    """
+    sha, dirty = commit or git_commit()
+    with open_store(path) as db:
+        run_id = db.execute("INSERT INTO runs (commit_sha, dirty, scenario, tool, started, elapsed) "
+                            "VALUES (?, ?, ?, ?, ?, ?)",
+                            (sha, dirty, scenario, tool, time.time() - elapsed, elapsed)).lastrowid
+        db.executemany("INSERT INTO results (run_id, endpoint, count, errors, failures, throughput, histogram) "
+                       "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       [(run_id, endpoint, s.count, s.http_errors + s.api_errors, s.failures,
+                         s.count / elapsed if elapsed else 0.0, json.dumps(s.latency.to_dict()))
+                        for endpoint, s in stats.items() if s.count or s.failures])
+    db.close()
+    return run_id
+
+
+def resolve_runs(db, ref, scenario):
+    """Run ids for `ref`: '#12' is one run, anything else a commit (prefix or git ref), all its runs"""
+    if ref.startswith("#"):
+        return [int(ref[1:])]
+    rows = db.execute("SELECT id FROM runs WHERE commit_sha LIKE ? AND scenario = ? ORDER BY id",
+                      (ref + "%", scenario)).fetchall()
+    if not rows:
+        sha, _ = git_commit(ref)
+        rows = db.execute("SELECT id FROM runs WHERE commit_sha = ? AND scenario = ? ORDER BY id",
+                          (sha, scenario)).fetchall()
+    return [row[0] for row in rows]
+
+
+class Sample:
+    """One endpoint's results for one side of a comparison, possibly over several runs"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.runs = []  # (count, elapsed) per run
+        self.attempts = 0
+        self.errors = 0  # HTTP/API errors plus failures, out of attempts
+
+    def add(self, count, errors, failures, elapsed, histogram):
+        self.histogram.merge(histogram)
+        self.runs.append((count, elapsed))
+        self.attempts += count + failures
+        # runs stored before failures had a column of their own counted them in errors
+        self.errors += min(errors + failures, count + failures)
+
+    @property
+    def count(self):
+        return self.histogram.count
+
+    def throughput(self):
+        return sum(c for c, _ in self.runs) / (sum(e for _, e in self.runs) or 1)
+
+    def error_rate(self):
+        return self.errors / self.attempts if self.attempts else 0.0
+
+
+def load_samples(db, run_ids):
+    samples = {}
+    for run_id in run_ids:
+        elapsed = db.execute("SELECT elapsed FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if elapsed is None:
+            raise ValueError(f"no run #{run_id}")
+        for endpoint, count, errors, failures, histogram in db.execute(
+                "SELECT endpoint, count, errors, failures, histogram FROM results WHERE run_id = ?", (run_id,)):
+            samples.setdefault(endpoint, Sample()).add(count, errors, failures, elapsed[0],
+                                                       LatencyHistogram.from_dict(json.loads(histogram)))
+    return samples
+
+
+class QuantileSampler:
+    """Draw bootstrap replicates of a percentile straight from histogram buckets.
+
+    The k-th smallest of n resampled values is F^-1(U) with U ~ Beta(k, n-k+1),
+    so each replicate costs one beta draw and a bisect instead of n draws.
+    """
+
+    def __init__(self, histogram):
+        self.n = histogram.count
+        self.cumulative = []
+        self.values = []
+        seen = 0
+        for low, high, c in histogram.buckets():
+            seen += c
+            self.cumulative.append(seen / self.n)
+            self.values.append(min(max((low + high - 1) // 2, histogram.min), histogram.max))
+
+    def draw(self, q, rng):
+        k = max(1, math.ceil(q / 100 * self.n))
+        u = rng.betavariate(k, self.n - k + 1)
+        return self.values[min(bisect.bisect_left(self.cumulative, u), len(self.values) - 1)]
+
+
+def bootstrap_ratio(draw_base, draw_head, iterations, rng, confidence=CONFIDENCE):
+    """Percentile interval of head/base over independent replicates"""
+    ratios = sorted(draw_head(rng) / (draw_base(rng) or 1e-9) for _ in range(iterations))
+    tail = (1 - confidence) / 2
+    return ratios[int(tail * (iterations - 1))], ratios[int((1 - tail) * (iterations - 1))]
+
+
+def throughput_draw(sample):
+    """Replicates of throughput: resample runs when there are several, else Poisson noise on the count"""
+    if len(sample.runs) > 1:
+        def draw(rng):
+            picked = [rng.choice(sample.runs) for _ in sample.runs]
+            return sum(c for c, _ in picked) / (sum(e for _, e in picked) or 1)
+    else:
+        count, elapsed = sample.runs[0]
+
+        def draw(rng):
+            return max(rng.gauss(count, math.sqrt(count)), 0.0) / (elapsed or 1)
+    return draw
+
+
+def compare_endpoint(base, head, metrics, threshold, error_threshold, iterations, rng):
+    """Rows of (metric, base value, head value, change, ci, regressed) for one endpoint.
+
+    Latency regresses when head/base is above 1 + threshold and its whole
+    confidence interval is above 1; throughput likewise below 1 - threshold.
+    Latency is skipped when a side completed no requests; its throughput
+    and error rate carry the regression instead.
+    """
+    rows = []
+    samplers = (QuantileSampler(base.histogram), QuantileSampler(head.histogram))
+    for metric in metrics:
+        if metric in ("p95", "p99") and not (base.count and head.count):
+            continue
+        if metric in ("p95", "p99"):
+            q = float(metric[1:])
+            b, h = base.histogram.percentile(q), head.histogram.percentile(q)
+            low, high = bootstrap_ratio(lambda r: samplers[0].draw(q, r), lambda r: samplers[1].draw(q, r),
+                                        iterations, rng)
+            change = h / b - 1 if b else 0.0
+            rows.append((metric, b / 1000, h / 1000, change, (low - 1, high - 1), change > threshold and low > 1))
+        elif metric == "throughput":
+            b, h = base.throughput(), head.throughput()
+            low, high = bootstrap_ratio(throughput_draw(base), throughput_draw(head), iterations, rng)
+            change = h / b - 1 if b else 0.0
+            rows.append((metric, b, h, change, (low - 1, high - 1), change < -threshold and high < 1))
+        elif metric == "errors":
+            b, h = base.error_rate(), head.error_rate()
+            diffs = sorted(rng.betavariate(head.errors + 1, head.attempts - head.errors + 1)
+                           - rng.betavariate(base.errors + 1, base.attempts - base.errors + 1)
+                           for _ in range(iterations))
+            tail = (1 - CONFIDENCE) / 2
+            low, high = diffs[int(tail * (iterations - 1))], diffs[int((1 - tail) * (iterations - 1))]
+            rows.append((metric, b, h, h - b, (low, high), h - b > error_threshold and low > 0))
+    return rows
+
+
+def changed_paths(base_sha, head_sha, paths):
+    """True when any of `paths` differs between the two commits"""
+    result = subprocess.run(["git", "diff", "--quiet", base_sha, head_sha, "--", *paths])
+    return result.returncode == 1
+
+
+def print_comparison(endpoint, rows):
+    units = {"p95": "ms", "p99": "ms", "throughput": "req/s", "errors": ""}
+    for metric, b, h, change, (low, high), regressed in rows:
+        if metric == "errors":
+            values = f"{b:>10.2%} → {h:<10.2%}{change * 100:>+8.2f}pp  [{low * 100:+.2f}, {high * 100:+.2f}]"
+        else:
+            values = f"{b:>10.2f} → {h:<10.2f}{change:>+9.1%}  [{low:+.1%}, {high:+.1%}] {units[metric]}"
+        print(f"{endpoint[-32:]:<32}{metric:<11}{values}{'  ⚠️  regression' if regressed else ''}")
+
+
+def list_runs(db, scenario=None, limit=20):
+    query = ("SELECT r.id, r.commit_sha, r.dirty, r.scenario, r.tool, r.started, r.elapsed, "
+             "COUNT(x.endpoint), COALESCE(SUM(x.count), 0) FROM runs r LEFT JOIN results x ON x.run_id = r.id "
+             + ("WHERE r.scenario = ? " if scenario else "") + "GROUP BY r.id ORDER BY r.id DESC LIMIT ?")
+    for row in db.execute(query, ((scenario,) if scenario else ()) + (limit,)):
+        run_id, sha, dirty, name, tool, started, elapsed, endpoints, requests = row
+        print(f"#{run_id:<5}{sha[:10]}{'+' if dirty else ' '} {time.strftime('%Y-%m-%d %H:%M', time.localtime(started))}"
+              f"  {name:<20}{tool:<16}{endpoints:>4} endpoints {requests:>8} requests {elapsed:>7.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stored benchmark runs and cross-build regression checks")
+    parser.add_argument("--store", default=STORE_FILE, help="SQLite file written by load_test.py --store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    listing = commands.add_parser("list", help="show recent runs")
+    listing.add_argument("--scenario")
+    listing.add_argument("--limit", type=int, default=20)
+    compare = commands.add_parser("compare", help="compare two builds; exit 1 on regressions with --fail")
+    compare.add_argument("base", help="commit (prefix or git ref) or #run-id")
+    compare.add_argument("head", nargs="?", default="HEAD", help="commit or #run-id (default: HEAD)")
+    compare.add_argument("--scenario", default="collection", help="scenario label the runs were stored under")
+    compare.add_argument("--endpoint", action="append", help="endpoints to compare (repeatable; default all shared)")
+    compare.add_argument("--metric", type=lambda s: s.split(","), default=list(METRICS),
+                         help=f"comma-separated metrics ({', '.join(METRICS)})")
+    compare.add_argument("--threshold", type=float, default=THRESHOLD,
+                         help="relative change in p95/p99/throughput that counts as a regression")
+    compare.add_argument("--error-threshold", type=float, default=ERROR_THRESHOLD,
+                         help="absolute rise in error rate that counts as a regression")
+    compare.add_argument("--bootstrap", type=int, default=BOOTSTRAP, help="bootstrap replicates")
+    compare.add_argument("--seed", type=int, default=1)
+    compare.add_argument("--changed", nargs="+", metavar="PATH",
+                         help="only gate when these paths differ between the commits, e.g. application/models/Cart_model.php")
+    compare.add_argument("--fail", action="store_true", help="exit with status 1 when a regression is flagged")
+    args = parser.parse_args()
+
+    db = open_store(args.store)
+    if args.command == "list":
+        list_runs(db, args.scenario, args.limit)
+        sys.exit(0)
+
+    unknown = set(args.metric) - set(METRICS)
+    if unknown:
+        parser.error(f"unknown metrics: {', '.join(sorted(unknown))}")
+    base_runs, head_runs = resolve_runs(db, args.base, args.scenario), resolve_runs(db, args.head, args.scenario)
+    for ref, runs in ((args.base, base_runs), (args.head, head_runs)):
+        if not runs:
+            parser.error(f"no stored {args.scenario} runs for {ref}")
+    base, head = load_samples(db, base_runs), load_samples(db, head_runs)
+    endpoints = args.endpoint or sorted(set(base) & set(head))
+    missing = [e for e in endpoints if e not in base or e not in head]
+    if missing:
+        parser.error(f"not measured on both sides: {', '.join(missing)}")
+
+    rng = random.Random(args.seed)
+    print(f"📊 {args.scenario}: {args.base} ({len(base_runs)} runs) → {args.head} ({len(head_runs)} runs), "
+          f"{CONFIDENCE:.0%} bootstrap intervals over {args.bootstrap} replicates")
+    regressions = []
+    for endpoint in endpoints:
+        rows = compare_endpoint(base[endpoint], head[endpoint], args.metric, args.threshold, args.error_threshold,
+                                args.bootstrap, rng)
+        print_comparison(endpoint, rows)
+        regressions.extend(f"{endpoint} {row[0]}" for row in rows if row[5])
+
+    gate = True
+    if args.changed:
+        shas = [db.execute("SELECT commit_sha FROM runs WHERE id = ?", (runs[-1],)).fetchone()[0]
+                for runs in (base_runs, head_runs)]
+        gate = changed_paths(*shas, args.changed)
+        if not gate:
+            print(f"ℹ️  {', '.join(args.changed)} unchanged between the builds; not gating")
+    if regressions:
+        print(f"⚠️  {len(regressions)} regressions: {', '.join(regressions)}")
+    else:
+        print("✅ No significant regressions")
+    sys.exit(1 if args.fail and gate and regressions else 0)
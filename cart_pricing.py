@@ -0,0 +1,620 @@
+#!/usr/bin/env python3
+"""
+Bulk cart pricing that mirrors get_cart_total, get_delivery_charge and validate_promo_code, for promo what-if runs
+"""
+
+import argparse
+import asyncio
+import csv
+import glob
+import json
+import math
+import os
+import random
+import re
+import shlex
+import subprocess
+import sys
+import time
+from array import array
+from collections import Counter, defaultdict
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+
+from generate_postman_collection import create_postman_collection
+from load_test import _against_target, collection_requests, send_spec
+from sql_schema import parse_schema
+from token_pool import TokenPool, mint_token
+
+# metres; the sphere radius ST_Distance_Sphere() uses when none is given
+EARTH_RADIUS = 6370986
+CONFORMANCE_SAMPLES = 50
+EXAMPLES = 5
+# columns read per table, in the order the loaders yield them
+COLUMNS = {
+    "products": ("id", "status"),
+    "product_variants": ("id", "product_id", "price", "special_price", "availability", "status"),
+    "cart": ("id", "user_id", "product_variant_id", "branch_id", "qty", "is_saved_for_later"),
+    "product_add_ons": ("id", "price"),
+    "cart_add_ons": ("id", "user_id", "cart_id", "product_id", "product_variant_id", "add_on_id", "qty"),
+    "branch": ("id", "latitude", "longitude"),
+    "cities": ("id", "delivery_charge_method", "fixed_charge", "per_km_charge", "range_wise_charges",
+               "min_order_amount_for_free_delivery"),
+    "addresses": ("id", "user_id", "city_id", "latitude", "longitude", "is_default"),
+    "orders": ("user_id", "promo_code"),
+    "promo_codes": ("id", "promo_code", "branch_id", "start_date", "end_date", "no_of_users", "minimum_order_amount",
+                    "discount", "discount_type", "max_discount_amount", "repeat_usage", "no_of_repeat_usage", "status"),
+    "settings": ("variable", "value"),
+    "taxes": ("id", "percentage"),
+}
+NUMBER_PREFIX = re.compile(r"\s*([+-]?\d+(?:\.\d*)?(?:[eE][+-]?\d+)?)")
+# validate_promo_code() outcomes, indexed by the codes promo_outcome() returns
+PROMO_REASONS = ("valid", "not available or expired", "first-N-users limit reached", "below minimum order amount",
+                 "already redeemed", "usage limit exceeded")
+
+
+def mysql_table(args, database, table, columns):
+    """Stream one table's columns through the mysql client; NULL comes back as None"""
+    sql = "SELECT %s FROM `%s`" % (",".join(f"`{c}`" for c in columns), table)
+    with subprocess.Popen(["mysql", "--batch", "--raw", "--quick", "--skip-column-names", *shlex.split(args),
+                           database, "-e", sql], stdout=subprocess.PIPE, text=True) as proc:
+        for line in proc.stdout:
+            yield [None if v == "NULL" else v for v in line.rstrip("\n").split("\t")]
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, "mysql")
+
+
+def csv_table(directory, table, columns, schema):
+    """Stream one table's columns out of generate_synthetic_data.py CSV chunks; missing tables yield nothing"""
+    if table not in schema:
+        return
+    names = schema[table].column_names
+    picks = [names.index(c) for c in columns]
+    for path in sorted(glob.glob(os.path.join(directory, table, f"{table}.*.csv"))):
+        with open(path, newline="", encoding="utf-8") as f:
+            # the escape character turns \N into a bare N, which no column read here holds as a value
+            for row in csv.reader(f, escapechar="\\", doublequote=False):
+                yield [None if row[i] == "N" else row[i] for i in picks]
+
+
+def php_intval(value):
+    """intval() of a DB string: its leading number truncated, 0 when there is none"""
+    match = NUMBER_PREFIX.match(value or "")
+    return int(float(match.group(1))) if match else 0
+
+
+def php_floatval(value):
+    if value is None:
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+def php_round(value, places=0):
+    """round() as PHP does it: half away from zero on the shortest decimal form of the float"""
+    return float(Decimal(repr(value)).quantize(Decimal(1).scaleb(-places), ROUND_HALF_UP))
+
+
+def php_strval(value):
+    """(string) cast of a PHP number: 14 significant digits, integral floats without a fraction"""
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NAN"
+    if math.isinf(value):
+        return "INF" if value > 0 else "-INF"
+    text = "%.14G" % value
+    if "E" in text:
+        mantissa, exponent = text.split("E")
+        text = f"{mantissa if '.' in mantissa else mantissa + '.0'}E{int(exponent):+d}"
+    return text
+
+
+def sphere_distance(x1, y1, x2, y2):
+    """ST_Distance_Sphere(POINT(x1, y1), POINT(x2, y2)) in metres; MySQL reads x as longitude and y as latitude"""
+    lon1, lat1, lon2, lat2 = map(math.radians, (x1, y1, x2, y2))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(h))
+
+
+def dense(typecode, size, fill):
+    return array(typecode, [fill]) * size
+
+
+class CartData:
+    """Column arrays of the cart lines get_cart_total() would price, plus the lookups around them.
+
+    Variant prices are folded into one array indexed by variant id holding
+    the unit price (special_price when above zero) or NaN when the variant,
+    its product or its availability keeps it out of get_cart_total()'s query.
+    Only lines with qty != 0 that are not saved for later are kept.
+    """
+
+    def __init__(self):
+        self.cart_id = array("q")
+        self.user_id = array("q")
+        self.variant_id = array("q")
+        self.branch_id = array("q")
+        self.qty = array("q")
+        self.add_ons = array("d")  # Σ price × qty of the line's add-ons, as get_cart_add_ons() returns them
+        self.unit_price = array("d")
+        self.variant_product = array("q")
+        self.branches = {}  # id -> (latitude, longitude) strings
+        self.cities = {}  # id -> cities row
+        self.addresses = {}  # user id -> (address id, city id, latitude, longitude) of the default address
+        self.orders = Counter()  # user id -> orders placed
+        self.promo_orders = Counter()  # promo code -> orders using it
+        self.promo_user_orders = defaultdict(Counter)  # promo code -> user id -> orders using it
+        self.promos = defaultdict(dict)  # promo code -> branch id string -> promo_codes row
+        self.settings = {}
+        self.tax = None  # system tax percentage string, as strval() prints it
+
+    @classmethod
+    def load(cls, rows):
+        """Build from `rows(table)`, a callable yielding each table's COLUMNS values as strings or None"""
+        data = cls()
+        product_active = set()
+        for pid, status in rows("products"):
+            if status == "1":
+                product_active.add(int(pid))
+
+        variants = [(int(v[0]), int(v[1]), php_floatval(v[2]), php_floatval(v[3]), v[4], v[5])
+                    for v in rows("product_variants")]
+        size = max((v[0] for v in variants), default=0) + 1
+        data.unit_price = dense("d", size, math.nan)
+        data.variant_product = dense("q", size, 0)
+        for vid, pid, price, special, availability, status in variants:
+            data.variant_product[vid] = pid
+            if status == "1" and pid in product_active and availability in (None, "1"):
+                data.unit_price[vid] = special if special > 0 else price
+        del variants
+
+        for cid, uid, vid, branch, qty, saved in rows("cart"):
+            if qty in ("0", None) or saved != "0":
+                continue
+            data.cart_id.append(int(cid))
+            data.user_id.append(int(uid))
+            vid = int(vid)
+            # slot 0 is never a variant, so lines pointing at missing ones price as unavailable
+            data.variant_id.append(vid if vid < size else 0)
+            data.branch_id.append(int(branch or 0))
+            data.qty.append(php_intval(qty))
+        data.load_add_ons(rows)
+
+        data.branches = {int(b[0]): (b[1], b[2]) for b in rows("branch")}
+        data.cities = {int(c[0]): dict(zip(COLUMNS["cities"], c)) for c in rows("cities")}
+        for aid, uid, city, lat, lng, default in rows("addresses"):
+            uid, address = int(uid), (int(aid), int(city or 0), lat, lng, default == "1")
+            current = data.addresses.get(uid)
+            # the default address wins, otherwise the oldest one
+            if current is None or (not address[4], address[0]) < (not current[4], current[0]):
+                data.addresses[uid] = address
+        for uid, code in rows("orders"):
+            data.orders[int(uid)] += 1
+            if code:
+                data.promo_orders[code] += 1
+                data.promo_user_orders[code][int(uid)] += 1
+        for row in rows("promo_codes"):
+            promo = dict(zip(COLUMNS["promo_codes"], row))
+            data.promos[promo["promo_code"]].setdefault(promo["branch_id"], promo)
+
+        for variable, value in rows("settings"):
+            if variable == "system_settings" and value:
+                data.settings = json.loads(value)
+        taxes = {t[0]: t[1] for t in rows("taxes")}
+        data.tax = taxes.get(str(data.settings.get("tax")))
+        return data
+
+    def load_add_ons(self, rows):
+        """Sum each cart line's add-ons: rows matching the line's user, product and variant, one per add_on_id"""
+        prices = {int(a[0]): php_floatval(a[1]) for a in rows("product_add_ons")}
+        line_of = {cid: i for i, cid in enumerate(self.cart_id)}
+        picked = {}  # (line, add_on_id) -> (cart_add_ons id, price, qty); GROUP BY keeps the first row
+        for aid, uid, cid, pid, vid, add_on, qty in rows("cart_add_ons"):
+            i = line_of.get(int(cid))
+            add_on = int(add_on)
+            if i is None or add_on not in prices or int(uid) != self.user_id[i] or int(vid) != self.variant_id[i] \
+                    or int(pid) != self.variant_product[self.variant_id[i]]:
+                continue
+            key = (i, add_on)
+            if key not in picked or int(aid) < picked[key][0]:
+                picked[key] = (int(aid), prices[add_on], php_intval(qty))
+        self.add_ons = dense("d", len(self.cart_id), 0.0)
+        for (i, _), (_, price, qty) in sorted(picked.items()):
+            self.add_ons[i] += price * qty
+
+    def __len__(self):
+        return len(self.cart_id)
+
+
+class PricedCarts:
+    """One row per (user, branch) cart, as get_user_cart / get_delivery_charges would answer for it"""
+
+    def __init__(self):
+        self.user_id = array("q")
+        self.branch_id = array("q")
+        self.lines = array("l")
+        self.quantity = array("q")
+        self.sub_total = array("d")
+        self.tax_amount = array("d")
+        self.overall = array("d")  # the float get_user_cart's overall_amount carries
+        self.address_id = array("q")  # 0 when the user has no address
+        self.delivery_charge = []  # strings, as get_delivery_charges returns them
+        self.distance = array("d")
+        self.free_delivery = array("b")
+        self.skipped_lines = 0
+
+    def __len__(self):
+        return len(self.user_id)
+
+
+def price_carts(data):
+    """Price every (user, branch) cart the way get_cart_total() does.
+
+    Lines are summed newest first (ORDER BY c.id DESC) with the add-on total
+    appended last, so the float sums round exactly like PHP's array_sum().
+    """
+    priced = PricedCarts()
+    tax = php_floatval(data.tax)
+    unit_price, qty, add_ons = data.unit_price, data.qty, data.add_ons
+    users, branches, variants, ids = data.user_id, data.branch_id, data.variant_id, data.cart_id
+    order = sorted(range(len(data)), key=lambda i: (users[i], branches[i], -ids[i]))
+    start = 0
+    while start < len(order):
+        user, branch = users[order[start]], branches[order[start]]
+        end = start
+        total = 0
+        add_on_total = 0
+        quantity = lines = 0
+        while end < len(order) and users[order[end]] == user and branches[order[end]] == branch:
+            i = order[end]
+            end += 1
+            price = unit_price[variants[i]]
+            if price != price:
+                priced.skipped_lines += 1
+                continue
+            total += price * qty[i]
+            add_on_total += add_ons[i]
+            quantity += qty[i]
+            lines += 1
+        start = end
+        if not lines:
+            continue
+        total += add_on_total
+        amount_with_tax = total * (tax / 100)
+        priced.user_id.append(user)
+        priced.branch_id.append(branch)
+        priced.lines.append(lines)
+        priced.quantity.append(quantity)
+        priced.sub_total.append(total)
+        priced.tax_amount.append(amount_with_tax)
+        priced.overall.append(php_round(total + amount_with_tax, 2))
+        charge, distance, address = delivery_charge(data, user, branch)
+        priced.address_id.append(address)
+        priced.delivery_charge.append(charge)
+        priced.distance.append(distance)
+        priced.free_delivery.append(is_free_delivery(data, user, address, priced.overall[-1]))
+    return priced
+
+
+def delivery_charge(data, user, branch):
+    """get_delivery_charge() for the user's default address: (charge string, distance km, address id)"""
+    address = data.addresses.get(user)
+    if address is None:
+        return "0", 0.0, 0
+    address_id, city_id, lat, lng, _ = address
+    city = data.cities.get(city_id, {})
+    branch_lat, branch_lng = data.branches.get(branch, (None, None))
+    # POINT(latitude, longitude) on both sides, exactly as the helper passes them
+    metres = sphere_distance(php_floatval(lat), php_floatval(lng), php_floatval(branch_lat), php_floatval(branch_lng))
+    distance = php_round(metres / 1000, 1)
+    charge = "0"
+    method = city.get("delivery_charge_method")
+    if method == "fixed_charge":
+        charge = city.get("fixed_charge") or ""
+    elif method == "per_km_charge":
+        charge = php_strval(float(php_intval(city.get("per_km_charge")) * math.ceil(distance)))
+    elif method == "range_wise_charges":
+        try:
+            ranges = json.loads(city.get("range_wise_charges") or "null") or []
+        except ValueError:
+            ranges = []
+        rounded = php_round(distance)
+        for r in ranges:
+            if php_floatval(str(r.get("from_range"))) <= rounded <= php_floatval(str(r.get("to_range"))):
+                charge = str(php_intval(str(r.get("price"))))
+    return charge, distance, address_id
+
+
+def is_free_delivery(data, user, address_id, final_total):
+    """get_delivery_charges' is_free_delivery flag; a first order is one from a user with no orders yet"""
+    if not address_id:
+        return 0
+    if not data.orders.get(user):
+        settings = data.settings
+        return int(str(settings.get("free_delivery_on_first_order")) == "1"
+                   and final_total >= php_floatval(str(settings.get("minimum_cart_amt"))))
+    threshold = data.cities.get(data.addresses[user][1], {}).get("min_order_amount_for_free_delivery")
+    return int(bool(threshold) and threshold != "0" and final_total >= php_floatval(threshold))
+
+
+def promo_outcome(promo, final_total, used, user_used, today):
+    """validate_promo_code() for one cart: (reason index, final_total, discount, hit_flat_bug)"""
+    if promo is None or promo.get("status") != "1" or not (
+            (promo.get("start_date") or "") <= today <= (promo.get("end_date") or "")):
+        return 1, final_total, 0.0, False
+    if used >= php_intval(promo.get("no_of_users")):
+        return 2, final_total, 0.0, False
+    if final_total < php_intval(promo.get("minimum_order_amount")):
+        return 3, final_total, 0.0, False
+    repeat, limit = promo.get("repeat_usage"), php_intval(promo.get("no_of_repeat_usage"))
+    discount_value = php_floatval(promo.get("discount"))
+    flat_bug = False
+    if repeat == "1" and user_used <= limit:
+        if promo.get("discount_type") == "percentage":
+            discount = final_total * discount_value / 100
+        else:
+            discount = discount_value
+    elif repeat == "0" and user_used <= 0:
+        if user_used > limit:
+            return 5, final_total, 0.0, False
+        if promo.get("discount_type") == "percentage":
+            discount = final_total * discount_value / 100
+        else:
+            # the helper's repeat_usage=0 branch computes a flat discount as final_total - discount
+            discount = final_total - discount_value
+            flat_bug = True
+    else:
+        return 4, final_total, 0.0, False
+    maximum = promo.get("max_discount_amount")
+    # PHP compares a float with NULL as booleans, so a missing cap only keeps a zero discount
+    if (not discount) if maximum is None else discount <= php_floatval(maximum):
+        return 0, final_total - discount, discount, flat_bug
+    return 0, final_total - php_floatval(maximum), php_floatval(maximum), flat_bug
+
+
+class PromoSummary:
+    """Totals of a promo evaluated over every priced cart"""
+
+    def __init__(self, code):
+        self.code = code
+        self.reasons = Counter()
+        self.discount = 0.0
+        self.gross = 0.0
+        self.net = 0.0
+        self.capped = 0
+        self.flat_bug = 0
+
+    def add(self, promo, reason, overall, final_total, discount, flat_bug):
+        self.reasons[PROMO_REASONS[reason]] += 1
+        self.gross += overall
+        self.net += final_total
+        if reason == 0:
+            self.discount += discount
+            self.flat_bug += flat_bug
+            maximum = promo.get("max_discount_amount")
+            self.capped += maximum is not None and discount == php_floatval(maximum)
+
+
+def evaluate_promo(data, priced, code, override=None, today=None):
+    """Run validate_promo_code() for `code` against every priced cart; returns (PromoSummary, reason column)"""
+    today = today or date.today().isoformat()
+    rows = data.promos.get(code, {})
+    if override is not None:
+        fields = {f: v for f, v in override.items() if f != "*"}
+        rows = {branch: dict(row, **fields) for branch, row in rows.items()}
+    fallback = dict(override["*"], **fields) if override is not None and not rows else None
+    summary = PromoSummary(code)
+    reasons = array("b")
+    used = data.promo_orders.get(code, 0)
+    user_orders = data.promo_user_orders.get(code, {})
+    for k in range(len(priced)):
+        branch = str(priced.branch_id[k])
+        promo = rows.get(branch, fallback)
+        reason, final_total, discount, flat_bug = promo_outcome(
+            promo, priced.overall[k], used, user_orders.get(priced.user_id[k], 0), today)
+        summary.add(promo or {}, reason, priced.overall[k], final_total, discount, flat_bug)
+        reasons.append(reason)
+    return summary, reasons
+
+
+def what_if_promo(args):
+    """promo_codes field overrides from the command line; "*" holds the row used when the code has none"""
+    fields = {
+        "discount_type": args.discount_type,
+        "discount": None if args.discount is None else repr(args.discount),
+        "max_discount_amount": None if args.max_discount is None else repr(args.max_discount),
+        "minimum_order_amount": None if args.min_order is None else repr(args.min_order),
+        "no_of_users": None if args.no_of_users is None else str(args.no_of_users),
+        "repeat_usage": None if args.repeat_usage is None else str(args.repeat_usage),
+        "no_of_repeat_usage": None if args.no_of_repeat_usage is None else str(args.no_of_repeat_usage),
+    }
+    override = {f: v for f, v in fields.items() if v is not None}
+    if not override:
+        return None
+    override["*"] = {"promo_code": args.promo, "status": "1", "start_date": "0000-00-00", "end_date": "9999-12-31",
+                     "no_of_users": str(2 ** 31 - 1), "minimum_order_amount": "0", "discount": "0",
+                     "discount_type": "percentage", "max_discount_amount": "0", "repeat_usage": "1",
+                     "no_of_repeat_usage": "1"}
+    return override
+
+
+async def conformance(pool, data, priced, samples, tokens, promo_code=None, seed=None, today=None):
+    """Replay sampled carts through the PHP endpoints; returns (checked, {field: [(user, branch, ours, theirs)]})"""
+    specs = {spec["name"]: spec for spec in collection_requests(
+        create_postman_collection(), ["get_user_cart", "validate_promo_code", "get_delivery_charges"])}
+    candidates = [k for k in range(len(priced)) if str(priced.user_id[k]) in tokens.tokens or tokens.secret]
+    picked = random.Random(seed).sample(candidates, min(samples, len(candidates)))
+    mismatches = defaultdict(list)
+    checked = Counter()
+
+    def compare(field, k, ours, theirs):
+        checked[field] += 1
+        if ours != theirs:
+            mismatches[field].append((priced.user_id[k], priced.branch_id[k], ours, theirs))
+
+    async def post(name, k, body):
+        uid = str(priced.user_id[k])
+        token = tokens.tokens.get(uid) or mint_token(int(uid), tokens.secret)
+        try:
+            _, response = await send_spec(pool, dict(specs[name], body=body), auth=(uid, token))
+            return response.json()
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            checked[name + " failed"] += 1
+            return None
+
+    async def one(k):
+        branch, final_total = str(priced.branch_id[k]), priced.overall[k]
+        cart = await post("get_user_cart", k, {"branch_id": branch, "is_saved_for_later": "0"})
+        if cart is not None:
+            compare("cart.error", k, False, cart.get("error"))
+            if cart.get("error") is False:
+                compare("cart.total_quantity", k, str(priced.quantity[k]), cart.get("total_quantity"))
+                compare("cart.sub_total", k, php_strval(priced.sub_total[k]), cart.get("sub_total"))
+                compare("cart.tax_amount", k, php_strval(priced.tax_amount[k]), cart.get("tax_amount"))
+                compare("cart.overall_amount", k, final_total, cart.get("overall_amount"))
+        if promo_code and data.promos.get(promo_code):
+            reason, total, discount, _ = promo_outcome(
+                data.promos[promo_code].get(branch), final_total, data.promo_orders.get(promo_code, 0),
+                data.promo_user_orders.get(promo_code, {}).get(priced.user_id[k], 0), today or date.today().isoformat())
+            answer = await post("validate_promo_code", k,
+                                {"promo_code": promo_code, "branch_id": branch, "final_total": repr(final_total)})
+            if answer is not None:
+                compare("promo.error", k, reason != 0, answer.get("error"))
+                payload = answer.get("data")
+                payload = payload[0] if isinstance(payload, list) and payload else payload
+                if isinstance(payload, dict):
+                    compare("promo.final_total", k, php_strval(total), payload.get("final_total"))
+                    if reason == 0:
+                        compare("promo.final_discount", k, php_strval(discount), payload.get("final_discount"))
+        if priced.address_id[k]:
+            answer = await post("get_delivery_charges", k, {"address_id": str(priced.address_id[k]),
+                                                            "branch_id": branch, "final_total": repr(final_total)})
+            if answer is not None and answer.get("error") is False:
+                compare("delivery.charge", k, priced.delivery_charge[k], answer.get("delivery_charge"))
+                compare("delivery.distance", k, php_strval(priced.distance[k]) + "km", answer.get("distance"))
+                compare("delivery.is_free_delivery", k, str(priced.free_delivery[k]), answer.get("is_free_delivery"))
+
+    await asyncio.gather(*(one(k) for k in picked))
+    return checked, mismatches
+
+
+def write_csv(path, priced, reasons=None):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        out = csv.writer(f)
+        out.writerow(["user_id", "branch_id", "lines", "quantity", "sub_total", "tax_amount", "overall_amount",
+                      "address_id", "delivery_charge", "distance", "is_free_delivery"]
+                     + (["promo"] if reasons is not None else []))
+        for k in range(len(priced)):
+            out.writerow([priced.user_id[k], priced.branch_id[k], priced.lines[k], priced.quantity[k],
+                          php_strval(priced.sub_total[k]), php_strval(priced.tax_amount[k]), priced.overall[k],
+                          priced.address_id[k], priced.delivery_charge[k], priced.distance[k],
+                          priced.free_delivery[k]] + ([PROMO_REASONS[reasons[k]]] if reasons is not None else []))
+
+
+def print_summary(priced, loaded, elapsed, promo=None):
+    n = len(priced) or 1
+    overall = math.fsum(priced.overall)
+    print(f"📊 Carts priced: {len(priced)} from {loaded} lines in {elapsed:.2f} s "
+          f"({len(priced) / max(elapsed, 1e-9):,.0f} carts/s) · {priced.skipped_lines} unavailable lines skipped")
+    print(f"   sub_total {math.fsum(priced.sub_total):,.2f} · tax {math.fsum(priced.tax_amount):,.2f} · "
+          f"overall {overall:,.2f} · mean cart {overall / n:,.2f}")
+    delivered = sum(1 for a in priced.address_id if a)
+    print(f"🚚 Delivery: {delivered} carts with an address · charges {math.fsum(map(php_floatval, priced.delivery_charge)):,.2f}"
+          f" · free delivery {sum(priced.free_delivery)} · mean distance "
+          f"{math.fsum(priced.distance) / (delivered or 1):.1f} km")
+    if promo is not None:
+        valid = promo.reasons["valid"]
+        print(f"🏷️  Promo {promo.code}: {valid} of {len(priced)} carts eligible ({valid / n:.0%}) · discount "
+              f"{promo.discount:,.2f} ({promo.discount / (promo.gross or 1):.1%} of gross) · "
+              f"{promo.capped} capped at max_discount_amount · net {promo.net:,.2f}")
+        for reason, count in promo.reasons.most_common():
+            if reason != "valid":
+                print(f"   ✖ {reason}: {count}")
+        if promo.flat_bug:
+            print(f"⚠️  {promo.flat_bug} eligible carts priced with the repeat_usage=0 flat-discount bug "
+                  f"(discount = final_total - discount), mirrored from validate_promo_code()")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Price every cart in bulk as the PHP helpers would, for promo what-ifs")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--database", help="read the tables from this database through the mysql client")
+    source.add_argument("--csv", help="read generate_synthetic_data.py CSV output from this directory")
+    parser.add_argument("--mysql", default="", help="mysql connection options, e.g. '-h 127.0.0.1 -u root'")
+    parser.add_argument("--tax", help="system tax percentage (default: the one system_settings points at)")
+    parser.add_argument("--date", help="evaluate promo start/end dates as of this YYYY-MM-DD (default today)")
+    parser.add_argument("--promo", help="promo code to evaluate; its promo_codes rows and order usage are loaded")
+    what_if = parser.add_argument_group("what-if promo", "override --promo's fields (or define it, if it does not exist)")
+    what_if.add_argument("--discount-type", choices=("percentage", "amount"))
+    what_if.add_argument("--discount", type=float)
+    what_if.add_argument("--max-discount", type=float)
+    what_if.add_argument("--min-order", type=float)
+    what_if.add_argument("--no-of-users", type=int)
+    what_if.add_argument("--repeat-usage", type=int, choices=(0, 1))
+    what_if.add_argument("--no-of-repeat-usage", type=int)
+    parser.add_argument("--out", help="write one CSV row per priced cart to this file")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    parser.add_argument("--conformance", type=int, nargs="?", const=CONFORMANCE_SAMPLES, metavar="N",
+                        help=f"check N sampled carts (default {CONFORMANCE_SAMPLES}) against the live PHP endpoints")
+    parser.add_argument("--base-url", default="http://localhost:9000")
+    parser.add_argument("--tokens", help="token pool cache from token_pool.py; required with --conformance")
+    parser.add_argument("--seed", type=int, help="seed for the conformance sample")
+    parser.add_argument("--stand-in", action="store_true",
+                        help="target a built-in localhost stand-in instead of --base-url")
+    args = parser.parse_args()
+    if args.conformance is not None and not args.tokens:
+        parser.error("--conformance needs --tokens so each cart is fetched as its own user")
+    override = what_if_promo(args)
+    if override is not None and not args.promo:
+        args.promo = override["*"]["promo_code"] = "WHATIF"
+
+    started = time.perf_counter()
+    if args.database:
+        data = CartData.load(lambda table: mysql_table(args.mysql, args.database, table, COLUMNS[table]))
+    else:
+        schema = parse_schema()
+        data = CartData.load(lambda table: csv_table(args.csv, table, COLUMNS[table], schema))
+    if args.tax is not None:
+        data.tax = args.tax
+    loaded = time.perf_counter() - started
+    print(f"💾 Loaded {len(data)} cart lines in {loaded:.2f} s", file=sys.stderr if args.json else sys.stdout)
+
+    started = time.perf_counter()
+    priced = price_carts(data)
+    summary, reasons = (evaluate_promo(data, priced, args.promo, override, args.date) if args.promo
+                        else (None, None))
+    elapsed = time.perf_counter() - started
+    if args.out:
+        write_csv(args.out, priced, reasons)
+    if args.json:
+        print(json.dumps({
+            "carts": len(priced), "lines": len(data), "skipped_lines": priced.skipped_lines, "seconds": elapsed,
+            "tax_percentage": data.tax, "sub_total": math.fsum(priced.sub_total),
+            "tax_amount": math.fsum(priced.tax_amount), "overall_amount": math.fsum(priced.overall),
+            "delivery_charge": math.fsum(map(php_floatval, priced.delivery_charge)),
+            "free_delivery": sum(priced.free_delivery),
+            "promo": summary and {"code": summary.code, "outcomes": dict(summary.reasons),
+                                  "discount": summary.discount, "net": summary.net, "capped": summary.capped,
+                                  "flat_discount_bug": summary.flat_bug}}, indent=2))
+    else:
+        print_summary(priced, len(data), elapsed, summary)
+    if args.out:
+        print(f"📁 Carts: {args.out}", file=sys.stderr if args.json else sys.stdout)
+
+    if args.conformance is not None:
+        tokens = TokenPool.load(args.tokens)
+        (checked, mismatches), opened = asyncio.run(_against_target(
+            args.base_url, min(args.conformance, 50), args.stand_in,
+            lambda pool: conformance(pool, data, priced, args.conformance, tokens, args.promo,
+                                     args.seed, args.date)))
+        for field, count in sorted(checked.items()):
+            wrong = mismatches.get(field, [])
+            print(f"{'✅' if not wrong else '⚠️ '} {field}: {count - len(wrong)}/{count} match")
+            for user, branch, ours, theirs in wrong[:EXAMPLES]:
+                print(f"     user {user} branch {branch}: engine {ours!r}, PHP {theirs!r}")
+        print(f"🔌 Connections opened: {opened}")
+        if mismatches:
+            sys.exit(1)
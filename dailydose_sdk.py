@@ -0,0 +1,926 @@
+"""
+Async DailyDose API client generated by generate_sdk.py from the Postman collection; do not edit
+"""
+
+import asyncio
+import json
+import mimetypes
+import os
+import sys
+
+from load_test import ConnectionPool, encode_body, encode_multipart
+
+
+class ApiError(Exception):
+    """An {"error": true} envelope or a non-2xx response"""
+
+    def __init__(self, message, status=200, envelope=None):
+        super().__init__(message)
+        self.status = status
+        self.envelope = envelope
+
+
+class Model:
+    """Compact row: declared fields live in __slots__, anything else in one `_extra` dict"""
+
+    __slots__ = ("_extra",)
+    _fields = ()
+
+    def __init__(self, values):
+        extra = None
+        for key, value in values.items():
+            if key in self._field_set:
+                object.__setattr__(self, key, decode(value))
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = decode(value)
+        self._extra = extra
+
+    def __getattr__(self, name):
+        if name in self._field_set:
+            return None
+        extra = object.__getattribute__(self, "_extra")
+        if extra and name in extra:
+            return extra[name]
+        raise AttributeError(name)
+
+    def to_dict(self):
+        values = {}
+        for name in self._fields:
+            try:
+                values[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        values.update(self._extra or {})
+        return values
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def model(name, fields):
+    """Create a Model subclass with one slot per field"""
+    fields = tuple(f for f in fields if f.isidentifier() and f != "_extra")
+    return type(name, (Model,), {"__slots__": fields, "_fields": fields, "_field_set": frozenset(fields)})
+
+
+Model._field_set = frozenset()
+_SHAPES = {}
+
+
+def decode(value, row_model=None):
+    """Turn decoded JSON into Models: dict rows become slotted objects, lists are decoded item by item"""
+    if isinstance(value, str):
+        # statuses, types, currency codes and small ids repeat across rows; share one copy
+        return sys.intern(value) if len(value) <= 16 else value
+    if isinstance(value, list):
+        return [decode(item, row_model) for item in value]
+    if isinstance(value, dict):
+        if row_model is None:
+            shape = tuple(value)
+            row_model = _SHAPES.get(shape)
+            if row_model is None:
+                row_model = _SHAPES[shape] = model("Row", shape)
+        return row_model(value)
+    return value
+
+
+class ApiResponse:
+    """A decoded envelope: `data` as Models, every other top-level key (total, token, ...) in `meta`"""
+
+    __slots__ = ("message", "data", "meta")
+
+    def __init__(self, envelope, row_model=None):
+        self.message = envelope.pop("message", "")
+        envelope.pop("error", None)
+        self.data = decode(envelope.pop("data", None), row_model)
+        self.meta = envelope
+
+    def __getattr__(self, name):
+        meta = object.__getattribute__(self, "meta")
+        if name in meta:
+            return meta[name]
+        raise AttributeError(name)
+
+
+def file_parts(files):
+    """Multipart file tuples for {field: value}.
+
+    A value is a path, raw bytes, or a (filename, data) pair; fields ending in
+    [] also take a list of these. Paths are read once, here.
+    """
+    parts = []
+    for field, value in files.items():
+        values = value if isinstance(value, list) and field.endswith("[]") else [value]
+        for item in values:
+            if item is None:
+                continue
+            if isinstance(item, (str, os.PathLike)):
+                with open(item, "rb") as f:
+                    item = (os.path.basename(item), f.read())
+            elif not isinstance(item, tuple):
+                item = ("upload", item)
+            filename, data = item
+            parts.append((field, filename, mimetypes.guess_type(filename)[0] or "application/octet-stream", data))
+    return parts
+
+
+class _Transport:
+    """Pooled keep-alive connections, a Bearer token, and coalescing of identical in-flight reads"""
+
+    def __init__(self, base_url, token=None, pool_size=20, timeout=30.0):
+        self.pool = ConnectionPool(base_url, size=pool_size, timeout=timeout)
+        self.token = token
+        self.in_flight = {}
+        self.coalesced = 0
+
+    async def call(self, path, params, row_model=None, coalesce=False, files=None):
+        params = {k: v for k, v in params.items() if v is not None}
+        parts = file_parts(files or {})
+        if parts:
+            content_type, body = encode_multipart(params, parts)
+            return await self._send(path, body, row_model, content_type)
+        body = encode_body(params)
+        if not coalesce:
+            return await self._send(path, body, row_model)
+        key = (path, body, self.token)
+        pending = self.in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+        task = self.in_flight[key] = asyncio.ensure_future(self._send(path, body, row_model))
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self.in_flight.get(key) is task:
+                del self.in_flight[key]
+
+    async def _send(self, path, body, row_model, content_type="application/x-www-form-urlencoded"):
+        headers = {"Content-Type": content_type}
+        if self.token:
+            headers["Authorization"] = "Bearer " + self.token
+        response = await self.pool.request("POST", path, body, headers)
+        try:
+            envelope = json.loads(response.body)
+        except ValueError:
+            raise ApiError(f"HTTP {response.status}: response is not JSON", response.status) from None
+        if response.status >= 400 or not isinstance(envelope, dict) or envelope.get("error"):
+            message = envelope.get("message", "") if isinstance(envelope, dict) else ""
+            raise ApiError(message or f"HTTP {response.status}", response.status, envelope)
+        return ApiResponse(envelope, row_model)
+
+    async def close(self):
+        await self.pool.close()
+
+
+Address = model("Address", ("id", "user_id", "name", "type", "mobile", "alternate_mobile", "address", "landmark", "area", "city_id", "pincode", "country_code", "state", "country", "latitude", "longitude", "is_default", "alternate_country_code",))
+
+
+Cart = model("Cart", ("id", "user_id", "product_variant_id", "addon_ids", "branch_id", "qty", "is_saved_for_later", "addon_variant_combination", "date_created",))
+
+
+Category = model("Category", ("id", "name", "parent_id", "branch_id", "slug", "image", "row_order", "status", "clicks",))
+
+
+City = model("City", ("id", "bordering_city_ids", "max_deliverable_distance", "name", "latitude", "longitude", "min_order_amount_for_free_delivery", "delivery_charge_method", "fixed_charge", "per_km_charge", "range_wise_charges", "time_to_travel", "geolocation_type", "radius", "boundary_points",))
+
+
+Faq = model("Faq", ("id", "question", "answer", "status",))
+
+
+FundTransfer = model("FundTransfer", ("id", "rider_id", "opening_balance", "closing_balance", "amount", "status", "message", "date_created",))
+
+
+Language = model("Language", ("id", "language", "code", "country_code", "is_rtl", "created_on",))
+
+
+Notification = model("Notification", ("id", "title", "message", "type", "type_id", "image", "date_sent",))
+
+
+Offer = model("Offer", ("id", "type", "type_id", "branch_id", "start_date", "end_date", "image", "date_added",))
+
+
+Order = model("Order", ("id", "is_credited", "user_id", "rider_id", "branch_id", "address_id", "city_id", "mobile", "tax_percent", "tax_amount", "user_email", "total", "delivery_charge", "user_mobile", "is_delivery_charge_returnable", "wallet_balance", "total_payable", "promo_code", "promo_discount", "order_items_snapshot", "discount", "final_total", "payment_method", "latitude", "longitude", "address", "delivery_time", "delivery_date", "status", "active_status", "date_added", "otp", "is_rider_otp_setting_on", "cancel_by", "reason", "notes", "delivery_tip", "admin_commission_amount", "partner_commission_amount", "is_self_pick_up", "owner_note", "self_pickup_time", "rating", "no_of_ratings",))
+
+
+OrderRating = model("OrderRating", ("id", "user_id", "order_id", "rating", "images", "comment", "date_added",))
+
+
+Product = model("Product", ("id", "category_id", "branch_id", "tax", "row_order", "type", "stock_type", "name", "short_description", "slug", "indicator", "calories", "cod_allowed", "available_time", "start_time", "end_time", "minimum_order_quantity", "quantity_step_size", "total_allowed_quantity", "is_prices_inclusive_tax", "is_returnable", "is_cancelable", "is_spicy", "cancelable_till", "image", "other_images", "video_type", "video", "highlights", "warranty_period", "guarantee_period", "made_in", "sku", "stock", "availability", "rating", "no_of_ratings", "description", "deliverable_type", "deliverable_zipcodes", "status", "date_added",))
+
+
+ProductRating = model("ProductRating", ("id", "user_id", "order_id", "product_id", "rating", "images", "comment", "data_added",))
+
+
+PromoCode = model("PromoCode", ("id", "promo_code", "branch_id", "message", "start_date", "end_date", "no_of_users", "minimum_order_amount", "discount", "discount_type", "max_discount_amount", "repeat_usage", "no_of_repeat_usage", "image", "status", "date_created",))
+
+
+RiderRating = model("RiderRating", ("id", "user_id", "order_id", "rider_id", "rating", "comment", "data_added",))
+
+
+Section = model("Section", ("id", "title", "slug", "short_description", "style", "product_ids", "branch_id", "row_order", "categories", "product_type", "date_added",))
+
+
+Slider = model("Slider", ("id", "type", "type_id", "branch_id", "image", "date_added",))
+
+
+Ticket = model("Ticket", ("id", "ticket_type_id", "user_id", "subject", "email", "description", "status", "last_updated", "date_created",))
+
+
+TicketMessage = model("TicketMessage", ("id", "user_type", "user_id", "ticket_id", "message", "attachments", "last_updated", "date_created",))
+
+
+TicketType = model("TicketType", ("id", "title", "date_created",))
+
+
+TimeSlot = model("TimeSlot", ("id", "title", "from_time", "to_time", "last_order_time", "status",))
+
+
+Transaction = model("Transaction", ("id", "transaction_type", "user_id", "order_id", "type", "txn_id", "payu_txn_id", "amount", "status", "currency_code", "payer_email", "message", "transaction_date", "date_created",))
+
+
+class Client:
+    """Customer API (/app/v1/api); rider endpoints are under `client.rider`.
+
+    Responses that share a path, body and token while one is in flight are
+    coalesced for get_* endpoints, so every caller gets the same ApiResponse;
+    treat responses as read-only.
+    """
+
+    def __init__(self, base_url, token=None, pool_size=20, timeout=30.0):
+        self._transport = _Transport(base_url, token, pool_size, timeout)
+        self.rider = RiderApi(self._transport)
+
+    @property
+    def token(self):
+        return self._transport.token
+
+    @token.setter
+    def token(self, value):
+        self._transport.token = value
+
+    async def close(self):
+        await self._transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def login(self, *, mobile=None, fcm_id=None, **extra):
+        """Login with mobile number"""
+        params = {"mobile": mobile, "fcm_id": fcm_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/login", params, None)
+
+    async def update_fcm(self, *, user_id=None, fcm_id=None, **extra):
+        """Update fcm"""
+        params = {"user_id": user_id, "fcm_id": fcm_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/update_fcm", params, None)
+
+    async def reset_password(self, *, mobile_no=None, new=None, **extra):
+        """Reset password"""
+        params = {"mobile_no": mobile_no, "new": new}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/reset_password", params, None)
+
+    async def get_login_identity(self, **extra):
+        """Get login identity"""
+        params = extra
+        return await self._transport.call("/app/v1/api/get_login_identity", params, None, coalesce=True)
+
+    async def verify_user(self, *, mobile=None, **extra):
+        """Verify user"""
+        params = {"mobile": mobile}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/verify_user", params, None)
+
+    async def verify_otp(self, *, mobile=None, otp=None, **extra):
+        """Verify otp"""
+        params = {"mobile": mobile, "otp": otp}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/verify_otp", params, None)
+
+    async def resend_otp(self, *, mobile=None, **extra):
+        """Resend otp"""
+        params = {"mobile": mobile}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/resend_otp", params, None)
+
+    async def register_user(self, *, name=None, email=None, mobile=None, country_code=None, referral_code=None, fcm_id=None, friends_code=None, latitude=None, longitude=None, **extra):
+        """Register user"""
+        params = {"name": name, "email": email, "mobile": mobile, "country_code": country_code, "referral_code": referral_code, "fcm_id": fcm_id, "friends_code": friends_code, "latitude": latitude, "longitude": longitude}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/register_user", params, None)
+
+    async def sign_up(self, *, name=None, email=None, mobile=None, country_code=None, referral_code=None, fcm_id=None, **extra):
+        """Sign up"""
+        params = {"name": name, "email": email, "mobile": mobile, "country_code": country_code, "referral_code": referral_code, "fcm_id": fcm_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/sign_up", params, None)
+
+    async def update_user(self, *, user_id=None, username=None, mobile=None, email=None, address=None, latitude=None, longitude=None, city_id=None, referral_code=None, image=None, **extra):
+        """Update user"""
+        params = {"user_id": user_id, "username": username, "mobile": mobile, "email": email, "address": address, "latitude": latitude, "longitude": longitude, "city_id": city_id, "referral_code": referral_code}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/update_user", params, None, files={"image": image})
+
+    async def delete_my_account(self, *, user_id=None, **extra):
+        """Delete my account"""
+        params = {"user_id": user_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/delete_my_account", params, None)
+
+    async def is_city_deliverable(self, *, id=None, name=None, **extra):
+        """Is city deliverable"""
+        params = {"id": id, "name": name}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/is_city_deliverable", params, None)
+
+    async def is_order_deliverable(self, *, user_id=None, address_id=None, **extra):
+        """Is order deliverable"""
+        params = {"user_id": user_id, "address_id": address_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/is_order_deliverable", params, None)
+
+    async def get_cities(self, *, sort=None, order=None, search=None, limit=None, offset=None, **extra):
+        """Get cities"""
+        params = {"sort": sort, "order": order, "search": search, "limit": limit, "offset": offset}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_cities", params, City, coalesce=True)
+
+    async def get_delivery_charges(self, *, user_id=None, address_id=None, **extra):
+        """Get delivery charges"""
+        params = {"user_id": user_id, "address_id": address_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_delivery_charges", params, None, coalesce=True)
+
+    async def search_location(self, *, input=None, **extra):
+        """Search location"""
+        params = {"input": input}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/search_location", params, None)
+
+    async def get_location_details(self, *, place_id=None, **extra):
+        """Get location details"""
+        params = {"place_id": place_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_location_details", params, None, coalesce=True)
+
+    async def get_location_details_by_lat_long(self, *, latitude=None, longitude=None, **extra):
+        """Get location details by lat long"""
+        params = {"latitude": latitude, "longitude": longitude}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_location_details_by_lat_long", params, None, coalesce=True)
+
+    async def get_live_tracking_details(self, *, order_id=None, **extra):
+        """Get live tracking details"""
+        params = {"order_id": order_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_live_tracking_details", params, None, coalesce=True)
+
+    async def get_time_slots(self, *, date=None, **extra):
+        """Get time slots"""
+        params = {"date": date}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_time_slots", params, TimeSlot, coalesce=True)
+
+    async def add_address(self, *, user_id=None, mobile=None, address=None, city=None, latitude=None, longitude=None, area=None, type=None, name=None, country_code=None, alternate_mobile=None, landmark=None, pincode=None, state=None, country=None, is_default=None, **extra):
+        """Add address"""
+        params = {"user_id": user_id, "mobile": mobile, "address": address, "city": city, "latitude": latitude, "longitude": longitude, "area": area, "type": type, "name": name, "country_code": country_code, "alternate_mobile": alternate_mobile, "landmark": landmark, "pincode": pincode, "state": state, "country": country, "is_default": is_default}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/add_address", params, None)
+
+    async def update_address(self, *, id=None, user_id=None, mobile=None, address=None, city=None, type=None, name=None, country_code=None, alternate_mobile=None, landmark=None, area=None, pincode=None, state=None, country=None, latitude=None, longitude=None, is_default=None, **extra):
+        """Update address"""
+        params = {"id": id, "user_id": user_id, "mobile": mobile, "address": address, "city": city, "type": type, "name": name, "country_code": country_code, "alternate_mobile": alternate_mobile, "landmark": landmark, "area": area, "pincode": pincode, "state": state, "country": country, "latitude": latitude, "longitude": longitude, "is_default": is_default}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/update_address", params, None)
+
+    async def get_address(self, *, user_id=None, address_id=None, partner_id=None, **extra):
+        """Get address"""
+        params = {"user_id": user_id, "address_id": address_id, "partner_id": partner_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_address", params, Address, coalesce=True)
+
+    async def delete_address(self, *, id=None, **extra):
+        """Delete address"""
+        params = {"id": id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/delete_address", params, None)
+
+    async def get_slider_images(self, **extra):
+        """Get slider images"""
+        params = extra
+        return await self._transport.call("/app/v1/api/get_slider_images", params, Slider, coalesce=True)
+
+    async def get_offer_images(self, **extra):
+        """Get offer images"""
+        params = extra
+        return await self._transport.call("/app/v1/api/get_offer_images", params, Offer, coalesce=True)
+
+    async def get_settings(self, *, type=None, user_id=None, **extra):
+        """Get settings"""
+        params = {"type": type, "user_id": user_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_settings", params, None, coalesce=True)
+
+    async def get_sections(self, *, limit=None, offset=None, user_id=None, section_id=None, top_rated_foods=None, p_limit=None, p_offset=None, p_sort=None, p_order=None, filter_by=None, latitude=None, longitude=None, **extra):
+        """Get sections"""
+        params = {"limit": limit, "offset": offset, "user_id": user_id, "section_id": section_id, "top_rated_foods": top_rated_foods, "p_limit": p_limit, "p_offset": p_offset, "p_sort": p_sort, "p_order": p_order, "filter_by": filter_by, "latitude": latitude, "longitude": longitude}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_sections", params, Section, coalesce=True)
+
+    async def get_faqs(self, **extra):
+        """Get faqs"""
+        params = extra
+        return await self._transport.call("/app/v1/api/get_faqs", params, Faq, coalesce=True)
+
+    async def get_languages(self, **extra):
+        """Get languages"""
+        params = extra
+        return await self._transport.call("/app/v1/api/get_languages", params, Language, coalesce=True)
+
+    async def get_branches(self, *, city_id=None, **extra):
+        """Get branches"""
+        params = {"city_id": city_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_branches", params, None, coalesce=True)
+
+    async def get_categories(self, *, id=None, limit=None, offset=None, sort=None, order=None, **extra):
+        """Get categories"""
+        params = {"id": id, "limit": limit, "offset": offset, "sort": sort, "order": order}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_categories", params, Category, coalesce=True)
+
+    async def get_products(self, *, id=None, category_id=None, user_id=None, search=None, tags=None, highlights=None, attribute_value_ids=None, limit=None, offset=None, sort=None, order=None, top_rated_foods=None, discount=None, min_price=None, max_price=None, partner_id=None, product_ids=None, product_variant_ids=None, vegetarian=None, filter_by=None, latitude=None, longitude=None, city_id=None, **extra):
+        """Get products"""
+        params = {"id": id, "category_id": category_id, "user_id": user_id, "search": search, "tags": tags, "highlights": highlights, "attribute_value_ids": attribute_value_ids, "limit": limit, "offset": offset, "sort": sort, "order": order, "top_rated_foods": top_rated_foods, "discount": discount, "min_price": min_price, "max_price": max_price, "partner_id": partner_id, "product_ids": product_ids, "product_variant_ids": product_variant_ids, "vegetarian": vegetarian, "filter_by": filter_by, "latitude": latitude, "longitude": longitude, "city_id": city_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_products", params, Product, coalesce=True)
+
+    async def get_offline_products(self, *, category_id=None, **extra):
+        """Get offline products"""
+        params = {"category_id": category_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_offline_products", params, Product, coalesce=True)
+
+    async def get_partners(self, *, id=None, city_id=None, user_id=None, limit=None, offset=None, sort=None, order=None, top_rated_partner=None, only_opened_partners=None, vegetarian=None, latitude=None, longitude=None, **extra):
+        """Get partners"""
+        params = {"id": id, "city_id": city_id, "user_id": user_id, "limit": limit, "offset": offset, "sort": sort, "order": order, "top_rated_partner": top_rated_partner, "only_opened_partners": only_opened_partners, "vegetarian": vegetarian, "latitude": latitude, "longitude": longitude}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_partners", params, None, coalesce=True)
+
+    async def manage_cart(self, *, user_id=None, product_variant_id=None, clear_cart=None, is_saved_for_later=None, qty=None, add_on_id=None, add_on_qty=None, **extra):
+        """Add/Update cart items"""
+        params = {"user_id": user_id, "product_variant_id": product_variant_id, "clear_cart": clear_cart, "is_saved_for_later": is_saved_for_later, "qty": qty, "add_on_id": add_on_id, "add_on_qty": add_on_qty}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/manage_cart", params, None)
+
+    async def get_user_cart(self, *, user_id=None, is_saved_for_later=None, **extra):
+        """Get user cart"""
+        params = {"user_id": user_id, "is_saved_for_later": is_saved_for_later}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_user_cart", params, Cart, coalesce=True)
+
+    async def remove_from_cart(self, *, user_id=None, product_variant_id=None, **extra):
+        """Remove from cart"""
+        params = {"user_id": user_id, "product_variant_id": product_variant_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/remove_from_cart", params, None)
+
+    async def place_order(self, *, user_id=None, mobile=None, product_variant_id=None, quantity=None, total=None, delivery_charge=None, tax_amount=None, tax_percentage=None, final_total=None, latitude=None, longitude=None, promo_code=None, payment_method=None, address_id=None, is_wallet_used=None, wallet_balance_used=None, active_status=None, order_note=None, delivery_tip=None, is_self_pick_up=None, **extra):
+        """Place order"""
+        params = {"user_id": user_id, "mobile": mobile, "product_variant_id": product_variant_id, "quantity": quantity, "total": total, "delivery_charge": delivery_charge, "tax_amount": tax_amount, "tax_percentage": tax_percentage, "final_total": final_total, "latitude": latitude, "longitude": longitude, "promo_code": promo_code, "payment_method": payment_method, "address_id": address_id, "is_wallet_used": is_wallet_used, "wallet_balance_used": wallet_balance_used, "active_status": active_status, "order_note": order_note, "delivery_tip": delivery_tip, "is_self_pick_up": is_self_pick_up}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/place_order", params, None)
+
+    async def get_orders(self, *, user_id=None, id=None, active_status=None, limit=None, offset=None, sort=None, order=None, download_invoice=None, **extra):
+        """Get orders"""
+        params = {"user_id": user_id, "id": id, "active_status": active_status, "limit": limit, "offset": offset, "sort": sort, "order": order, "download_invoice": download_invoice}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_orders", params, Order, coalesce=True)
+
+    async def update_order_status(self, *, status=None, order_id=None, reason=None, **extra):
+        """Update order status"""
+        params = {"status": status, "order_id": order_id, "reason": reason}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/update_order_status", params, None)
+
+    async def delete_order(self, *, order_id=None, **extra):
+        """Delete order"""
+        params = {"order_id": order_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/delete_order", params, None)
+
+    async def re_order(self, *, user_id=None, order_id=None, **extra):
+        """Re order"""
+        params = {"user_id": user_id, "order_id": order_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/re_order", params, None)
+
+    async def set_product_rating(self, *, user_id=None, product_id=None, rating=None, comment=None, images=None, **extra):
+        """Set product rating"""
+        params = {"user_id": user_id, "product_id": product_id, "rating": rating, "comment": comment}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/set_product_rating", params, None, files={"images[]": images})
+
+    async def get_product_rating(self, *, product_id=None, user_id=None, limit=None, offset=None, sort=None, order=None, **extra):
+        """Get product rating"""
+        params = {"product_id": product_id, "user_id": user_id, "limit": limit, "offset": offset, "sort": sort, "order": order}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_product_rating", params, ProductRating, coalesce=True)
+
+    async def delete_product_rating(self, *, rating_id=None, **extra):
+        """Delete product rating"""
+        params = {"rating_id": rating_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/delete_product_rating", params, None)
+
+    async def set_rider_rating(self, *, user_id=None, rider_id=None, rating=None, comment=None, **extra):
+        """Set rider rating"""
+        params = {"user_id": user_id, "rider_id": rider_id, "rating": rating, "comment": comment}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/set_rider_rating", params, None)
+
+    async def get_rider_rating(self, *, rider_id=None, user_id=None, limit=None, offset=None, sort=None, order=None, **extra):
+        """Get rider rating"""
+        params = {"rider_id": rider_id, "user_id": user_id, "limit": limit, "offset": offset, "sort": sort, "order": order}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_rider_rating", params, RiderRating, coalesce=True)
+
+    async def delete_rider_rating(self, *, rating_id=None, **extra):
+        """Delete rider rating"""
+        params = {"rating_id": rating_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/delete_rider_rating", params, None)
+
+    async def set_order_rating(self, *, user_id=None, order_id=None, rating=None, comment=None, **extra):
+        """Set order rating"""
+        params = {"user_id": user_id, "order_id": order_id, "rating": rating, "comment": comment}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/set_order_rating", params, None)
+
+    async def get_order_rating(self, *, order_id=None, user_id=None, **extra):
+        """Get order rating"""
+        params = {"order_id": order_id, "user_id": user_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_order_rating", params, OrderRating, coalesce=True)
+
+    async def delete_order_rating(self, *, rating_id=None, **extra):
+        """Delete order rating"""
+        params = {"rating_id": rating_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/delete_order_rating", params, None)
+
+    async def get_partner_ratings(self, *, partner_id=None, limit=None, offset=None, **extra):
+        """Get partner ratings"""
+        params = {"partner_id": partner_id, "limit": limit, "offset": offset}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_partner_ratings", params, None, coalesce=True)
+
+    async def add_to_favorites(self, *, user_id=None, type=None, type_id=None, **extra):
+        """Add to favorites"""
+        params = {"user_id": user_id, "type": type, "type_id": type_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/add_to_favorites", params, None)
+
+    async def remove_from_favorites(self, *, user_id=None, type=None, type_id=None, **extra):
+        """Remove from favorites"""
+        params = {"user_id": user_id, "type": type, "type_id": type_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/remove_from_favorites", params, None)
+
+    async def get_favorites(self, *, user_id=None, type=None, limit=None, offset=None, **extra):
+        """Get favorites"""
+        params = {"user_id": user_id, "type": type, "limit": limit, "offset": offset}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_favorites", params, Product, coalesce=True)
+
+    async def get_notifications(self, *, sort=None, order=None, limit=None, offset=None, **extra):
+        """Get notifications"""
+        params = {"sort": sort, "order": order, "limit": limit, "offset": offset}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_notifications", params, Notification, coalesce=True)
+
+    async def add_transaction(self, *, transaction_type=None, user_id=None, order_id=None, type=None, payment_method=None, txn_id=None, amount=None, status=None, message=None, **extra):
+        """Add transaction"""
+        params = {"transaction_type": transaction_type, "user_id": user_id, "order_id": order_id, "type": type, "payment_method": payment_method, "txn_id": txn_id, "amount": amount, "status": status, "message": message}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/add_transaction", params, None)
+
+    async def transactions(self, *, user_id=None, id=None, transaction_type=None, type=None, search=None, limit=None, offset=None, sort=None, order=None, **extra):
+        """Transactions"""
+        params = {"user_id": user_id, "id": id, "transaction_type": transaction_type, "type": type, "search": search, "limit": limit, "offset": offset, "sort": sort, "order": order}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/transactions", params, Transaction, coalesce=True)
+
+    async def send_withdrawal_request(self, *, user_id=None, payment_address=None, amount=None, **extra):
+        """Send withdrawal request"""
+        params = {"user_id": user_id, "payment_address": payment_address, "amount": amount}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/send_withdrawal_request", params, None)
+
+    async def get_withdrawal_request(self, *, user_id=None, limit=None, offset=None, **extra):
+        """Get withdrawal request"""
+        params = {"user_id": user_id, "limit": limit, "offset": offset}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_withdrawal_request", params, None, coalesce=True)
+
+    async def get_ticket_types(self, **extra):
+        """Get ticket types"""
+        params = extra
+        return await self._transport.call("/app/v1/api/get_ticket_types", params, TicketType, coalesce=True)
+
+    async def add_ticket(self, *, ticket_type_id=None, subject=None, email=None, description=None, user_id=None, **extra):
+        """Add ticket"""
+        params = {"ticket_type_id": ticket_type_id, "subject": subject, "email": email, "description": description, "user_id": user_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/add_ticket", params, None)
+
+    async def edit_ticket(self, *, ticket_id=None, ticket_type_id=None, subject=None, email=None, description=None, user_id=None, status=None, **extra):
+        """Edit ticket"""
+        params = {"ticket_id": ticket_id, "ticket_type_id": ticket_type_id, "subject": subject, "email": email, "description": description, "user_id": user_id, "status": status}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/edit_ticket", params, None)
+
+    async def send_message(self, *, user_type=None, user_id=None, ticket_id=None, message=None, attachments=None, **extra):
+        """Send message"""
+        params = {"user_type": user_type, "user_id": user_id, "ticket_id": ticket_id, "message": message}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/send_message", params, None, files={"attachments[]": attachments})
+
+    async def get_tickets(self, *, ticket_id=None, ticket_type_id=None, user_id=None, status=None, search=None, limit=None, offset=None, sort=None, order=None, **extra):
+        """Get tickets"""
+        params = {"ticket_id": ticket_id, "ticket_type_id": ticket_type_id, "user_id": user_id, "status": status, "search": search, "limit": limit, "offset": offset, "sort": sort, "order": order}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_tickets", params, Ticket, coalesce=True)
+
+    async def get_messages(self, *, ticket_id=None, user_type=None, user_id=None, search=None, limit=None, offset=None, sort=None, order=None, **extra):
+        """Get messages"""
+        params = {"ticket_id": ticket_id, "user_type": user_type, "user_id": user_id, "search": search, "limit": limit, "offset": offset, "sort": sort, "order": order}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_messages", params, TicketMessage, coalesce=True)
+
+    async def validate_promo_code(self, *, promo_code=None, user_id=None, final_total=None, **extra):
+        """Validate promo code"""
+        params = {"promo_code": promo_code, "user_id": user_id, "final_total": final_total}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/validate_promo_code", params, None)
+
+    async def get_promo_codes(self, *, search=None, limit=None, offset=None, sort=None, order=None, **extra):
+        """Get promo codes"""
+        params = {"search": search, "limit": limit, "offset": offset, "sort": sort, "order": order}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_promo_codes", params, PromoCode, coalesce=True)
+
+    async def validate_refer_code(self, *, referral_code=None, **extra):
+        """Validate refer code"""
+        params = {"referral_code": referral_code}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/validate_refer_code", params, None)
+
+    async def get_paypal_link(self, *, user_id=None, order_id=None, amount=None, **extra):
+        """Get paypal link"""
+        params = {"user_id": user_id, "order_id": order_id, "amount": amount}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_paypal_link", params, None, coalesce=True)
+
+    async def paypal_transaction_webview(self, *, order_id=None, amount=None, **extra):
+        """Paypal transaction webview"""
+        params = {"order_id": order_id, "amount": amount}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/paypal_transaction_webview", params, None)
+
+    async def app_payment_status(self, *, order_id=None, status=None, **extra):
+        """App payment status"""
+        params = {"order_id": order_id, "status": status}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/app_payment_status", params, None)
+
+    async def ipn(self, *, order_id=None, **extra):
+        """Ipn"""
+        params = {"order_id": order_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/ipn", params, None)
+
+    async def payment_intent(self, *, amount=None, order_id=None, user_id=None, **extra):
+        """Payment intent"""
+        params = {"amount": amount, "order_id": order_id, "user_id": user_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/payment_intent", params, None)
+
+    async def stripe_webhook(self, **extra):
+        """Stripe webhook"""
+        params = extra
+        return await self._transport.call("/app/v1/api/stripe_webhook", params, None)
+
+    async def razorpay_create_order(self, *, amount=None, order_id=None, user_id=None, **extra):
+        """Razorpay create order"""
+        params = {"amount": amount, "order_id": order_id, "user_id": user_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/razorpay_create_order", params, None)
+
+    async def razorpay_webhook(self, **extra):
+        """Razorpay webhook"""
+        params = extra
+        return await self._transport.call("/app/v1/api/razorpay_webhook", params, None)
+
+    async def generate_paytm_checksum(self, *, order_id=None, amount=None, user_id=None, industry_type=None, channel_id=None, website=None, **extra):
+        """Generate paytm checksum"""
+        params = {"order_id": order_id, "amount": amount, "user_id": user_id, "industry_type": industry_type, "channel_id": channel_id, "website": website}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/generate_paytm_checksum", params, None)
+
+    async def generate_paytm_txn_token(self, *, amount=None, order_id=None, user_id=None, industry_type=None, channel_id=None, website=None, **extra):
+        """Generate paytm txn token"""
+        params = {"amount": amount, "order_id": order_id, "user_id": user_id, "industry_type": industry_type, "channel_id": channel_id, "website": website}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/generate_paytm_txn_token", params, None)
+
+    async def validate_paytm_checksum(self, *, paytm_checksum=None, order_id=None, amount=None, user_id=None, industry_type=None, channel_id=None, website=None, **extra):
+        """Validate paytm checksum"""
+        params = {"paytm_checksum": paytm_checksum, "order_id": order_id, "amount": amount, "user_id": user_id, "industry_type": industry_type, "channel_id": channel_id, "website": website}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/validate_paytm_checksum", params, None)
+
+    async def flutterwave_webview(self, *, amount=None, user_id=None, reference=None, **extra):
+        """Flutterwave webview"""
+        params = {"amount": amount, "user_id": user_id, "reference": reference}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/flutterwave_webview", params, None)
+
+    async def flutterwave_payment_response(self, *, reference=None, **extra):
+        """Flutterwave payment response"""
+        params = {"reference": reference}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/flutterwave_payment_response", params, None)
+
+    async def flutterwave_webhook(self, **extra):
+        """Flutterwave webhook"""
+        params = extra
+        return await self._transport.call("/app/v1/api/flutterwave_webhook", params, None)
+
+    async def create_midtrans_transaction(self, *, amount=None, order_id=None, user_id=None, **extra):
+        """Create midtrans transaction"""
+        params = {"amount": amount, "order_id": order_id, "user_id": user_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/create_midtrans_transaction", params, None)
+
+    async def get_midtrans_transaction_status(self, *, order_id=None, **extra):
+        """Get midtrans transaction status"""
+        params = {"order_id": order_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/get_midtrans_transaction_status", params, None, coalesce=True)
+
+    async def midtrans_payment_process(self, *, order_id=None, status=None, **extra):
+        """Midtrans payment process"""
+        params = {"order_id": order_id, "status": status}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/midtrans_payment_process", params, None)
+
+    async def midtrans_wallet_transaction(self, *, user_id=None, amount=None, **extra):
+        """Midtrans wallet transaction"""
+        params = {"user_id": user_id, "amount": amount}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/midtrans_wallet_transaction", params, None)
+
+    async def midtrans_webhook(self, **extra):
+        """Midtrans webhook"""
+        params = extra
+        return await self._transport.call("/app/v1/api/midtrans_webhook", params, None)
+
+    async def phonepe_webview(self, *, amount=None, order_id=None, user_id=None, **extra):
+        """Phonepe webview"""
+        params = {"amount": amount, "order_id": order_id, "user_id": user_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/phonepe_webview", params, None)
+
+    async def phonepe_app(self, *, amount=None, order_id=None, user_id=None, **extra):
+        """Phonepe app"""
+        params = {"amount": amount, "order_id": order_id, "user_id": user_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/phonepe_app", params, None)
+
+    async def phonepe_web(self, *, amount=None, order_id=None, user_id=None, **extra):
+        """Phonepe web"""
+        params = {"amount": amount, "order_id": order_id, "user_id": user_id}
+        params.update(extra)
+        return await self._transport.call("/app/v1/api/phonepe_web", params, None)
+
+    async def phonepe_webhook(self, **extra):
+        """Phonepe webhook"""
+        params = extra
+        return await self._transport.call("/app/v1/api/phonepe_webhook", params, None)
+
+
+class RiderApi:
+    """Rider API (/rider/app/v1/api), sharing the customer client's connections and token"""
+
+    def __init__(self, transport):
+        self._transport = transport
+
+    async def login(self, *, mobile=None, password=None, fcm_id=None, **extra):
+        """Login"""
+        params = {"mobile": mobile, "password": password, "fcm_id": fcm_id}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/login", params, None)
+
+    async def get_rider_details(self, *, id=None, **extra):
+        """Get rider details"""
+        params = {"id": id}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/get_rider_details", params, None, coalesce=True)
+
+    async def get_orders(self, *, user_id=None, active_status=None, limit=None, offset=None, sort=None, order=None, **extra):
+        """Get orders"""
+        params = {"user_id": user_id, "active_status": active_status, "limit": limit, "offset": offset, "sort": sort, "order": order}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/get_orders", params, Order, coalesce=True)
+
+    async def get_fund_transfers(self, *, user_id=None, limit=None, offset=None, sort=None, order=None, **extra):
+        """Get fund transfers"""
+        params = {"user_id": user_id, "limit": limit, "offset": offset, "sort": sort, "order": order}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/get_fund_transfers", params, FundTransfer, coalesce=True)
+
+    async def update_user(self, *, user_id=None, username=None, mobile=None, email=None, address=None, old=None, new=None, status=None, **extra):
+        """Update user"""
+        params = {"user_id": user_id, "username": username, "mobile": mobile, "email": email, "address": address, "old": old, "new": new, "status": status}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/update_user", params, None)
+
+    async def update_fcm(self, *, user_id=None, fcm_id=None, **extra):
+        """Update fcm"""
+        params = {"user_id": user_id, "fcm_id": fcm_id}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/update_fcm", params, None)
+
+    async def reset_password(self, *, mobile_no=None, new=None, **extra):
+        """Reset password"""
+        params = {"mobile_no": mobile_no, "new": new}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/reset_password", params, None)
+
+    async def verify_user(self, *, mobile=None, email=None, **extra):
+        """Verify user"""
+        params = {"mobile": mobile, "email": email}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/verify_user", params, None)
+
+    async def get_settings(self, *, type=None, **extra):
+        """Get settings"""
+        params = {"type": type}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/get_settings", params, None, coalesce=True)
+
+    async def send_withdrawal_request(self, *, user_id=None, payment_address=None, amount=None, **extra):
+        """Send withdrawal request"""
+        params = {"user_id": user_id, "payment_address": payment_address, "amount": amount}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/send_withdrawal_request", params, None)
+
+    async def get_withdrawal_request(self, *, user_id=None, limit=None, offset=None, **extra):
+        """Get withdrawal request"""
+        params = {"user_id": user_id, "limit": limit, "offset": offset}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/get_withdrawal_request", params, None, coalesce=True)
+
+    async def update_order_status(self, *, rider_id=None, order_id=None, status=None, otp=None, **extra):
+        """Update order status"""
+        params = {"rider_id": rider_id, "order_id": order_id, "status": status, "otp": otp}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/update_order_status", params, None)
+
+    async def get_pending_orders(self, *, user_id=None, limit=None, offset=None, sort=None, order=None, **extra):
+        """Get pending orders"""
+        params = {"user_id": user_id, "limit": limit, "offset": offset, "sort": sort, "order": order}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/get_pending_orders", params, Order, coalesce=True)
+
+    async def update_order_request(self, *, rider_id=None, order_id=None, accept_order=None, **extra):
+        """Update order request"""
+        params = {"rider_id": rider_id, "order_id": order_id, "accept_order": accept_order}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/update_order_request", params, None)
+
+    async def get_rider_cash_collection(self, *, rider_id=None, status=None, limit=None, offset=None, sort=None, order=None, search=None, **extra):
+        """Get rider cash collection"""
+        params = {"rider_id": rider_id, "status": status, "limit": limit, "offset": offset, "sort": sort, "order": order, "search": search}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/get_rider_cash_collection", params, Transaction, coalesce=True)
+
+    async def manage_live_tracking(self, *, order_id=None, order_status=None, latitude=None, longitude=None, **extra):
+        """Manage live tracking"""
+        params = {"order_id": order_id, "order_status": order_status, "latitude": latitude, "longitude": longitude}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/manage_live_tracking", params, None)
+
+    async def delete_live_tracking(self, *, order_id=None, **extra):
+        """Delete live tracking"""
+        params = {"order_id": order_id}
+        params.update(extra)
+        return await self._transport.call("/rider/app/v1/api/delete_live_tracking", params, None)
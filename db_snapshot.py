@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Parallel per-table snapshot/restore of the database, and copy-on-write datadir resets for a local MySQL container
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+MANIFEST = "manifest.json"
+CHUNK_ROWS = 200000
+BASELINE_SUFFIX = ".baseline"
+READY_TIMEOUT = 120
+# secondary index and constraint lines of SHOW CREATE TABLE that can be added after the data
+DEFERRED_RE = re.compile(r"^\s*(?:UNIQUE |FULLTEXT |SPATIAL )?KEY `\w+` \(`(\w+)`")
+CONSTRAINT_RE = re.compile(r"^\s*CONSTRAINT `\w+` FOREIGN KEY")
+PRIMARY_RE = re.compile(r"^\s*PRIMARY KEY \(([^)]*)\)", re.M)
+
+
+def mysql_rows(args, database, sql):
+    """Run one query through the mysql client and return tab-separated rows"""
+    result = subprocess.run(["mysql", "--batch", "--raw", "--skip-column-names", *shlex.split(args), database],
+                            input=sql, capture_output=True, text=True, check=True)
+    return [line.split("\t") for line in result.stdout.splitlines() if line]
+
+
+def split_create(statement):
+    """Split SHOW CREATE TABLE output into (base DDL, deferred index clauses, foreign key clauses).
+
+    The base keeps the columns and primary key, plus any index an
+    AUTO_INCREMENT column outside the primary key needs to exist at all.
+    """
+    lines = statement.splitlines()
+    head, body, tail = lines[0], lines[1:-1], lines[-1]
+    primary = []
+    auto_increment = set()
+    for line in body:
+        match = PRIMARY_RE.match(line)
+        if match:
+            primary = [c.strip(" `") for c in match.group(1).split(",")]
+        elif "AUTO_INCREMENT" in line and line.strip().startswith("`"):
+            auto_increment.add(line.strip().split("`")[1])
+    kept, indexes, foreign_keys = [], [], []
+    for line in body:
+        clause = line.strip().rstrip(",")
+        match = DEFERRED_RE.match(line)
+        if match and match.group(1) not in auto_increment - set(primary[:1]):
+            indexes.append("ADD " + clause)
+        elif CONSTRAINT_RE.match(line):
+            foreign_keys.append("ADD " + clause)
+        else:
+            kept.append("  " + clause)
+    return "\n".join([head] + [",\n".join(kept)] + [tail]), indexes, foreign_keys
+
+
+def plan_chunks(args, database, table, create, chunk_rows):
+    """Row count and WHERE ranges for one table; tables without a single integer key dump in one piece"""
+    count = int(mysql_rows(args, database, f"SELECT COUNT(*) FROM `{table}`;")[0][0])
+    match = PRIMARY_RE.search(create)
+    key = match.group(1).strip(" `") if match and "," not in match.group(1) else None
+    column = re.search(rf"^\s*`{key}` (\w+)", create, re.M) if key else None
+    if count <= chunk_rows or not column or "int" not in column.group(1).lower():
+        return count, [None]
+    low, high = (int(v) for v in mysql_rows(args, database, f"SELECT MIN(`{key}`), MAX(`{key}`) FROM `{table}`;")[0])
+    step = math.ceil((high - low + 1) / math.ceil(count / chunk_rows))
+    return count, [f"`{key}` >= {start} AND `{key}` < {start + step}" for start in range(low, high + 1, step)]
+
+
+def dump_chunk(args, database, table, where, path):
+    # every chunk is its own session without locks, so chunks do not share a consistent snapshot
+    command = ["mysqldump", *shlex.split(args), "--no-create-info", "--skip-triggers", "--compact",
+               "--extended-insert", "--net-buffer-length=1048576", "--hex-blob", "--default-character-set=utf8mb4",
+               "--skip-lock-tables"]
+    if where:
+        command.append(f"--where={where}")
+    with open(path, "wb") as out:
+        subprocess.run(command + [database, table], stdout=out, check=True)
+    return os.path.getsize(path)
+
+
+def dump(args, database, out_dir, tables=None, jobs=4, chunk_rows=CHUNK_ROWS):
+    """Dump every table's DDL and data chunks in parallel and write the manifest.
+
+    Chunks are read by separate sessions with no shared snapshot, so the
+    database must be idle while it runs or the tables will disagree.
+    """
+    names = [row[0] for row in mysql_rows(args, database, "SHOW FULL TABLES WHERE Table_type = 'BASE TABLE';")]
+    names = [name for name in names if not tables or name in tables]
+    manifest = {"database": database, "dumped_at": time.time(), "tables": {}}
+    tasks = []
+    for name in names:
+        create = mysql_rows(args, database, f"SHOW CREATE TABLE `{name}`;")
+        statement = "\n".join("\t".join(row) for row in create).split("\t", 1)[1]
+        base, indexes, foreign_keys = split_create(statement)
+        rows, ranges = plan_chunks(args, database, name, statement, chunk_rows)
+        os.makedirs(os.path.join(out_dir, name), exist_ok=True)
+        chunks = [os.path.join(name, f"{name}.{i:05d}.sql") for i in range(len(ranges))]
+        manifest["tables"][name] = {"create": base, "indexes": indexes, "foreign_keys": foreign_keys,
+                                    "rows": rows, "chunks": chunks}
+        tasks.extend((name, where, chunk) for where, chunk in zip(ranges, chunks))
+
+    written = 0
+    with ThreadPoolExecutor(jobs) as pool:
+        futures = [pool.submit(dump_chunk, args, database, name, where, os.path.join(out_dir, chunk))
+                   for name, where, chunk in tasks]
+        for done, future in enumerate(as_completed(futures), 1):
+            written += future.result()
+            if done % 20 == 0 or done == len(futures):
+                print(f"⏳ {done}/{len(futures)} chunks, {written / 1e6:.1f} MB")
+    with open(os.path.join(out_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def run_sql(args, database, sql=None, path=None):
+    """Feed SQL text or a file to one mysql client session with load-time checks off"""
+    command = ["mysql", *shlex.split(args), "--default-character-set=utf8mb4",
+               "--init-command=SET SESSION foreign_key_checks = 0, unique_checks = 0", database]
+    if path is not None:
+        with open(path, "rb") as f:
+            subprocess.run(command, stdin=f, check=True)
+    else:
+        subprocess.run(command, input=sql, text=True, check=True)
+
+
+def restore(args, database, in_dir, tables=None, jobs=4, verify=False):
+    """Recreate tables without secondary indexes, load chunks in parallel, then build each table's indexes.
+
+    A table's indexes are added in a single ALTER as soon as its last chunk
+    is in, while other tables are still loading; foreign keys go on last.
+    """
+    with open(os.path.join(in_dir, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    selected = {name: t for name, t in manifest["tables"].items() if not tables or name in tables}
+    run_sql(args, database, "".join(f"DROP TABLE IF EXISTS `{name}`;\n{t['create']};\n"
+                                    for name, t in selected.items()))
+
+    remaining = {name: len(t["chunks"]) for name, t in selected.items()}
+    lock = threading.Lock()
+    timings = {}
+    started = time.time()
+
+    def load(name, chunk):
+        run_sql(args, database, path=os.path.join(in_dir, chunk))
+        with lock:
+            remaining[name] -= 1
+            last = remaining[name] == 0
+        if last and selected[name]["indexes"]:
+            index_started = time.time()
+            run_sql(args, database, f"ALTER TABLE `{name}` {', '.join(selected[name]['indexes'])};")
+            timings[name] = time.time() - index_started
+
+    # biggest tables first so the longest chain of chunk + index work starts early
+    order = sorted(selected, key=lambda name: -selected[name]["rows"])
+    with ThreadPoolExecutor(jobs) as pool:
+        futures = [pool.submit(load, name, chunk) for name in order for chunk in selected[name]["chunks"]]
+        for done, future in enumerate(as_completed(futures), 1):
+            future.result()
+            if done % 20 == 0 or done == len(futures):
+                print(f"⏳ {done}/{len(futures)} chunks loaded ({time.time() - started:.1f}s)")
+    foreign_keys = [f"ALTER TABLE `{name}` {', '.join(t['foreign_keys'])};" for name, t in selected.items()
+                    if t["foreign_keys"]]
+    if foreign_keys:
+        run_sql(args, database, "\n".join(foreign_keys))
+
+    mismatched = []
+    if verify:
+        for name, t in selected.items():
+            rows = int(mysql_rows(args, database, f"SELECT COUNT(*) FROM `{name}`;")[0][0])
+            if rows != t["rows"]:
+                mismatched.append((name, t["rows"], rows))
+    return timings, mismatched
+
+
+def docker(*command, check=True):
+    return subprocess.run(["docker", *command], capture_output=True, text=True, check=check)
+
+
+def wait_ready(container, timeout=READY_TIMEOUT):
+    """Block until mysqld in the container answers a ping"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if docker("exec", container, "mysqladmin", "ping", "--silent", check=False).returncode == 0:
+            return
+        time.sleep(0.2)
+    raise TimeoutError(f"{container} did not come up within {timeout}s")
+
+
+def clone_tree(source, target):
+    """Copy a datadir with reflinks where the filesystem supports them (btrfs, XFS), a full copy otherwise"""
+    subprocess.run(["cp", "-a", "--reflink=auto", source, target], check=True)
+
+
+def take_baseline(container, datadir, baseline):
+    """Cleanly stop the container and keep its datadir as the reset point"""
+    docker("stop", container)
+    if os.path.exists(baseline):
+        shutil.rmtree(baseline)
+    clone_tree(datadir, baseline)
+    docker("start", container)
+    wait_ready(container)
+
+
+def reset_to_baseline(container, datadir, baseline):
+    """Throw away the container's datadir and bring it back from the baseline.
+
+    The running state is discarded, so the container is killed rather than
+    stopped; the baseline came from a clean shutdown and needs no recovery.
+    The old datadir is deleted in the background once mysqld is back up.
+    """
+    if not os.path.isdir(baseline):
+        raise FileNotFoundError(f"no baseline at {baseline}; run the baseline command first")
+    docker("kill", container, check=False)  # already stopped is fine
+    trash = f"{datadir}.discard-{os.getpid()}-{int(time.time())}"
+    os.rename(datadir, trash)
+    try:
+        clone_tree(baseline, datadir)
+    except (OSError, subprocess.CalledProcessError):
+        shutil.rmtree(datadir, ignore_errors=True)
+        os.rename(trash, datadir)
+        raise
+    docker("start", container)
+    wait_ready(container)
+    threading.Thread(target=shutil.rmtree, args=(trash,), kwargs={"ignore_errors": True}).start()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snapshot and restore the benchmark database quickly")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, text in (("dump", "dump tables in parallel to per-table chunk files; chunks come from separate "
+                                "unlocked sessions with no shared snapshot, so the database must be idle"),
+                       ("restore", "reload a dump in parallel with indexes deferred")):
+        command = commands.add_parser(name, help=text)
+        command.add_argument("directory")
+        command.add_argument("--mysql", default="", help="mysql/mysqldump connection options, e.g. '-h 127.0.0.1 -u root'")
+        command.add_argument("--database", required=True)
+        command.add_argument("--tables", nargs="*", help="only these tables")
+        command.add_argument("--jobs", type=int, default=4, help="parallel client processes")
+    commands.choices["dump"].add_argument("--chunk-rows", type=int, default=CHUNK_ROWS,
+                                          help="rows per chunk for tables with an integer primary key")
+    commands.choices["restore"].add_argument("--verify", action="store_true",
+                                             help="compare row counts with the dump afterwards")
+    for name, text in (("baseline", "stop the MySQL container and keep a copy of its datadir"),
+                       ("reset", "replace the container's datadir with the baseline copy and restart it")):
+        command = commands.add_parser(name, help=text)
+        command.add_argument("--container", required=True)
+        command.add_argument("--datadir", required=True, help="host path bind-mounted as /var/lib/mysql")
+        command.add_argument("--baseline", help=f"where the baseline copy lives (default: DATADIR{BASELINE_SUFFIX})")
+    args = parser.parse_args()
+
+    started = time.time()
+    if args.command == "dump":
+        manifest = dump(args.mysql, args.database, args.directory, args.tables, args.jobs, args.chunk_rows)
+        tables = manifest["tables"].values()
+        print(f"✅ Dumped {len(tables)} tables, {sum(t['rows'] for t in tables):,} rows, "
+              f"{sum(len(t['chunks']) for t in tables)} chunks in {time.time() - started:.1f}s")
+        print(f"📁 Directory: {args.directory}")
+    elif args.command == "restore":
+        timings, mismatched = restore(args.mysql, args.database, args.directory, args.tables, args.jobs, args.verify)
+        print(f"✅ Restored in {time.time() - started:.1f}s")
+        for name, seconds in sorted(timings.items(), key=lambda kv: -kv[1])[:5]:
+            print(f"📊 {name}: indexes built in {seconds:.1f}s")
+        for name, expected, actual in mismatched:
+            print(f"⚠️  {name}: {actual:,} rows, dump had {expected:,}")
+        if args.verify and not mismatched:
+            print("✅ Row counts match the dump")
+    else:
+        args.datadir = os.path.abspath(args.datadir)
+        baseline = args.baseline or args.datadir + BASELINE_SUFFIX
+        if args.command == "baseline":
+            take_baseline(args.container, args.datadir, baseline)
+            print(f"✅ Baseline saved to {baseline} in {time.time() - started:.1f}s")
+        else:
+            reset_to_baseline(args.container, args.datadir, baseline)
+            print(f"✅ {args.container} reset to baseline in {time.time() - started:.1f}s")
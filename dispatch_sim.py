@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Simulate riders polling get_pending_orders and racing update_order_request, or drive the same pattern live
+"""
+
+import argparse
+import asyncio
+import heapq
+import json
+import random
+import time
+from collections import defaultdict
+
+from generate_postman_collection import create_collection_from_controllers, create_postman_collection
+from latency_histogram import LatencyHistogram
+from load_test import EndpointStats, _against_target, collection_requests, send_spec
+from token_pool import TokenPool
+
+# DB round trips per API call, counted along the PHP path: verify_tokens, the
+# rider's serviceable_city, fetch_orders' count and search queries, then the
+# per-order item/address/status lookups; update_rider's fetches, the
+# pending_orders check and delete, custom_notifications and the orders update.
+QUERIES = {"poll": 4, "poll_row": 3, "accept": 10, "reject": 4, "push": 2}
+POLL_LIMIT = 25
+STEAL_MESSAGE = "Order re-assigned to other Rider."
+
+
+class Order:
+    __slots__ = ("id", "city", "arrived", "rider", "assigned", "rejected", "offered")
+
+    def __init__(self, order_id, city, arrived):
+        self.id = order_id
+        self.city = city
+        self.arrived = arrived
+        self.rider = None
+        self.assigned = None
+        self.rejected = set()
+        self.offered = set()
+
+
+class Rider:
+    __slots__ = ("id", "city", "busy", "job", "pending_accept", "offer")
+
+    def __init__(self, rider_id, city):
+        self.id = rider_id
+        self.city = city
+        self.busy = False
+        self.job = 0
+        self.pending_accept = False
+        self.offer = None
+
+
+class SimResult:
+    """Counters for one simulated configuration"""
+
+    def __init__(self, label):
+        self.label = label
+        self.time_to_assign = LatencyHistogram()
+        self.lock_wait = LatencyHistogram()
+        self.orders = 0
+        self.accepts = 0
+        self.conflicts = 0
+        self.steals = 0
+        self.rejects = 0
+        self.api_requests = 0
+        self.db_queries = 0
+        self.unassigned = 0
+
+    def summary(self, duration):
+        tta = self.time_to_assign
+        return {
+            "config": self.label, "orders": self.orders, "assigned": tta.count, "unassigned": self.unassigned,
+            "tta_p50_s": tta.percentile(50) / 1000000, "tta_p95_s": tta.percentile(95) / 1000000,
+            "tta_p99_s": tta.percentile(99) / 1000000,
+            "conflict_rate": self.conflicts / self.accepts if self.accepts else 0.0,
+            "double_assignments": self.steals,
+            "lock_wait_p99_ms": self.lock_wait.percentile(99) / 1000,
+            "api_rps": self.api_requests / duration, "db_qps": self.db_queries / duration,
+        }
+
+
+class DispatchSim:
+    """Discrete-event model of the pending-orders pool and the riders competing for it.
+
+    Idle riders poll every `poll_interval` seconds (with ±20% jitter) and,
+    after a reaction delay, accept the newest visible order (`pick="newest"`
+    mirrors get_pending_orders' o.id DESC sort). Accepts on one order
+    serialise on its row lock for `accept_service` seconds. By default the
+    outcome follows update_rider(): a second accept re-assigns the order, so
+    both riders were told it is theirs. With `atomic` the update only
+    succeeds while rider_id is unset and the loser goes back to polling.
+
+    `dispatch="push"` replaces polling: new orders, and orders still waiting
+    when a rider frees up, are offered to `fanout` idle riders at once
+    (0 for every idle rider in the city) and the first accept wins.
+    """
+
+    def __init__(self, riders=200, cities=4, order_rate=10.0, poll_interval=10.0, reaction=3.0,
+                 delivery_time=900.0, accept_service=0.05, poll_service=0.08, push_latency=0.5,
+                 accept_prob=0.9, dispatch="poll", atomic=False, fanout=1, pick="newest", seed=None):
+        self.rng = random.Random(seed)
+        # arrivals and delivery times come from their own streams so every config sees the same demand
+        self.arrivals = random.Random(None if seed is None else f"arrivals-{seed}")
+        self.deliveries = random.Random(None if seed is None else f"deliveries-{seed}")
+        self.order_rate = order_rate / 60.0
+        self.poll_interval = poll_interval
+        self.reaction = reaction
+        self.delivery_time = delivery_time
+        self.accept_service = accept_service
+        self.poll_service = poll_service
+        self.push_latency = push_latency
+        self.accept_prob = accept_prob
+        self.dispatch = dispatch
+        self.atomic = atomic or dispatch == "push"
+        self.fanout = fanout
+        self.pick = pick
+        self.cities = cities
+        self.riders = [Rider(i, i % cities) for i in range(riders)]
+        self.pending = defaultdict(list)
+        self.lock_free = {}
+        self.events = []
+        self.seq = 0
+        self.now = 0.0
+        mode = ("push" + (f" fanout={fanout}" if fanout else " broadcast") if dispatch == "push"
+                else f"poll {poll_interval:g}s" + (" atomic" if atomic else ""))
+        self.result = SimResult(mode)
+
+    def at(self, when, handler, *args):
+        self.seq += 1
+        heapq.heappush(self.events, (when, self.seq, handler, args))
+
+    def react(self):
+        return self.reaction * self.rng.uniform(0.5, 1.5)
+
+    def run(self, duration):
+        self.at(self.arrivals.expovariate(self.order_rate), self.order_arrives, 0)
+        if self.dispatch == "poll":
+            for rider in self.riders:
+                self.at(self.rng.uniform(0, self.poll_interval), self.poll, rider)
+        while self.events and self.events[0][0] < duration:
+            self.now, _, handler, args = heapq.heappop(self.events)
+            handler(*args)
+        self.result.unassigned = sum(len(orders) for orders in self.pending.values())
+        return self.result
+
+    def order_arrives(self, order_id):
+        order = Order(order_id, self.arrivals.randrange(self.cities), self.now)
+        self.pending[order.city].append(order)
+        self.result.orders += 1
+        self.at(self.now + self.arrivals.expovariate(self.order_rate), self.order_arrives, order_id + 1)
+        if self.dispatch == "push":
+            self.offer(order)
+
+    def visible(self, rider):
+        return [o for o in self.pending[rider.city] if rider.id not in o.rejected]
+
+    def poll(self, rider):
+        if rider.busy:
+            return
+        visible = self.visible(rider)
+        self.result.api_requests += 1
+        self.result.db_queries += QUERIES["poll"] + QUERIES["poll_row"] * min(len(visible), POLL_LIMIT)
+        if visible and not rider.pending_accept:
+            order = visible[-1] if self.pick == "newest" else self.rng.choice(visible)
+            rider.pending_accept = True
+            self.at(self.now + self.poll_service + self.react(), self.accept, rider, order)
+        self.at(self.now + self.poll_interval * self.rng.uniform(0.8, 1.2), self.poll, rider)
+
+    def offer(self, order):
+        idle = [r for r in self.riders if r.city == order.city and not r.busy and r.offer is None
+                and r.id not in order.rejected]
+        if not idle:
+            return
+        chosen = self.rng.sample(idle, min(self.fanout, len(idle))) if self.fanout else idle
+        self.result.db_queries += QUERIES["push"]
+        for rider in chosen:
+            rider.offer = order
+            order.offered.add(rider.id)
+            self.at(self.now + self.push_latency + self.react(), self.accept, rider, order)
+
+    def accept(self, rider, order):
+        """The rider's update_order_request reaches the server"""
+        rider.pending_accept = False
+        if rider.offer is order:
+            rider.offer = None
+        order.offered.discard(rider.id)
+        if rider.busy:
+            return
+        self.result.api_requests += 1
+        if self.rng.random() >= self.accept_prob:
+            self.result.rejects += 1
+            self.result.db_queries += QUERIES["reject"]
+            order.rejected.add(rider.id)
+            if self.dispatch == "push" and order.rider is None and not order.offered:
+                self.offer(order)
+            return
+        self.result.accepts += 1
+        self.result.db_queries += QUERIES["accept"]
+        start = max(self.now, self.lock_free.get(order.id, 0.0))
+        self.lock_free[order.id] = start + self.accept_service
+        self.result.lock_wait.record((start - self.now) * 1000000)
+        self.at(start + self.accept_service, self.accepted, rider, order)
+
+    def accepted(self, rider, order):
+        """The row update commits; decide who ends up with the order"""
+        if rider.busy:
+            return
+        if order.rider is not None and order.rider is not rider:
+            self.result.conflicts += 1
+            if self.atomic:
+                # still idle: a polling rider's next poll is already scheduled, a pushed one needs an offer
+                if self.dispatch == "push":
+                    self.offer_waiting(rider)
+                return
+            # update_rider() overwrites rider_id: the earlier rider silently loses the job
+            self.result.steals += 1
+            self.rider_free(order.rider)
+        if order.assigned is None:
+            order.assigned = self.now
+            self.result.time_to_assign.record((self.now - order.arrived) * 1000000)
+            self.pending[order.city].remove(order)
+        order.rider = rider
+        rider.busy = True
+        rider.job += 1
+        self.at(self.now + self.deliveries.expovariate(1 / self.delivery_time), self.delivered, rider, rider.job)
+
+    def delivered(self, rider, job):
+        if rider.job == job and rider.busy:
+            self.rider_free(rider)
+
+    def rider_free(self, rider):
+        """A busy rider becomes idle: restart polling, or offer them an order nobody is considering"""
+        rider.busy = False
+        rider.job += 1
+        if self.dispatch == "poll":
+            self.at(self.now + self.rng.uniform(0, self.poll_interval), self.poll, rider)
+        else:
+            self.offer_waiting(rider)
+
+    def offer_waiting(self, rider):
+        for order in self.pending[rider.city]:
+            if rider.offer is not None:
+                break
+            if not order.offered and rider.id not in order.rejected:
+                self.offer(order)
+
+
+def simulate(configs, duration, **params):
+    """Run each (dispatch, poll_interval, atomic, fanout) config with the same seed and return summaries"""
+    summaries = []
+    for dispatch, interval, atomic, fanout in configs:
+        sim = DispatchSim(dispatch=dispatch, poll_interval=interval, atomic=atomic, fanout=fanout, **params)
+        summaries.append(sim.run(duration).summary(duration))
+    return summaries
+
+
+def print_summaries(summaries):
+    print(f"{'config':<22}{'orders':>8}{'unassigned':>11}{'tta p50 s':>11}{'tta p95 s':>11}{'tta p99 s':>11}"
+          f"{'conflict':>10}{'double':>8}{'lock p99 ms':>12}{'api rps':>9}{'db qps':>9}")
+    for s in summaries:
+        print(f"{s['config']:<22}{s['orders']:>8}{s['unassigned']:>11}{s['tta_p50_s']:>11.1f}{s['tta_p95_s']:>11.1f}"
+              f"{s['tta_p99_s']:>11.1f}{s['conflict_rate']:>10.1%}{s['double_assignments']:>8}"
+              f"{s['lock_wait_p99_ms']:>12.1f}{s['api_rps']:>9.1f}{s['db_qps']:>9.1f}")
+
+
+class LiveStats:
+    """What the riders observed against a real target"""
+
+    def __init__(self):
+        self.endpoints = defaultdict(EndpointStats)
+        self.time_to_assign = LatencyHistogram()
+        self.placed = {}
+        self.first_seen = {}
+        self.owner = {}
+        self.accepts = 0
+        self.conflicts = 0
+        self.steals = 0
+
+
+def order_ids(response):
+    try:
+        envelope = response.json()
+    except ValueError:
+        return []
+    data = envelope.get("data") if isinstance(envelope, dict) else None
+    return [str(row["id"]) for row in data if isinstance(row, dict) and "id" in row] if isinstance(data, list) else []
+
+
+async def nap(seconds, deadline):
+    """Sleep, but never past the deadline"""
+    await asyncio.sleep(max(0.0, min(seconds, deadline - time.perf_counter())))
+
+
+async def live_rider(pool, specs, rider_id, auth, stats, deadline, interval, reaction, delivery_time, pick, rng):
+    """Poll get_pending_orders and accept like one rider app until the deadline"""
+    await nap(rng.uniform(0, interval), deadline)
+    while time.perf_counter() < deadline:
+        poll = dict(specs["poll"], body=dict(specs["poll"]["body"], user_id=rider_id, offset="0"))
+        try:
+            latency, response = await send_spec(pool, poll, auth=auth)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            stats.endpoints[poll["key"]].failures += 1
+            await nap(interval, deadline)
+            continue
+        stats.endpoints[poll["key"]].record(latency, response)
+        ids = order_ids(response)
+        now = time.perf_counter()
+        for order_id in ids:
+            stats.first_seen.setdefault(order_id, now)
+        if ids:
+            order_id = ids[0] if pick == "newest" else rng.choice(ids)
+            await nap(reaction * rng.uniform(0.5, 1.5), deadline)
+            accept = dict(specs["accept"], body=dict(specs["accept"]["body"], rider_id=rider_id,
+                                                     order_id=order_id, accept_order="1"))
+            try:
+                latency, response = await send_spec(pool, accept, auth=auth)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                stats.endpoints[accept["key"]].failures += 1
+                continue
+            stats.endpoints[accept["key"]].record(latency, response)
+            stats.accepts += 1
+            try:
+                envelope = response.json()
+            except ValueError:
+                envelope = {}
+            if response.status >= 400 or envelope.get("error") is True:
+                stats.conflicts += 1
+            else:
+                previous = stats.owner.get(order_id)
+                if previous is not None and previous != rider_id or envelope.get("message") == STEAL_MESSAGE:
+                    stats.conflicts += 1
+                    stats.steals += 1
+                else:
+                    started = stats.placed.get(order_id, stats.first_seen[order_id])
+                    stats.time_to_assign.record((time.perf_counter() - started) * 1000000)
+                stats.owner[order_id] = rider_id
+                await nap(rng.expovariate(1 / delivery_time), deadline)
+                continue
+        await nap(interval * rng.uniform(0.8, 1.2), deadline)
+
+
+async def live_orders(pool, spec, stats, deadline, rate, tokens, rng):
+    """Place orders at Poisson arrivals so time-to-assignment starts at checkout"""
+    while True:
+        await nap(rng.expovariate(rate / 60.0), deadline)
+        if time.perf_counter() >= deadline:
+            return
+        try:
+            latency, response = await send_spec(pool, spec, auth=tokens.next_user() if tokens else None)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            stats.endpoints[spec["key"]].failures += 1
+            continue
+        stats.endpoints[spec["key"]].record(latency, response)
+        try:
+            order_id = response.json().get("order_id")
+        except (ValueError, AttributeError):
+            order_id = None
+        if order_id is not None:
+            stats.placed.setdefault(str(order_id), time.perf_counter())
+
+
+async def live(pool, collection, riders, duration, interval, reaction, delivery_time, pick, order_rate=0.0,
+               rider_tokens=None, customer_tokens=None, seed=None):
+    """Run `riders` rider loops (and optionally an order feeder) against the target"""
+    specs = {s["key"]: s for s in collection_requests(collection)}
+    specs = {"poll": specs["rider/get_pending_orders"], "accept": specs["rider/update_order_request"],
+             "place": specs["place_order"]}
+    stats = LiveStats()
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    deadline = started + duration
+    tasks = []
+    for i in range(riders):
+        auth = rider_tokens.user(i) if rider_tokens else None
+        rider_id = str(auth[0]) if auth else str(i + 1)
+        tasks.append(live_rider(pool, specs, rider_id, auth, stats, deadline, interval, reaction, delivery_time,
+                                pick, random.Random(rng.random())))
+    if order_rate:
+        tasks.append(live_orders(pool, specs["place"], stats, deadline, order_rate, customer_tokens,
+                                 random.Random(rng.random())))
+    await asyncio.gather(*tasks)
+    return stats, time.perf_counter() - started
+
+
+def print_live(stats, elapsed):
+    requests = sum(s.count for s in stats.endpoints.values())
+    for key, s in sorted(stats.endpoints.items()):
+        print(f"  {key:<30}{s.count:>8} ({s.count / elapsed:.1f}/s) · p50 {s.latency.percentile(50) / 1000:.2f} ms "
+              f"· p99 {s.latency.percentile(99) / 1000:.2f} ms · errors {s.errors}")
+    tta = stats.time_to_assign
+    print(f"📦 Orders assigned: {tta.count} · time to assignment p50 {tta.percentile(50) / 1000000:.2f}s "
+          f"· p95 {tta.percentile(95) / 1000000:.2f}s")
+    print(f"⚔️  Accepts: {stats.accepts} · conflicts {stats.conflicts} "
+          f"({stats.conflicts / stats.accepts if stats.accepts else 0:.1%}) · double assignments {stats.steals}")
+    print(f"📊 {requests} API requests in {elapsed:.1f}s ({requests / elapsed:.1f} req/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Model rider dispatch contention on the pending-orders pool")
+    parser.add_argument("--riders", type=int, default=200)
+    parser.add_argument("--cities", type=int, default=4, help="riders and orders are split evenly across cities")
+    parser.add_argument("--order-rate", type=float, default=10.0, help="new orders per minute")
+    parser.add_argument("--poll-interval", type=lambda s: [float(v) for v in s.split(",")], default=[10.0],
+                        help="seconds between polls; a comma-separated list sweeps them")
+    parser.add_argument("--reaction", type=float, default=3.0, help="mean seconds from seeing an order to accepting")
+    parser.add_argument("--delivery-time", type=float, default=900.0, help="mean seconds a rider is busy")
+    parser.add_argument("--accept-prob", type=float, default=0.9, help="share of offers the rider accepts")
+    parser.add_argument("--pick", choices=("newest", "random"), default="newest",
+                        help="which visible order a rider goes for (the API lists newest first)")
+    parser.add_argument("--duration", type=float, default=3600.0, help="simulated (or live) seconds")
+    parser.add_argument("--compare", action="store_true",
+                        help="also run atomic accepts and push dispatch for each interval")
+    parser.add_argument("--fanout", type=int, default=1, help="riders offered each order in push mode; 0 = all idle")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--live", action="store_true", help="drive the target with real rider loops instead")
+    parser.add_argument("--base-url", default="http://localhost:9000")
+    parser.add_argument("--stand-in", action="store_true",
+                        help="target a built-in localhost stand-in instead of --base-url")
+    parser.add_argument("--rider-tokens", help="token pool of rider accounts (token_pool.py) for --live")
+    parser.add_argument("--tokens", help="token pool of customers placing orders in --live mode")
+    parser.add_argument("--from-controllers", action="store_true",
+                        help="use the collection built from the Api.php set_rules() calls")
+    args = parser.parse_args()
+
+    if args.live:
+        collection = create_collection_from_controllers() if args.from_controllers else create_postman_collection()
+        rider_tokens = TokenPool.load(args.rider_tokens) if args.rider_tokens else None
+        tokens = TokenPool.load(args.tokens) if args.tokens else None
+        (stats, elapsed), opened = asyncio.run(_against_target(
+            args.base_url, min(args.riders, 100), args.stand_in,
+            lambda pool: live(pool, collection, args.riders, args.duration, args.poll_interval[0], args.reaction,
+                              args.delivery_time, args.pick, args.order_rate, rider_tokens, tokens, args.seed)))
+        print(f"🛵 {args.riders} riders polling every {args.poll_interval[0]:g}s for {args.duration:g}s")
+        print_live(stats, elapsed)
+        print(f"🔌 Connections opened: {opened}")
+    else:
+        configs = []
+        for interval in args.poll_interval:
+            configs.append(("poll", interval, False, args.fanout))
+            if args.compare:
+                configs.append(("poll", interval, True, args.fanout))
+        if args.compare:
+            configs.append(("push", 0.0, True, args.fanout))
+            if args.fanout != 0:
+                configs.append(("push", 0.0, True, 0))
+        started = time.perf_counter()
+        summaries = simulate(configs, args.duration, riders=args.riders, cities=args.cities,
+                             order_rate=args.order_rate, reaction=args.reaction, delivery_time=args.delivery_time,
+                             accept_prob=args.accept_prob, pick=args.pick, seed=args.seed)
+        if args.json:
+            print(json.dumps(summaries, indent=2))
+        else:
+            print(f"🛵 {args.riders} riders · {args.order_rate:g} orders/min · {args.duration:g}s simulated "
+                  f"in {time.perf_counter() - started:.1f}s")
+            print_summaries(summaries)
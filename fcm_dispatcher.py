@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Async FCM push dispatcher fed from a JSON-lines queue, with a local fake FCM for benchmarks
+
+Each queue line is one send_notification() call:
+  {"tokens": {"android": ["..."], "ios": ["..."], "web": ["..."]},
+   "data": {"title": "...", "body": "...", "type": "order", "type_id": "12"}}
+PHP can append these with file_put_contents(..., FILE_APPEND | LOCK_EX) instead of sending inline.
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import random
+import subprocess
+import tempfile
+import time
+from urllib.parse import urlencode, urlsplit
+
+from latency_histogram import LatencyHistogram
+from load_test import ConnectionPool
+from mock_server import _encode, _listen, http_response
+
+FCM_BASE = "https://fcm.googleapis.com"
+TOKEN_URL = "https://oauth2.googleapis.com/token"
+SCOPE = "https://www.googleapis.com/auth/firebase.messaging"
+SKIP_TOKENS = {"BLACKLISTED", "", "-"}
+PLATFORMS = ("android", "ios", "web")
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+CONCURRENCY = 200
+MAX_ATTEMPTS = 5
+BATCH_LINES = 1000
+TOKEN_REFRESH_MARGIN = 300
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def sign_rs256(data, private_key_pem):
+    """RS256-sign bytes with the openssl CLI, as openssl_sign() does in get_access_token()"""
+    with tempfile.NamedTemporaryFile("w", suffix=".pem", delete=False) as key_file:
+        key_file.write(private_key_pem)
+    try:
+        return subprocess.run(["openssl", "dgst", "-sha256", "-sign", key_file.name], input=data,
+                              capture_output=True, check=True).stdout
+    finally:
+        os.unlink(key_file.name)
+
+
+class AccessTokenCache:
+    """OAuth access token for the service account, minted once and reused until close to expiry.
+
+    get_access_token() signs a JWT and calls the token endpoint on every
+    send_notification(); here concurrent senders share one in-flight
+    refresh and the token is kept until TOKEN_REFRESH_MARGIN before it expires.
+    """
+
+    def __init__(self, service_account, token_url=TOKEN_URL):
+        self.service_account = service_account
+        self.token_url = token_url
+        parts = urlsplit(token_url)
+        self.pool = ConnectionPool(f"{parts.scheme}://{parts.netloc}", size=2)
+        self.path = parts.path or "/"
+        self.token = None
+        self.expires_at = 0.0
+        self.fetches = 0
+        self._lock = asyncio.Lock()
+
+    def _assertion(self):
+        now = int(time.time())
+        header = {"alg": "RS256", "typ": "JWT"}
+        payload = {"iss": self.service_account["client_email"], "scope": SCOPE, "aud": self.token_url,
+                   "exp": now + 3600, "iat": now}
+        signing_input = ".".join(_b64(json.dumps(part).encode()) for part in (header, payload))
+        return signing_input + "." + _b64(sign_rs256(signing_input.encode("ascii"),
+                                                    self.service_account["private_key"]))
+
+    async def get(self):
+        if self.token and time.time() < self.expires_at - TOKEN_REFRESH_MARGIN:
+            return self.token
+        async with self._lock:
+            if self.token and time.time() < self.expires_at - TOKEN_REFRESH_MARGIN:
+                return self.token
+            assertion = await asyncio.get_running_loop().run_in_executor(None, self._assertion)
+            body = urlencode({"grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
+                              "assertion": assertion}).encode()
+            response = await self.pool.request("POST", self.path, body,
+                                               {"Content-Type": "application/x-www-form-urlencoded"})
+            if response.status != 200:
+                raise RuntimeError(f"token endpoint returned {response.status}: {response.body[:200]!r}")
+            data = response.json()
+            self.fetches += 1
+            self.token = data["access_token"]
+            self.expires_at = time.time() + int(data.get("expires_in", 3600))
+            return self.token
+
+    def invalidate(self, token):
+        if self.token == token:
+            self.token = None
+
+    async def close(self):
+        await self.pool.close()
+
+
+def build_message(platform, token, fields):
+    """The FCM v1 message sendNotificationToPlatform() builds for one token"""
+    fields = {k: "" if v is None else str(v).lower() if isinstance(v, bool) else str(v) for k, v in fields.items()}
+    notification = {"title": fields.get("title", ""), "body": fields.get("body", ""), "image": fields.get("image", "")}
+    message = {"token": token, "notification": notification, "data": fields}
+    if platform == "android":
+        message["android"] = {"priority": "high", "notification": dict(notification)}
+    elif platform == "ios":
+        message["apns"] = {"headers": {"apns-priority": "10"},
+                           "payload": {"aps": {"alert": {"title": notification["title"], "body": notification["body"]},
+                                               "sound": "default"}}}
+    elif platform == "web":
+        message["webpush"] = {"notification": {"title": notification["title"], "body": notification["body"],
+                                               "icon": notification["image"]}}
+    return {"message": message}
+
+
+def expand_job(job, seen):
+    """Yield (platform, token, fields) sends for a queued job, skipping blacklisted and repeated ones.
+
+    `seen` holds (token, payload digest) pairs already sent in this batch, so
+    a notification queued twice for the same device goes out once.
+    """
+    tokens = dict(job.get("tokens") or {})
+    if "" in tokens:
+        tokens["ios"] = tokens.pop("")
+    fields = job.get("data") or {}
+    digest = hashlib.sha1(json.dumps(fields, sort_keys=True).encode()).digest()
+    for platform in PLATFORMS:
+        for token in tokens.get(platform) or ():
+            if token in SKIP_TOKENS or (token, digest) in seen:
+                continue
+            seen.add((token, digest))
+            yield platform, token, fields
+
+
+class Dispatcher:
+    """Send FCM messages with bounded concurrency, keep-alive connections and retries"""
+
+    def __init__(self, project_id, access_tokens, fcm_base=FCM_BASE, concurrency=CONCURRENCY,
+                 max_attempts=MAX_ATTEMPTS):
+        self.pool = ConnectionPool(fcm_base, size=concurrency)
+        self.path = f"/v1/projects/{project_id}/messages:send"
+        self.access_tokens = access_tokens
+        self.slots = asyncio.Semaphore(concurrency)
+        self.max_attempts = max_attempts
+        self.latency = LatencyHistogram()
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.deduplicated = 0
+        self.malformed = 0
+        self.unregistered = set()
+
+    async def send(self, platform, token, fields):
+        body = json.dumps(build_message(platform, token, fields), separators=(",", ":")).encode()
+        for attempt in range(self.max_attempts):
+            # the slot is held for the request only, so a backing-off send does not block fresh ones
+            async with self.slots:
+                retry_after = None
+                try:
+                    # a failed OAuth exchange is retried like a failed send rather than ending the batch
+                    access_token = await self.access_tokens.get()
+                    headers = {"Authorization": "Bearer " + access_token, "Content-Type": "application/json"}
+                    started = time.perf_counter()
+                    response = await self.pool.request("POST", self.path, body, headers)
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, RuntimeError,
+                        KeyError):
+                    status = None
+                else:
+                    status = response.status
+                    if status == 200:
+                        self.latency.record((time.perf_counter() - started) * 1000000)
+                        self.sent += 1
+                        return True
+                    if status == 401:
+                        self.access_tokens.invalidate(access_token)
+                    elif status in (400, 404) and (b"UNREGISTERED" in response.body
+                                                   or b"registration token" in response.body):
+                        self.unregistered.add(token)
+                        self.failed += 1
+                        return False
+                    elif status not in RETRY_STATUSES:
+                        self.failed += 1
+                        return False
+                    retry_after = response.headers.get("retry-after")
+            if attempt + 1 < self.max_attempts:
+                self.retries += 1
+                delay = float(retry_after) if retry_after and retry_after.isdigit() else \
+                    min(30.0, 0.1 * 2 ** attempt) * random.uniform(0.5, 1.5)
+                await asyncio.sleep(delay)
+        self.failed += 1
+        return False
+
+    async def dispatch(self, jobs):
+        """Send every message of a batch of queued jobs and wait for all of them"""
+        seen = set()
+        sends = []
+        for job in jobs:
+            if not isinstance(job, dict):
+                self.malformed += 1
+                continue
+            expanded = list(expand_job(job, seen))
+            wanted = sum(1 for tokens in (job.get("tokens") or {}).values() for token in tokens or ()
+                         if token not in SKIP_TOKENS)
+            self.deduplicated += wanted - len(expanded)
+            sends.extend(self.send(*s) for s in expanded)
+        await asyncio.gather(*sends)
+
+    async def close(self):
+        await self.pool.close()
+
+
+async def read_queue(path, offset_path, batch_lines=BATCH_LINES, follow=False, poll=0.2):
+    """Yield (jobs, end_offset) batches from a JSON-lines queue, resuming from a saved offset.
+
+    A line that is not valid JSON is yielded as None so the dispatcher can
+    count it, and the offset still moves past it.
+    """
+    offset = 0
+    if offset_path and os.path.exists(offset_path):
+        with open(offset_path, encoding="utf-8") as f:
+            offset = int(f.read().strip() or 0)
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while True:
+            jobs = []
+            while len(jobs) < batch_lines:
+                position = f.tell()
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    f.seek(position)  # a partial line is still being appended
+                    break
+                if line.strip():
+                    try:
+                        jobs.append(json.loads(line))
+                    except ValueError:
+                        jobs.append(None)
+            if jobs:
+                yield jobs, f.tell()
+            elif follow:
+                await asyncio.sleep(poll)
+            else:
+                return
+
+
+def save_offset(offset_path, offset):
+    with open(offset_path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(str(offset))
+    os.replace(offset_path + ".tmp", offset_path)
+
+
+async def run_worker(queue_path, dispatcher, offset_path=None, follow=False, batch_lines=BATCH_LINES,
+                     on_batch=None):
+    """Drain the queue batch by batch, checkpointing the offset after each batch is fully sent"""
+    async for jobs, offset in read_queue(queue_path, offset_path, batch_lines, follow):
+        await dispatcher.dispatch(jobs)
+        if offset_path:
+            save_offset(offset_path, offset)
+        if on_batch:
+            on_batch(len(jobs))
+
+
+class FakeFcm:
+    """State of the local FCM stand-in: issued tokens, injected latency and failures"""
+
+    def __init__(self, latency=0.0, fail_rate=0.0, seed=1):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self.access_tokens = set()
+        self.messages = 0
+        self.requests = 0
+        self.token_requests = 0
+
+
+class FakeFcmProtocol(asyncio.Protocol):
+    """Answers /token and /v1/projects/*/messages:send like Google does, for any assertion"""
+
+    def __init__(self, fake):
+        self.fake = fake
+        self.buffer = b""
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        buffer = self.buffer + data
+        while True:
+            end = buffer.find(b"\r\n\r\n")
+            if end == -1:
+                break
+            lines = buffer[:end].split(b"\r\n")
+            headers = {}
+            for line in lines[1:]:
+                key, _, value = line.partition(b":")
+                headers[key.strip().lower()] = value.strip()
+            length = int(headers.get(b"content-length", 0))
+            if len(buffer) < end + 4 + length:
+                break
+            path = lines[0].split(b" ", 2)[1]
+            body = buffer[end + 4:end + 4 + length]
+            buffer = buffer[end + 4 + length:]
+            response = self.handle(path, headers, body)
+            if self.fake.latency:
+                asyncio.get_running_loop().call_later(self.fake.latency, self._write, response)
+            else:
+                self.transport.write(response)
+        self.buffer = buffer
+
+    def _write(self, response):
+        if not self.transport.is_closing():
+            self.transport.write(response)
+
+    def handle(self, path, headers, body):
+        fake = self.fake
+        fake.requests += 1
+        if path == b"/token":
+            fake.token_requests += 1
+            token = "ya29.fake-" + os.urandom(8).hex()
+            fake.access_tokens.add(token)
+            return http_response(_encode({"access_token": token, "expires_in": 3599, "token_type": "Bearer"}))
+        if path.endswith(b"/messages:send"):
+            if headers.get(b"authorization", b"")[7:].decode() not in fake.access_tokens:
+                return http_response(_encode({"error": {"code": 401, "status": "UNAUTHENTICATED"}}), "401 Unauthorized")
+            if fake.fail_rate and fake.rng.random() < fake.fail_rate:
+                return http_response(_encode({"error": {"code": 503, "status": "UNAVAILABLE"}}),
+                                     "503 Service Unavailable")
+            message = json.loads(body)["message"]
+            if message["token"].startswith("stale-"):
+                return http_response(_encode({"error": {"code": 404, "status": "NOT_FOUND", "details": [
+                    {"errorCode": "UNREGISTERED"}]}}), "404 Not Found")
+            fake.messages += 1
+            return http_response(_encode({"name": f"projects/fake/messages/{fake.messages}"}))
+        return http_response(_encode({"error": {"code": 404, "status": "NOT_FOUND"}}), "404 Not Found")
+
+
+async def serve_fake_fcm(fake, host="127.0.0.1", port=0):
+    loop = asyncio.get_running_loop()
+    return await loop.create_server(lambda: FakeFcmProtocol(fake), sock=_listen(host, port))
+
+
+def fake_service_account(directory):
+    """A throwaway service-account JSON with a fresh RSA key, for use against the fake FCM"""
+    key = subprocess.run(["openssl", "genpkey", "-algorithm", "RSA", "-pkeyopt", "rsa_keygen_bits:2048"],
+                         capture_output=True, check=True, text=True).stdout
+    account = {"type": "service_account", "client_email": "dispatcher@fake.iam.gserviceaccount.com",
+               "private_key": key, "project_id": "fake"}
+    path = os.path.join(directory, "service-account.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(account, f)
+    return path
+
+
+def write_benchmark_queue(path, jobs, tokens_per_job, stale_rate, rng):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(jobs):
+            tokens = {p: [] for p in PLATFORMS}
+            for n in range(tokens_per_job):
+                prefix = "stale-" if rng.random() < stale_rate else "tok-"
+                tokens[rng.choice(PLATFORMS)].append(f"{prefix}{rng.randrange(10 ** 9)}")
+            f.write(json.dumps({"tokens": tokens, "data": {"title": "Order status updated",
+                                                          "body": f"Order #{i} is out for delivery",
+                                                          "type": "order", "type_id": str(i)}}) + "\n")
+
+
+async def benchmark(jobs, tokens_per_job, concurrency, latency, fail_rate, stale_rate, seed=1):
+    rng = random.Random(seed)
+    fake = FakeFcm(latency, fail_rate, seed)
+    server = await serve_fake_fcm(fake)
+    base = "http://127.0.0.1:%d" % server.sockets[0].getsockname()[1]
+    with tempfile.TemporaryDirectory() as directory:
+        with open(fake_service_account(directory), encoding="utf-8") as f:
+            account = json.load(f)
+        queue_path = os.path.join(directory, "queue.jsonl")
+        write_benchmark_queue(queue_path, jobs, tokens_per_job, stale_rate, rng)
+        access_tokens = AccessTokenCache(account, base + "/token")
+        dispatcher = Dispatcher("fake", access_tokens, base, concurrency)
+        started = time.perf_counter()
+        await run_worker(queue_path, dispatcher, os.path.join(directory, "queue.offset"))
+        elapsed = time.perf_counter() - started
+    await dispatcher.close()
+    await access_tokens.close()
+    server.close()
+    await server.wait_closed()
+    return dispatcher, access_tokens, fake, elapsed
+
+
+def print_summary(dispatcher, access_tokens, elapsed):
+    h = dispatcher.latency
+    print(f"📨 Sent {dispatcher.sent} messages in {elapsed:.2f}s ({dispatcher.sent / max(elapsed, 1e-9):.0f} msg/s)")
+    if h.count:
+        print(f"⏱️  Send latency p50 {h.percentile(50) / 1000:.2f} ms · p99 {h.percentile(99) / 1000:.2f} ms")
+    print(f"🔁 Retries: {dispatcher.retries} · failed: {dispatcher.failed} · "
+          f"duplicates skipped: {dispatcher.deduplicated} · unregistered tokens: {len(dispatcher.unregistered)}"
+          f" · malformed queue lines: {dispatcher.malformed}")
+    print(f"🔑 Access token fetches: {access_tokens.fetches}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dispatch queued FCM notifications asynchronously")
+    parser.add_argument("--queue", help="JSON-lines notification queue to consume")
+    parser.add_argument("--offset-file", help="checkpoint of the consumed queue position (default: QUEUE.offset)")
+    parser.add_argument("--follow", action="store_true", help="keep waiting for new queue lines")
+    parser.add_argument("--service-account", help="Firebase service-account JSON (uploads/<service_account_file>)")
+    parser.add_argument("--project", help="firebase_project_id; defaults to the service account's project_id")
+    parser.add_argument("--fcm-base", default=FCM_BASE)
+    parser.add_argument("--token-url", default=TOKEN_URL)
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+    parser.add_argument("--invalid-tokens", help="write tokens FCM reported as unregistered to this file")
+    parser.add_argument("--fake-fcm", type=int, metavar="PORT", help="only serve the fake FCM on this port")
+    parser.add_argument("--benchmark", action="store_true", help="measure sustained msg/s against the fake FCM")
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--tokens-per-job", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="fake FCM response latency")
+    parser.add_argument("--fail-rate", type=float, default=0.01, help="share of fake FCM sends answered 503")
+    parser.add_argument("--stale-rate", type=float, default=0.005, help="share of generated tokens FCM rejects")
+    args = parser.parse_args()
+
+    if args.fake_fcm is not None:
+        async def serve_forever():
+            server = await serve_fake_fcm(FakeFcm(args.latency_ms / 1000, args.fail_rate), port=args.fake_fcm)
+            print(f"✅ Fake FCM on http://127.0.0.1:{args.fake_fcm} (token URL /token)")
+            await server.serve_forever()
+
+        try:
+            asyncio.run(serve_forever())
+        except KeyboardInterrupt:
+            pass
+    elif args.benchmark:
+        dispatcher, access_tokens, fake, elapsed = asyncio.run(benchmark(
+            args.jobs, args.tokens_per_job, args.concurrency, args.latency_ms / 1000, args.fail_rate, args.stale_rate))
+        print_summary(dispatcher, access_tokens, elapsed)
+        print(f"🧪 Fake FCM accepted {fake.messages} messages over {fake.requests} requests")
+    else:
+        if not args.queue or not args.service_account:
+            parser.error("--queue and --service-account are required unless --benchmark or --fake-fcm is given")
+        with open(args.service_account, encoding="utf-8") as f:
+            account = json.load(f)
+
+        async def main():
+            access_tokens = AccessTokenCache(account, args.token_url)
+            dispatcher = Dispatcher(args.project or account["project_id"], access_tokens, args.fcm_base,
+                                    args.concurrency, args.max_attempts)
+            started = time.perf_counter()
+            try:
+                await run_worker(args.queue, dispatcher, args.offset_file or args.queue + ".offset", args.follow)
+            finally:
+                await dispatcher.close()
+                await access_tokens.close()
+            return dispatcher, access_tokens, time.perf_counter() - started
+
+        try:
+            dispatcher, access_tokens, elapsed = asyncio.run(main())
+        except KeyboardInterrupt:
+            raise SystemExit(130)
+        print_summary(dispatcher, access_tokens, elapsed)
+        if args.invalid_tokens and dispatcher.unregistered:
+            with open(args.invalid_tokens, "w", encoding="utf-8") as f:
+                f.write("\n".join(sorted(dispatcher.unregistered)) + "\n")
+            print(f"📁 Unregistered tokens: {args.invalid_tokens}")
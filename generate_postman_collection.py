@@ -3,10 +3,30 @@
 Script to generate Postman Collection from API documentation
 """
 
+import argparse
+import hashlib
 import json
+import os
+import re
 import uuid
 from datetime import datetime
 
+CONTROLLERS = [
+    ("{{user_api_base}}", "application/controllers/app/v1/Api.php"),
+    ("{{rider_api_base}}", "application/controllers/rider/app/v1/Api.php"),
+]
+PARSE_CACHE_FILE = ".postman_parse_cache.json"
+PARSE_CACHE_VERSION = 2
+
+METHOD_RE = re.compile(r"^[ \t]*(public|protected|private)\s+function\s+(\w+)\s*\(", re.M)
+# the label is any argument up to the next top-level comma, e.g. $this->lang->line('...')
+RULE_RE = re.compile(
+    r"set_rules\(\s*(['\"])(?P<field>[^'\"]+)\1\s*,"
+    r"\s*(?P<label>(?:'[^']*'|\"[^\"]*\"|\((?:'[^']*'|\"[^\"]*\"|[^()'\"])*\)|[^,;()'\"])+?)\s*,"
+    r"\s*(['\"])(?P<rules>.*?)\4"
+)
+QUOTED_RE = re.compile(r"^(['\"])(.*)\1$", re.S)
+
 def create_postman_collection():
     """Create a comprehensive Postman collection for DailyDose APIs"""
     
@@ -891,21 +911,171 @@ def create_request(name, url, body_params, description=None):
         request["request"]["url"]["host"] = ["{{", "rider_api_base", "}}"]
         request["request"]["url"]["path"] = url_parts
     
-    # Add body parameters
+    # Add body parameters; list values are file uploads and switch the body to multipart form-data
+    params = []
     for key, value in body_params.items():
-        param = {
-            "key": key,
-            "value": str(value),
-            "type": "text"
-        }
-        request["request"]["body"]["urlencoded"].append(param)
+        if isinstance(value, list):
+            params.append({"key": key, "type": "file", "src": value})
+        else:
+            params.append({"key": key, "value": str(value), "type": "text"})
+    if any(p["type"] == "file" for p in params):
+        # Postman supplies the multipart Content-Type with its boundary
+        request["request"]["header"] = []
+        request["request"]["body"] = {"mode": "formdata", "formdata": params}
+    else:
+        request["request"]["body"]["urlencoded"] = params
     
     return request
 
+def request_params(request):
+    """Body parameters of a Postman request, urlencoded or form-data"""
+    body = request["body"]
+    return body.get(body["mode"], [])
+
+def param_value(param):
+    """Sample value of a body parameter; file parameters yield their (usually empty) src list"""
+    return param["src"] if param["type"] == "file" else param["value"]
+
+def split_controller_methods(source):
+    """Split a PHP controller into (visibility, name, body) tuples"""
+    matches = list(METHOD_RE.finditer(source))
+    methods = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(source)
+        methods.append((match.group(1), match.group(2), source[match.start():end]))
+    return methods
+
+def extract_rules(body):
+    """Extract form_validation set_rules() calls from a method body"""
+    rules = []
+    seen = set()
+    for match in RULE_RE.finditer(body):
+        field = match.group("field")
+        if field in seen:
+            continue
+        seen.add(field)
+        rule_list = [r for r in match.group("rules").split("|") if r]
+        rules.append({
+            "field": field,
+            "label": QUOTED_RE.sub(r"\2", match.group("label").strip()),
+            "rules": rule_list,
+            "required": "required" in rule_list
+        })
+    return rules
+
+def load_parse_cache(path):
+    """Load the per-method parse cache, discarding it on version mismatch"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    if cache.get("version") != PARSE_CACHE_VERSION:
+        cache = {"version": PARSE_CACHE_VERSION, "files": {}, "bodies": {}}
+    return cache
+
+def save_parse_cache(path, cache):
+    """Persist the parse cache, dropping method bodies no longer referenced"""
+    live = set()
+    for entry in cache["files"].values():
+        live.update(m["sha1"] for m in entry["methods"])
+    cache["bodies"] = {k: v for k, v in cache["bodies"].items() if k in live}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, separators=(",", ":"))
+
+def parse_controller(path, cache, stats=None):
+    """Return [{name, rules}] for every public endpoint in a controller.
+
+    An unchanged file is served straight from the cache; otherwise only the
+    methods whose body hash changed are re-scanned for set_rules() calls.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    file_sha = hashlib.sha1(raw).hexdigest()
+    entry = cache["files"].get(path)
+    bodies = cache["bodies"]
+    if stats is None:
+        stats = {"parsed": 0, "cached": 0}
+
+    if entry is None or entry["sha1"] != file_sha:
+        methods = []
+        for visibility, name, body in split_controller_methods(raw.decode("utf-8", "replace")):
+            if visibility != "public" or name.startswith("_") or name == "index":
+                continue
+            body_sha = hashlib.sha1(body.encode("utf-8")).hexdigest()
+            if body_sha in bodies:
+                stats["cached"] += 1
+            else:
+                bodies[body_sha] = extract_rules(body)
+                stats["parsed"] += 1
+            methods.append({"name": name, "sha1": body_sha})
+        entry = {"sha1": file_sha, "methods": methods}
+        cache["files"][path] = entry
+    else:
+        stats["cached"] += len(entry["methods"])
+
+    return [{"name": m["name"], "rules": bodies[m["sha1"]]} for m in entry["methods"]]
+
+def sample_value(rule):
+    """Pick a placeholder value for a parameter without a documented sample"""
+    if "valid_email" in rule["rules"]:
+        return "user@example.com"
+    if any(r in ("numeric", "integer") or r.startswith(("greater_than", "less_than")) for r in rule["rules"]):
+        return "1"
+    return ""
+
+def create_collection_from_controllers(root=os.path.dirname(os.path.abspath(__file__)), cache_path=PARSE_CACHE_FILE, stats=None):
+    """Create the Postman collection from the Api.php form_validation rules.
+
+    Folder placement and sample values are reused from the hand-written
+    collection where an endpoint is already documented there.
+    """
+    documented = create_postman_collection()
+    known = {}
+    for folder in documented["item"]:
+        for item in folder["item"]:
+            base = item["request"]["url"]["raw"].split("/", 1)[0]
+            values = {p["key"]: param_value(p) for p in request_params(item["request"])}
+            known[(base, item["name"])] = (folder["name"], values, item["request"].get("description"))
+
+    cache = load_parse_cache(os.path.join(root, cache_path))
+    folders = {}
+    for base, rel_path in CONTROLLERS:
+        default_folder = "Rider APIs" if base == "{{rider_api_base}}" else "Other APIs"
+        for method in parse_controller(os.path.join(root, rel_path), cache, stats):
+            folder_name, values, description = known.get((base, method["name"]), (default_folder, {}, None))
+            body = {}
+            for rule in method["rules"]:
+                body[rule["field"]] = values.get(rule["field"], sample_value(rule))
+            # uploads are read from $_FILES, never set_rules(); keep the documented file parts
+            body.update((key, value) for key, value in values.items() if isinstance(value, list))
+            request = create_request(method["name"], f"{base}/{method['name']}", body, description=description)
+            for param, rule in zip(request_params(request["request"]), method["rules"]):
+                if rule["required"]:
+                    param["description"] = "required"
+            folders.setdefault(folder_name, []).append(request)
+    save_parse_cache(os.path.join(root, cache_path), cache)
+
+    order = [folder["name"] for folder in documented["item"]]
+    names = sorted(folders, key=lambda n: order.index(n) if n in order else len(order))
+    documented["item"] = [{"name": name, "item": folders[name]} for name in names]
+    return documented
+
 if __name__ == "__main__":
-    collection = create_postman_collection()
+    parser = argparse.ArgumentParser(description="Generate the DailyDose Postman collection")
+    parser.add_argument("--from-controllers", action="store_true",
+                        help="derive endpoints and parameters from the Api.php set_rules() calls")
+    parser.add_argument("--cache", default=PARSE_CACHE_FILE, help="controller parse cache file")
+    parser.add_argument("--output", default="DailyDose_API_Collection.postman_collection.json")
+    args = parser.parse_args()
+
+    stats = {"parsed": 0, "cached": 0}
+    if args.from_controllers:
+        collection = create_collection_from_controllers(cache_path=args.cache, stats=stats)
+    else:
+        collection = create_postman_collection()
     
-    output_file = "DailyDose_API_Collection.postman_collection.json"
+    output_file = args.output
     with open(output_file, "w", encoding="utf-8") as f:
         json.dump(collection, f, indent=2, ensure_ascii=False)
     
@@ -915,4 +1085,5 @@ if __name__ == "__main__":
     
     total_requests = sum(len(folder.get("item", [])) for folder in collection["item"])
     print(f"📝 Total requests: {total_requests}")
-
+    if args.from_controllers:
+        print(f"🗂️  Methods parsed: {stats['parsed']}, served from cache: {stats['cached']}")
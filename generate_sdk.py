@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Generate an asyncio Python client for the DailyDose API from the Postman collection definitions
+"""
+
+import argparse
+import importlib
+import json
+import keyword
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from generate_postman_collection import create_collection_from_controllers, create_postman_collection
+from load_test import collection_requests
+from sql_schema import SCHEMA_FILE, parse_schema
+
+SDK_FILE = "dailydose_sdk.py"
+# endpoints whose `data` rows are not named after their table (None: not rows of any one table)
+ENDPOINT_TABLES = {
+    "transactions": "transactions",
+    "get_settings": None,
+    "get_address": "addresses",
+    "get_user_cart": "cart",
+    "get_ticket_types": "ticket_types",
+    "get_messages": "ticket_messages",
+    "get_pending_orders": "orders",
+    "get_rider_cash_collection": "transactions",
+    "get_fund_transfers": "fund_transfers",
+    "get_favorites": "products",
+    "get_offline_products": "products",
+    "get_product_rating": "product_rating",
+    "get_order_rating": "order_rating",
+    "get_slider_images": "sliders",
+    "get_offer_images": "offers",
+    "get_promo_codes": "promo_codes",
+}
+# read-only endpoints without the get_ prefix; these are coalesced too
+READ_ENDPOINTS = {"transactions"}
+
+RUNTIME = '''
+import asyncio
+import json
+import mimetypes
+import os
+import sys
+
+from load_test import ConnectionPool, encode_body, encode_multipart
+
+
+class ApiError(Exception):
+    """An {"error": true} envelope or a non-2xx response"""
+
+    def __init__(self, message, status=200, envelope=None):
+        super().__init__(message)
+        self.status = status
+        self.envelope = envelope
+
+
+class Model:
+    """Compact row: declared fields live in __slots__, anything else in one `_extra` dict"""
+
+    __slots__ = ("_extra",)
+    _fields = ()
+
+    def __init__(self, values):
+        extra = None
+        for key, value in values.items():
+            if key in self._field_set:
+                object.__setattr__(self, key, decode(value))
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = decode(value)
+        self._extra = extra
+
+    def __getattr__(self, name):
+        if name in self._field_set:
+            return None
+        extra = object.__getattribute__(self, "_extra")
+        if extra and name in extra:
+            return extra[name]
+        raise AttributeError(name)
+
+    def to_dict(self):
+        values = {}
+        for name in self._fields:
+            try:
+                values[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        values.update(self._extra or {})
+        return values
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def model(name, fields):
+    """Create a Model subclass with one slot per field"""
+    fields = tuple(f for f in fields if f.isidentifier() and f != "_extra")
+    return type(name, (Model,), {"__slots__": fields, "_fields": fields, "_field_set": frozenset(fields)})
+
+
+Model._field_set = frozenset()
+_SHAPES = {}
+
+
+def decode(value, row_model=None):
+    """Turn decoded JSON into Models: dict rows become slotted objects, lists are decoded item by item"""
+    if isinstance(value, str):
+        # statuses, types, currency codes and small ids repeat across rows; share one copy
+        return sys.intern(value) if len(value) <= 16 else value
+    if isinstance(value, list):
+        return [decode(item, row_model) for item in value]
+    if isinstance(value, dict):
+        if row_model is None:
+            shape = tuple(value)
+            row_model = _SHAPES.get(shape)
+            if row_model is None:
+                row_model = _SHAPES[shape] = model("Row", shape)
+        return row_model(value)
+    return value
+
+
+class ApiResponse:
+    """A decoded envelope: `data` as Models, every other top-level key (total, token, ...) in `meta`"""
+
+    __slots__ = ("message", "data", "meta")
+
+    def __init__(self, envelope, row_model=None):
+        self.message = envelope.pop("message", "")
+        envelope.pop("error", None)
+        self.data = decode(envelope.pop("data", None), row_model)
+        self.meta = envelope
+
+    def __getattr__(self, name):
+        meta = object.__getattribute__(self, "meta")
+        if name in meta:
+            return meta[name]
+        raise AttributeError(name)
+
+
+def file_parts(files):
+    """Multipart file tuples for {field: value}.
+
+    A value is a path, raw bytes, or a (filename, data) pair; fields ending in
+    [] also take a list of these. Paths are read once, here.
+    """
+    parts = []
+    for field, value in files.items():
+        values = value if isinstance(value, list) and field.endswith("[]") else [value]
+        for item in values:
+            if item is None:
+                continue
+            if isinstance(item, (str, os.PathLike)):
+                with open(item, "rb") as f:
+                    item = (os.path.basename(item), f.read())
+            elif not isinstance(item, tuple):
+                item = ("upload", item)
+            filename, data = item
+            parts.append((field, filename, mimetypes.guess_type(filename)[0] or "application/octet-stream", data))
+    return parts
+
+
+class _Transport:
+    """Pooled keep-alive connections, a Bearer token, and coalescing of identical in-flight reads"""
+
+    def __init__(self, base_url, token=None, pool_size=20, timeout=30.0):
+        self.pool = ConnectionPool(base_url, size=pool_size, timeout=timeout)
+        self.token = token
+        self.in_flight = {}
+        self.coalesced = 0
+
+    async def call(self, path, params, row_model=None, coalesce=False, files=None):
+        params = {k: v for k, v in params.items() if v is not None}
+        parts = file_parts(files or {})
+        if parts:
+            content_type, body = encode_multipart(params, parts)
+            return await self._send(path, body, row_model, content_type)
+        body = encode_body(params)
+        if not coalesce:
+            return await self._send(path, body, row_model)
+        key = (path, body, self.token)
+        pending = self.in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+        task = self.in_flight[key] = asyncio.ensure_future(self._send(path, body, row_model))
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self.in_flight.get(key) is task:
+                del self.in_flight[key]
+
+    async def _send(self, path, body, row_model, content_type="application/x-www-form-urlencoded"):
+        headers = {"Content-Type": content_type}
+        if self.token:
+            headers["Authorization"] = "Bearer " + self.token
+        response = await self.pool.request("POST", path, body, headers)
+        try:
+            envelope = json.loads(response.body)
+        except ValueError:
+            raise ApiError(f"HTTP {response.status}: response is not JSON", response.status) from None
+        if response.status >= 400 or not isinstance(envelope, dict) or envelope.get("error"):
+            message = envelope.get("message", "") if isinstance(envelope, dict) else ""
+            raise ApiError(message or f"HTTP {response.status}", response.status, envelope)
+        return ApiResponse(envelope, row_model)
+
+    async def close(self):
+        await self.pool.close()
+'''
+
+CLIENT_TEMPLATE = '''
+
+class Client:
+    """Customer API (/app/v1/api); rider endpoints are under `client.rider`.
+
+    Responses that share a path, body and token while one is in flight are
+    coalesced for get_* endpoints, so every caller gets the same ApiResponse;
+    treat responses as read-only.
+    """
+
+    def __init__(self, base_url, token=None, pool_size=20, timeout=30.0):
+        self._transport = _Transport(base_url, token, pool_size, timeout)
+        self.rider = RiderApi(self._transport)
+
+    @property
+    def token(self):
+        return self._transport.token
+
+    @token.setter
+    def token(self, value):
+        self._transport.token = value
+
+    async def close(self):
+        await self._transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+'''
+
+RIDER_TEMPLATE = '''
+
+class RiderApi:
+    """Rider API (/rider/app/v1/api), sharing the customer client's connections and token"""
+
+    def __init__(self, transport):
+        self._transport = transport
+'''
+
+
+def python_name(param):
+    """Keyword-argument name for a body param ('images[]' -> 'images', 'from' -> 'from_')"""
+    name = param.replace("[]", "").replace("-", "_")
+    return name + "_" if keyword.iskeyword(name) or name in ("self", "extra") else name
+
+
+def class_name(table):
+    """'transactions' -> 'Transaction', 'addresses' -> 'Address', 'cities' -> 'City'"""
+    if table.endswith("ies"):
+        table = table[:-3] + "y"
+    elif table.endswith(("sses", "shes", "ches", "xes")):
+        table = table[:-2]
+    elif table.endswith("s") and not table.endswith("ss"):
+        table = table[:-1]
+    return "".join(part.capitalize() for part in table.split("_"))
+
+
+def endpoint_table(name, tables):
+    if name in ENDPOINT_TABLES:
+        return ENDPOINT_TABLES[name] if ENDPOINT_TABLES[name] in tables else None  # None is never a table
+    if not name.startswith("get_"):
+        return None
+    base = name[4:]
+    for candidate in (base, base + "s", base + "es", base[:-1] + "ies" if base.endswith("y") else None):
+        if candidate in tables:
+            return candidate
+    return None
+
+
+def method_source(spec, row_model, description):
+    params = list(spec["body"])
+    files = spec.get("files", [])
+    names = [python_name(p) for p in params + files]
+    signature = "".join(f", {n}=None" for n in names)
+    lines = [f"    async def {spec['name']}(self, *{signature}, **extra):" if names
+             else f"    async def {spec['name']}(self, **extra):"]
+    doc = (description or spec["name"].replace("_", " ").capitalize()).strip().splitlines()[0]
+    lines.append(f'        """{doc}"""')
+    if names:
+        pairs = ", ".join(f"{json.dumps(p)}: {n}" for p, n in zip(params, names))
+        lines.append(f"        params = {{{pairs}}}")
+        lines.append("        params.update(extra)")
+    else:
+        lines.append("        params = extra")
+    coalesce = spec["name"].startswith("get_") or spec["name"] in READ_ENDPOINTS
+    call = f"self._transport.call({json.dumps(spec['path'])}, params, {row_model or 'None'}"
+    if files:
+        pairs = ", ".join(f"{json.dumps(p)}: {n}" for p, n in zip(files, names[len(params):]))
+        call += f", files={{{pairs}}}"
+    lines.append(f"        return await {call}{', coalesce=True' if coalesce else ''})")
+    return "\n".join(lines)
+
+
+def generate_sdk(collection, schema):
+    """Return the source of the generated client module"""
+    specs = collection_requests(collection)
+    descriptions = {}
+    for folder in collection["item"]:
+        for item in folder["item"]:
+            base = item["request"]["url"]["raw"].partition("/")[0]
+            key = ("rider/" if base == "{{rider_api_base}}" else "") + item["name"]
+            descriptions[key] = item["request"].get("description")
+
+    models = {}
+    endpoint_models = {}
+    for spec in specs:
+        table = endpoint_table(spec["name"], schema)
+        if table:
+            models[table] = class_name(table)
+            endpoint_models[spec["key"]] = models[table]
+
+    parts = ['"""\nAsync DailyDose API client generated by generate_sdk.py from the Postman collection; do not edit\n"""',
+             RUNTIME.rstrip()]
+    for table, name in sorted(models.items(), key=lambda kv: kv[1]):
+        fields = ", ".join(json.dumps(c) for c in schema[table].column_names)
+        parts.append(f"\n\n{name} = model({json.dumps(name)}, ({fields},))")
+    parts.append(CLIENT_TEMPLATE.rstrip())
+    for spec in specs:
+        if not spec["key"].startswith("rider/"):
+            parts.append("\n" + method_source(spec, endpoint_models.get(spec["key"]), descriptions.get(spec["key"])))
+    parts.append(RIDER_TEMPLATE.rstrip())
+    for spec in specs:
+        if spec["key"].startswith("rider/"):
+            parts.append("\n" + method_source(spec, endpoint_models.get(spec["key"]), descriptions.get(spec["key"])))
+    return "\n".join(parts) + "\n"
+
+
+def measure_rows(sdk, rows, seed=1):
+    """Traced memory retained by `rows` decoded transactions held as dicts vs as Transaction models"""
+    rng = random.Random(seed)
+    payload = json.dumps({"error": False, "message": "Transactions retrieved successfully", "total": str(rows), "data": [
+        {"id": str(i), "transaction_type": "transaction", "user_id": str(rng.randint(2, 50000)),
+         "order_id": str(rng.randint(1, 10 ** 6)), "type": rng.choice(["razorpay", "stripe", "wallet"]),
+         "txn_id": f"pay_{rng.getrandbits(48):012x}", "payu_txn_id": None, "amount": f"{rng.uniform(50, 2000):.2f}",
+         "status": "success", "currency_code": "INR", "payer_email": None, "message": "Order placed",
+         "transaction_date": "2024-05-01 12:00:00", "date_created": "2024-05-01 12:00:00"} for i in range(rows)]})
+    results = {}
+    for label, decode in (("dicts", lambda env: env["data"]),
+                          ("models", lambda env: sdk.ApiResponse(env, sdk.Transaction).data)):
+        tracemalloc.start()
+        data = decode(json.loads(payload))
+        results[label] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del data
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the async DailyDose Python SDK")
+    parser.add_argument("--output", default=SDK_FILE)
+    parser.add_argument("--from-controllers", action="store_true",
+                        help="generate from the Api.php set_rules() calls instead of the documented collection")
+    parser.add_argument("--measure", type=int, metavar="ROWS",
+                        help="compare memory of ROWS decoded transactions as dicts vs models")
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    collection = create_collection_from_controllers() if args.from_controllers else create_postman_collection()
+    started = time.perf_counter()
+    source = generate_sdk(collection, parse_schema(os.path.join(root, SCHEMA_FILE)))
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(source)
+
+    print(f"✅ SDK generated in {(time.perf_counter() - started) * 1000:.0f} ms")
+    print(f"📁 File: {args.output}")
+    print(f"📊 Endpoints: {len(collection_requests(collection))}")
+    print(f"🧱 Models: {source.count(' = model(')}")
+
+    if args.measure:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(args.output)))
+        sdk = importlib.import_module(os.path.splitext(os.path.basename(args.output))[0])
+        memory = measure_rows(sdk, args.measure)
+        print(f"🧠 {args.measure} transactions: dicts {memory['dicts'] / 2 ** 20:.1f} MB · "
+              f"models {memory['models'] / 2 ** 20:.1f} MB ({memory['dicts'] / memory['models']:.1f}x smaller)")
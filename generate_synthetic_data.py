@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Stream consistent synthetic eRestro data to bulk-load files at millions-of-rows scale
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+
+from sql_schema import SCHEMA_FILE, parse_schema
+from token_pool import mint_token, read_secret_key
+
+CHUNK_ROWS = 50000
+TOKEN_DIR = "tokens"
+BASE_LAT, BASE_LONG = 23.2420, 69.6669
+EPOCH = 1704067200  # 2024-01-01 00:00:00 UTC
+# Ion_auth bcrypt hash shipped for the administrator account in the dump
+PASSWORD_HASH = "$2y$12$IhSs7zXQ3CvIXtLQUVp4Y.Cftky/iDxU2DrJCfteb0UMXMhcJSVG."
+ORDER_STATUSES = [("delivered", 70), ("cancelled", 8), ("pending", 6), ("confirmed", 5),
+                  ("preparing", 5), ("out_for_delivery", 4), ("ready_for_pickup", 2)]
+PAYMENT_METHODS = [("COD", 50), ("Razorpay", 20), ("Stripe", 10), ("Paystack", 5), ("wallet", 10), ("PayPal", 5)]
+TABLES = ["cities", "branch", "categories", "products", "product_variants", "users", "users_groups",
+          "addresses", "cart", "orders", "order_items", "transactions"]
+
+
+def parse_count(value):
+    """Parse counts such as 500k, 20M or 1500"""
+    value = value.strip().lower()
+    scale = {"k": 1000, "m": 1000000, "g": 1000000000}.get(value[-1:], 1)
+    return int(float(value[:-1] if scale > 1 else value) * scale)
+
+
+def variant_price(variant_id):
+    """Deterministic variant price so order items can be priced without a lookup"""
+    return 50 + (variant_id * 2654435761 % 45000) // 100
+
+
+def stamp(seconds):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(seconds))
+
+
+def _weighted(rng, choices):
+    return rng.choices([c for c, _ in choices], [w for _, w in choices])[0]
+
+
+class Plan:
+    """Row counts and the id arithmetic that keeps foreign keys consistent"""
+
+    def __init__(self, args):
+        self.cities = args.cities
+        self.branches = args.branches
+        self.categories = args.categories_per_branch * args.branches
+        self.products = args.products
+        self.variants = args.variants_per_product
+        self.users = args.users
+        self.riders = max(1, args.users // 50)
+        self.addresses = args.addresses_per_user
+        self.carts = args.carts
+        self.orders = args.orders
+        self.items = args.items_per_order
+        self.days = args.days
+        self.seed = args.seed
+        self.secret = read_secret_key() if args.tokens else None
+        self.now = int(time.time())
+
+    # users 2..users+1 are generated (1 is the dump's admin); the last `riders` of them are riders
+    def customer(self, rng):
+        return rng.randint(2, self.users + 1 - self.riders)
+
+    def rider(self, rng):
+        return rng.randint(self.users + 2 - self.riders, self.users + 1)
+
+    def product_branch(self, product_id):
+        return (product_id - 1) % self.categories % self.branches + 1
+
+    def product_in_branch(self, rng, branch_id):
+        per_branch = (self.products - branch_id) // self.branches + 1
+        return branch_id + self.branches * rng.randrange(per_branch)
+
+    def variant(self, rng, product_id):
+        return (product_id - 1) * self.variants + rng.randrange(self.variants) + 1
+
+
+def default_row(table):
+    """Column defaults for anything a generator does not set explicitly"""
+    row = []
+    now = stamp(time.time())
+    for column in table.columns:
+        if column.default is not None and column.default.startswith("current_timestamp"):
+            row.append(now)
+        elif column.default is not None:
+            row.append(column.default)
+        elif column.nullable:
+            row.append(None)
+        elif column.type in ("int", "tinyint", "smallint", "mediumint", "bigint", "double", "float", "decimal"):
+            row.append(0)
+        elif column.type in ("timestamp", "datetime"):
+            row.append(now)
+        elif column.type == "time":
+            row.append("00:00:00")
+        elif column.type == "date":
+            row.append("2024-01-01")
+        else:
+            row.append("")
+    return row
+
+
+def gen_cities(plan, rng, start, end):
+    for i in range(start, end):
+        yield "cities", {"id": i, "name": f"City {i}", "latitude": f"{BASE_LAT + i * 0.5:.6f}",
+                         "longitude": f"{BASE_LONG + i * 0.5:.6f}", "max_deliverable_distance": 15,
+                         "delivery_charge_method": "fixed_charge", "fixed_charge": 20,
+                         "min_order_amount_for_free_delivery": 500, "geolocation_type": "circle",
+                         "radius": "15"}
+
+
+def gen_branch(plan, rng, start, end):
+    for i in range(start, end):
+        city = (i - 1) % plan.cities + 1
+        yield "branch", {"id": i, "branch_name": f"Branch {i}", "address": f"{i} Market Road",
+                         "city_id": city, "latitude": f"{BASE_LAT + city * 0.5 + rng.uniform(-.05, .05):.6f}",
+                         "longitude": f"{BASE_LONG + city * 0.5 + rng.uniform(-.05, .05):.6f}",
+                         "email": f"b{i}@example.com", "contact": 9800000000 + i, "status": 1,
+                         "self_pickup": 1, "deliver_orders": 1, "default_branch": int(i == 1)}
+
+
+def gen_categories(plan, rng, start, end):
+    for i in range(start, end):
+        yield "categories", {"id": i, "name": f"Category {i}", "branch_id": (i - 1) % plan.branches + 1,
+                             "slug": f"category-{i}", "image": f"uploads/media/2024/category-{i % 50}.png",
+                             "row_order": i, "status": 1, "parent_id": 0}
+
+
+def gen_products(plan, rng, start, end):
+    for i in range(start, end):
+        yield "products", {
+            "id": i, "category_id": (i - 1) % plan.categories + 1, "branch_id": plan.product_branch(i),
+            "tax": 1, "row_order": i, "type": "variable_product", "name": f"Product {i}",
+            "short_description": "Freshly prepared with seasonal ingredients", "slug": f"product-{i}",
+            "indicator": rng.randint(1, 2), "calories": rng.randint(80, 900), "available_time": 0,
+            "start_time": "00:00:00", "end_time": "23:59:59", "total_allowed_quantity": 10,
+            "is_cancelable": 1, "cancelable_till": "pending", "is_spicy": rng.randint(0, 1),
+            "image": f"uploads/media/2024/product-{i % 500}.jpg", "highlights": "fresh,popular",
+            "availability": 1, "rating": round(rng.uniform(3, 5), 2), "no_of_ratings": rng.randint(0, 400),
+            "status": 1}
+        for j in range(plan.variants):
+            vid = (i - 1) * plan.variants + j + 1
+            price = variant_price(vid)
+            yield "product_variants", {"id": vid, "product_id": i, "attribute_value_ids": str(j + 1),
+                                       "price": price, "special_price": price - price // 10,
+                                       "availability": 1, "status": 1}
+
+
+def gen_users(plan, rng, start, end):
+    for i in range(start, end):
+        rider = i > plan.users + 1 - plan.riders
+        city = rng.randint(1, plan.cities)
+        yield "users", {
+            "id": i, "ip_address": "127.0.0.1", "username": f"User {i}", "password": PASSWORD_HASH,
+            "email": f"user{i}@example.com", "mobile": str(9000000000 + i), "type": "phone",
+            "balance": rng.choice((0, 0, 0, 50, 100, 250)), "created_on": EPOCH + i % 31536000,
+            "active": 1, "country_code": 91, "city": str(city), "serviceable_city": str(city) if rider else None,
+            "commission_method": "fixed_commission_per_order" if rider else None,
+            "commission": 10 if rider else 0, "referral_code": f"REF{i:08d}",
+            "apikey": mint_token(i, plan.secret, plan.now) if plan.secret else None,
+            "latitude": f"{BASE_LAT + city * 0.5 + rng.uniform(-.1, .1):.6f}",
+            "longitude": f"{BASE_LONG + city * 0.5 + rng.uniform(-.1, .1):.6f}"}
+        yield "users_groups", {"id": i, "user_id": i, "group_id": 3 if rider else 2}
+        if rider:
+            continue
+        for j in range(plan.addresses):
+            yield "addresses", {
+                "id": (i - 2) * plan.addresses + j + 1, "user_id": i, "name": f"User {i}",
+                "type": ("Home", "Office", "Other")[j % 3], "mobile": str(9000000000 + i),
+                "address": f"{rng.randint(1, 999)} Main Street", "area": f"Area {rng.randint(1, 40)}",
+                "city_id": city, "pincode": str(370000 + rng.randint(1, 99)), "country_code": 91,
+                "state": "Gujarat", "country": "India", "is_default": int(j == 0),
+                "latitude": f"{BASE_LAT + city * 0.5 + rng.uniform(-.1, .1):.6f}",
+                "longitude": f"{BASE_LONG + city * 0.5 + rng.uniform(-.1, .1):.6f}"}
+
+
+def gen_cart(plan, rng, start, end):
+    for i in range(start, end):
+        branch = rng.randint(1, plan.branches)
+        yield "cart", {"id": i, "user_id": plan.customer(rng),
+                       "product_variant_id": plan.variant(rng, plan.product_in_branch(rng, branch)),
+                       "branch_id": branch, "qty": rng.randint(1, 4), "is_saved_for_later": int(rng.random() < .1),
+                       "addon_variant_combination": ""}
+
+
+def gen_orders(plan, rng, start, end):
+    span = plan.days * 86400
+    now = plan.now
+    for i in range(start, end):
+        user = plan.customer(rng)
+        branch = rng.randint(1, plan.branches)
+        city = (branch - 1) % plan.cities + 1
+        placed = now - span + span * i // max(plan.orders, 1) + rng.randint(0, 59)
+        status = _weighted(rng, ORDER_STATUSES)
+        method = _weighted(rng, PAYMENT_METHODS)
+        total = tax = 0.0
+        for j in range(rng.randint(1, plan.items)):
+            variant = plan.variant(rng, plan.product_in_branch(rng, branch))
+            qty = rng.randint(1, 3)
+            price = variant_price(variant)
+            item_tax = round(price * qty * 0.05, 2)
+            total += price * qty
+            tax += item_tax
+            yield "order_items", {"id": (i - 1) * plan.items + j + 1, "user_id": user, "order_id": i,
+                                  "branch_id": branch, "product_name": f"Product {variant}",
+                                  "variant_name": "Regular", "product_variant_id": variant, "quantity": qty,
+                                  "price": price, "discounted_price": price, "tax_percent": 5,
+                                  "tax_amount": item_tax, "sub_total": price * qty, "date_added": stamp(placed)}
+        delivery = 0 if total >= 500 else 20
+        final = round(total + tax + delivery, 2)
+        yield "orders", {
+            "id": i, "user_id": user, "rider_id": plan.rider(rng) if status in ("delivered", "out_for_delivery") else None,
+            "branch_id": branch, "address_id": (user - 2) * plan.addresses + 1, "city_id": city,
+            "mobile": str(9000000000 + user), "tax_percent": 5, "tax_amount": round(tax, 2), "total": total,
+            "delivery_charge": delivery, "total_payable": final, "final_total": final, "payment_method": method,
+            "latitude": f"{BASE_LAT + city * 0.5:.6f}", "longitude": f"{BASE_LONG + city * 0.5:.6f}",
+            "address": "Main Street", "active_status": status,
+            "status": json.dumps([["pending", time.strftime("%d-%m-%Y %I:%M:%S%p", time.gmtime(placed))],
+                                  [status, time.strftime("%d-%m-%Y %I:%M:%S%p", time.gmtime(placed + 1800))]]),
+            "date_added": stamp(placed), "otp": rng.randint(1000, 9999), "is_rider_otp_setting_on": 1}
+        yield "transactions", {"id": i, "transaction_type": "transaction", "user_id": user, "order_id": str(i),
+                               "type": method.lower(), "txn_id": f"txn_{i:010d}", "amount": final,
+                               "status": "success" if status != "cancelled" else "failed", "currency_code": "INR",
+                               "message": "Order placed", "transaction_date": stamp(placed),
+                               "date_created": stamp(placed)}
+
+
+# (generator, first id, attribute holding the row count)
+GENERATORS = [
+    (gen_cities, 1, "cities"), (gen_branch, 1, "branches"), (gen_categories, 1, "categories"),
+    (gen_products, 1, "products"), (gen_users, 2, "users"), (gen_cart, 1, "carts"), (gen_orders, 1, "orders"),
+]
+
+
+def format_csv(values):
+    """One LOAD DATA line: comma separated, double-quoted strings, \\N for NULL"""
+    out = []
+    for v in values:
+        if v is None:
+            out.append("\\N")
+        elif isinstance(v, (int, float)):
+            out.append(repr(v))
+        else:
+            out.append('"' + str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"')
+    return ",".join(out) + "\n"
+
+
+def format_sql(values):
+    out = []
+    for v in values:
+        if v is None:
+            out.append("NULL")
+        elif isinstance(v, (int, float)):
+            out.append(repr(v))
+        else:
+            out.append("'" + str(v).replace("\\", "\\\\").replace("'", "\\'").replace("\n", "\\n") + "'")
+    return "(" + ",".join(out) + ")"
+
+
+class ChunkWriter:
+    """Writes one table's rows for one chunk as CSV or batched multi-row INSERTs"""
+
+    def __init__(self, out_dir, table, chunk, fmt, batch):
+        self.table = table
+        self.fmt = fmt
+        self.batch = batch
+        self.pending = []
+        self.rows = 0
+        self.path = os.path.join(out_dir, table.name, f"{table.name}.{chunk:05d}.{fmt}")
+        self.file = open(self.path, "w", encoding="utf-8", buffering=1 << 20)
+        self.insert = "INSERT INTO `%s` (%s) VALUES\n" % (table.name, ",".join(f"`{c}`" for c in table.column_names))
+
+    def write(self, values):
+        self.rows += 1
+        if self.fmt == "csv":
+            self.file.write(format_csv(values))
+            return
+        self.pending.append(format_sql(values))
+        if len(self.pending) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.file.write(self.insert + ",\n".join(self.pending) + ";\n")
+            self.pending = []
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def run_chunk(task):
+    """Worker entry point: generate ids [start, end) of one generator into chunk files.
+
+    Minted user apikeys are also written to a tokens/ part file, one
+    `"id":"token"` member per line, for write_token_pool() to join.
+    """
+    name, start, end, chunk, plan, schema, out_dir, fmt, batch = task
+    generator = dict((g.__name__, g) for g, _, _ in GENERATORS)[name]
+    rng = random.Random(f"{plan.seed}:{name}:{start}")
+    defaults = {t: default_row(schema[t]) for t in TABLES}
+    positions = {t: {c: i for i, c in enumerate(schema[t].column_names)} for t in TABLES}
+    writers = {}
+    tokens = None
+    try:
+        for table, values in generator(plan, rng, start, end):
+            if table == "users" and values["apikey"]:
+                if tokens is None:
+                    tokens = open(os.path.join(out_dir, TOKEN_DIR, f"tokens.{chunk:05d}.part"), "w", encoding="utf-8")
+                tokens.write(f'"{values["id"]}":"{values["apikey"]}"\n')
+            writer = writers.get(table)
+            if writer is None:
+                writer = writers[table] = ChunkWriter(out_dir, schema[table], chunk, fmt, batch)
+            row = list(defaults[table])
+            index = positions[table]
+            for column, value in values.items():
+                row[index[column]] = value
+            writer.write(row)
+    finally:
+        for writer in writers.values():
+            writer.close()
+        if tokens is not None:
+            tokens.close()
+    return {table: (w.rows, w.path) for table, w in writers.items()}
+
+
+def plan_tasks(plan, schema, out_dir, fmt, batch, chunk_rows=CHUNK_ROWS):
+    for generator, first, attr in GENERATORS:
+        count = getattr(plan, attr)
+        for chunk, start in enumerate(range(first, first + count, chunk_rows)):
+            yield (generator.__name__, start, min(start + chunk_rows, first + count), chunk, plan, schema,
+                   out_dir, fmt, batch)
+
+
+def write_load_script(out_dir, files, schema, fmt):
+    """Write load.sql that bulk-loads every chunk with checks disabled"""
+    with open(os.path.join(out_dir, "load.sql"), "w", encoding="utf-8") as f:
+        f.write("SET foreign_key_checks = 0;\nSET unique_checks = 0;\nSET autocommit = 0;\n")
+        for table in TABLES:
+            for path in sorted(files.get(table, ())):
+                rel = os.path.relpath(path, out_dir)
+                if fmt == "csv":
+                    columns = ",".join(f"`{c}`" for c in schema[table].column_names)
+                    f.write(f"LOAD DATA LOCAL INFILE '{rel}' INTO TABLE `{table}` CHARACTER SET utf8mb4 "
+                            f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '\\\\' "
+                            f"LINES TERMINATED BY '\\n' ({columns});\n")
+                else:
+                    f.write(f"SOURCE {rel};\n")
+            f.write("COMMIT;\n")
+        f.write("SET unique_checks = 1;\nSET foreign_key_checks = 1;\n")
+
+
+def write_token_pool(out_dir, minted_at):
+    """Stream the workers' token parts into a token_pool.py cache file and remove them"""
+    directory = os.path.join(out_dir, TOKEN_DIR)
+    with open(os.path.join(out_dir, "token_pool.json"), "w", encoding="utf-8") as out:
+        out.write('{"minted_at":%d,"tokens":{' % minted_at)
+        separator = ""
+        for part in sorted(os.listdir(directory)):
+            path = os.path.join(directory, part)
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    out.write(separator + line.rstrip("\n"))
+                    separator = ","
+            os.remove(path)
+        out.write("}}")
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic eRestro data for bulk loading")
+    parser.add_argument("--schema", default=SCHEMA_FILE)
+    parser.add_argument("--out", default="synthetic_data")
+    parser.add_argument("--format", choices=("csv", "sql"), default="csv",
+                        help="CSV for LOAD DATA, or sql for batched multi-row INSERTs")
+    parser.add_argument("--batch", type=int, default=1000, help="rows per INSERT with --format sql")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cities", type=parse_count, default=20)
+    parser.add_argument("--branches", type=parse_count, default=50)
+    parser.add_argument("--categories-per-branch", type=parse_count, default=12)
+    parser.add_argument("--products", type=parse_count, default=parse_count("50k"))
+    parser.add_argument("--variants-per-product", type=int, default=3)
+    parser.add_argument("--users", type=parse_count, default=parse_count("100k"))
+    parser.add_argument("--addresses-per-user", type=int, default=2)
+    parser.add_argument("--carts", type=parse_count, default=parse_count("200k"))
+    parser.add_argument("--orders", type=parse_count, default=parse_count("1M"))
+    parser.add_argument("--items-per-order", type=int, default=4, help="maximum items per order")
+    parser.add_argument("--days", type=int, default=365, help="spread orders over this many past days")
+    parser.add_argument("--tokens", action="store_true",
+                        help="store a pre-minted JWT as each user's apikey and write token_pool.json")
+    args = parser.parse_args()
+    if args.branches > args.products:
+        parser.error("--branches must not exceed --products, every branch needs at least one product")
+
+    schema = parse_schema(args.schema)
+    plan = Plan(args)
+    for table in TABLES + ([TOKEN_DIR] if plan.secret else []):
+        os.makedirs(os.path.join(args.out, table), exist_ok=True)
+
+    started = time.time()
+    totals = {}
+    files = {}
+    tasks = list(plan_tasks(plan, schema, args.out, args.format, args.batch))
+    with multiprocessing.Pool(args.workers) as pool:
+        for done, result in enumerate(pool.imap_unordered(run_chunk, tasks), 1):
+            for table, (rows, path) in result.items():
+                totals[table] = totals.get(table, 0) + rows
+                files.setdefault(table, []).append(path)
+            if done % 20 == 0 or done == len(tasks):
+                print(f"⏳ {done}/{len(tasks)} chunks, {sum(totals.values()):,} rows")
+    write_load_script(args.out, files, schema, args.format)
+    if plan.secret:
+        # same tokens as the apikey column, so load_test.py --tokens can use them directly
+        write_token_pool(args.out, plan.now)
+
+    print(f"✅ Synthetic data generated in {time.time() - started:.1f}s")
+    print(f"📁 Directory: {args.out} (load with: cd {args.out} && mysql --local-infile=1 -D <db> < load.sql)")
+    for table in TABLES:
+        print(f"📝 {table}: {totals.get(table, 0):,} rows")
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Grid-indexed delivery zones: batch point-in-zone, deliverability and delivery-charge lookups
+"""
+
+import argparse
+import json
+import math
+import random
+import time
+
+from generate_synthetic_data import BASE_LAT, BASE_LONG
+
+GRID_SIZE = 32
+BUCKET_DEGREES = 0.25
+MYSQL_EARTH_RADIUS = 6370986.0
+OUTSIDE, INSIDE, MIXED = 0, 1, 2
+
+
+def is_in_polygon(points_polygon, vertices_x, vertices_y, longitude_x, latitude_y):
+    """Ray casting exactly as is_in_polygon() in function_helper.php"""
+    if points_polygon < 3 or len(vertices_x) != points_polygon or len(vertices_y) != points_polygon:
+        return False
+    inside = False
+    j = points_polygon - 1
+    for i in range(points_polygon):
+        if ((vertices_y[i] > latitude_y) != (vertices_y[j] > latitude_y)
+                and longitude_x < (vertices_x[j] - vertices_x[i]) * (latitude_y - vertices_y[i])
+                / (vertices_y[j] - vertices_y[i]) + vertices_x[i]):
+            inside = not inside
+        j = i
+    return inside
+
+
+def st_distance_sphere(x1, y1, x2, y2, radius=MYSQL_EARTH_RADIUS):
+    """MySQL ST_Distance_Sphere(POINT(x1, y1), POINT(x2, y2)) in meters; x is longitude, y latitude"""
+    phi1, phi2 = math.radians(y1), math.radians(y2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(x2 - x1) / 2) ** 2)
+    return 2 * radius * math.asin(min(1.0, math.sqrt(a)))
+
+
+def php_round(value, precision=0):
+    """PHP round(): halves away from zero"""
+    scale = 10 ** precision
+    return math.copysign(math.floor(abs(value) * scale + 0.5), value) / scale
+
+
+class PolygonGrid:
+    """A zone polygon with its bounding box cut into GRID_SIZE x GRID_SIZE cells.
+
+    Cells no edge passes through are wholly inside or outside and answer a
+    query with one lookup. Every other cell falls back to ray casting over
+    just the edges spanning its row, which are the only edges a horizontal
+    ray from a point in that row can cross.
+    """
+
+    def __init__(self, xs, ys, size=GRID_SIZE):
+        self.xs, self.ys = list(xs), list(ys)
+        self.min_x, self.max_x = min(xs), max(xs)
+        self.min_y, self.max_y = min(ys), max(ys)
+        self.size = size
+        self.cell_w = (self.max_x - self.min_x) / size or 1e-12
+        self.cell_h = (self.max_y - self.min_y) / size or 1e-12
+        n = len(xs)
+        edges = [(xs[i], ys[i], xs[i - 1], ys[i - 1]) for i in range(n)]
+
+        self.row_edges = []
+        for row in range(size):
+            low, high = self.min_y + row * self.cell_h, self.min_y + (row + 1) * self.cell_h
+            self.row_edges.append([e for e in edges if min(e[1], e[3]) <= high and max(e[1], e[3]) >= low])
+
+        self.cells = bytearray(size * size)
+        for row in range(size):
+            low, high = self.min_y + row * self.cell_h, self.min_y + (row + 1) * self.cell_h
+            for col in range(size):
+                left, right = self.min_x + col * self.cell_w, self.min_x + (col + 1) * self.cell_w
+                touched = any(min(e[0], e[2]) <= right and max(e[0], e[2]) >= left
+                              for e in self.row_edges[row])
+                if touched:
+                    self.cells[row * size + col] = MIXED
+                else:
+                    centre = is_in_polygon(n, self.xs, self.ys, (left + right) / 2, (low + high) / 2)
+                    self.cells[row * size + col] = INSIDE if centre else OUTSIDE
+
+    def contains(self, x, y):
+        if not (self.min_x <= x <= self.max_x and self.min_y <= y <= self.max_y):
+            return False
+        row = min(int((y - self.min_y) / self.cell_h), self.size - 1)
+        col = min(int((x - self.min_x) / self.cell_w), self.size - 1)
+        state = self.cells[row * self.size + col]
+        if state != MIXED:
+            return state == INSIDE
+        inside = False
+        for xi, yi, xj, yj in self.row_edges[row]:
+            if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+                inside = not inside
+        return inside
+
+
+class Zone:
+    """Delivery settings of one `cities` row, with its polygon indexed"""
+
+    def __init__(self, row, grid_size=GRID_SIZE):
+        self.id = int(row["id"])
+        self.kind = row.get("geolocation_type") or ""
+        self.latitude = float(row.get("latitude") or 0)
+        self.longitude = float(row.get("longitude") or 0)
+        self.radius_km = float(row.get("radius") or 0)
+        self.max_deliverable_distance = float(row.get("max_deliverable_distance") or 0)
+        self.charge_method = row.get("delivery_charge_method") or ""
+        self.fixed_charge = int(float(row.get("fixed_charge") or 0))
+        self.per_km_charge = int(float(row.get("per_km_charge") or 0))
+        self.grid = None
+        points = row.get("boundary_points") or "[]"
+        points = json.loads(points) if isinstance(points, str) else points
+        if self.kind == "polygon" and len(points) >= 3:
+            self.xs = [float(p["lng"]) for p in points]
+            self.ys = [float(p["lat"]) for p in points]
+            self.grid = PolygonGrid(self.xs, self.ys, grid_size)
+        ranges = row.get("range_wise_charges") or "[]"
+        ranges = json.loads(ranges) if isinstance(ranges, str) else ranges
+        self.band_prices = self._band_table(ranges or [])
+
+    @staticmethod
+    def _band_table(ranges):
+        """Price per whole kilometre; the last matching range wins, as in the PHP loop"""
+        if not ranges:
+            return []
+        table = [None] * (int(max(float(r["to_range"]) for r in ranges)) + 1)
+        for r in ranges:
+            low, high, price = float(r["from_range"]), float(r["to_range"]), int(float(r["price"]))
+            for km in range(max(0, math.ceil(low)), int(high) + 1):
+                table[km] = price
+        return table
+
+    def bounds(self):
+        if self.grid is not None:
+            return self.grid.min_x, self.grid.min_y, self.grid.max_x, self.grid.max_y
+        if self.kind == "circle":
+            dy = self.radius_km / 111.32
+            dx = dy / max(math.cos(math.radians(self.latitude)), 1e-6)
+            return self.longitude - dx, self.latitude - dy, self.longitude + dx, self.latitude + dy
+        return None
+
+    def contains(self, latitude, longitude):
+        if self.grid is not None:
+            return self.grid.contains(longitude, latitude)
+        if self.kind == "circle":
+            return st_distance_sphere(self.longitude, self.latitude, longitude, latitude) <= self.radius_km * 1000
+        return False
+
+    def charge(self, distance_km):
+        """Delivery charge for a distance already rounded like get_delivery_charge() does"""
+        if self.charge_method == "fixed_charge":
+            return self.fixed_charge
+        if self.charge_method == "per_km_charge":
+            return self.per_km_charge * math.ceil(distance_km)
+        if self.charge_method == "range_wise_charges":
+            km = int(php_round(distance_km))
+            price = self.band_prices[km] if km < len(self.band_prices) else None
+            return 0 if price is None else price
+        return 0
+
+
+class ZoneIndex:
+    """All delivery zones, bucketed on a coarse lat/long grid so a point only meets nearby zones"""
+
+    def __init__(self, rows, bucket_degrees=BUCKET_DEGREES, grid_size=GRID_SIZE):
+        self.zones = {zone.id: zone for zone in (Zone(row, grid_size) for row in rows)}
+        self.bucket_degrees = bucket_degrees
+        self.buckets = {}
+        for zone in self.zones.values():
+            bounds = zone.bounds()
+            if bounds is None:
+                continue
+            min_x, min_y, max_x, max_y = (math.floor(v / bucket_degrees) for v in bounds)
+            for bx in range(min_x, max_x + 1):
+                for by in range(min_y, max_y + 1):
+                    self.buckets.setdefault((bx, by), []).append(zone)
+
+    def zones_containing(self, points):
+        """For each (latitude, longitude), the sorted ids of the zones it lies in"""
+        scale = 1.0 / self.bucket_degrees
+        buckets = self.buckets
+        floor = math.floor
+        results = []
+        for latitude, longitude in points:
+            candidates = buckets.get((floor(longitude * scale), floor(latitude * scale)), ())
+            results.append([z.id for z in candidates if z.contains(latitude, longitude)])
+        return results
+
+    def deliverable(self, city_id, points):
+        """Batch is_order_deliverable() for one branch city.
+
+        The PHP compares max_deliverable_distance against the branch's
+        distance to itself, which is always 0, so only the polygon test
+        decides; this mirrors that.
+        """
+        zone = self.zones.get(int(city_id))
+        if zone is None:
+            return [False] * len(points)
+        if zone.kind == "circle":
+            return [True] * len(points)
+        if zone.grid is None:
+            return [False] * len(points)
+        contains = zone.grid.contains
+        return [contains(longitude, latitude) for latitude, longitude in points]
+
+    def delivery_charges(self, city_id, branch_latitude, branch_longitude, points):
+        """Batch get_delivery_charge() with distance_matrix_api off: [(charge, distance_km)]
+
+        The PHP passes POINT(latitude, longitude) to ST_Distance_Sphere, so
+        latitude is treated as x; the distance is computed the same way.
+        """
+        zone = self.zones[int(city_id)]
+        branch_latitude, branch_longitude = float(branch_latitude), float(branch_longitude)
+        results = []
+        for latitude, longitude in points:
+            meters = st_distance_sphere(latitude, longitude, branch_latitude, branch_longitude)
+            distance = php_round(meters / 1000, 1)
+            results.append((zone.charge(distance), distance))
+        return results
+
+
+def decode_polygons(rows):
+    """[(city_id, xs, ys)] for the polygon zones, decoded the way is_order_deliverable() does"""
+    polygons = []
+    for row in rows:
+        if row.get("geolocation_type") != "polygon":
+            continue
+        boundary = json.loads(row["boundary_points"])
+        polygons.append((int(row["id"]), [float(p["lng"]) for p in boundary], [float(p["lat"]) for p in boundary]))
+    return polygons
+
+
+def linear_zones_containing(polygons, points):
+    """The current path: ray-cast every point against every zone polygon in turn"""
+    results = []
+    for latitude, longitude in points:
+        results.append([city_id for city_id, xs, ys in polygons
+                        if is_in_polygon(len(xs), xs, ys, longitude, latitude)])
+    return results
+
+
+def load_zones(path):
+    """Read `cities` rows from a JSON export (a plain list, {"cities": [...]} or phpMyAdmin's format)"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("cities", data.get("data", []))
+    rows = []
+    for item in data:
+        if item.get("type") == "table":
+            if item.get("name") == "cities":
+                rows.extend(item.get("data", []))
+        elif "type" not in item:
+            rows.append(item)
+    return rows
+
+
+def synthetic_zones(count, vertices, rng):
+    """Irregular star-shaped polygon zones laid out like generate_synthetic_data.py's cities"""
+    rows = []
+    for i in range(1, count + 1):
+        lat, lng = BASE_LAT + i * 0.5 % 10, BASE_LONG + (i * 0.5 // 10) * 0.5
+        angles = sorted(rng.uniform(0, 2 * math.pi) for _ in range(vertices))
+        boundary = [{"lat": round(lat + rng.uniform(0.05, 0.2) * math.sin(a), 6),
+                     "lng": round(lng + rng.uniform(0.05, 0.2) * math.cos(a), 6)} for a in angles]
+        rows.append({"id": i, "name": f"City {i}", "latitude": str(lat), "longitude": str(lng),
+                     "geolocation_type": "polygon", "boundary_points": json.dumps(boundary),
+                     "max_deliverable_distance": 15, "delivery_charge_method": "range_wise_charges",
+                     "range_wise_charges": json.dumps([{"from_range": "0", "to_range": "5", "price": "20"},
+                                                       {"from_range": "6", "to_range": "15", "price": "45"}])})
+    return rows
+
+
+def benchmark(rows, queries, rng, grid_size=GRID_SIZE):
+    """Time the indexed lookup against the linear scan and check they agree"""
+    started = time.perf_counter()
+    index = ZoneIndex(rows, grid_size=grid_size)
+    build = time.perf_counter() - started
+    lats = [float(r["latitude"]) for r in rows]
+    lngs = [float(r["longitude"]) for r in rows]
+    points = [(rng.uniform(min(lats) - 0.3, max(lats) + 0.3), rng.uniform(min(lngs) - 0.3, max(lngs) + 0.3))
+              for _ in range(queries)]
+
+    polygons = decode_polygons(rows)
+    started = time.perf_counter()
+    expected = linear_zones_containing(polygons, points)
+    linear = time.perf_counter() - started
+    started = time.perf_counter()
+    found = index.zones_containing(points)
+    indexed = time.perf_counter() - started
+    mismatches = sum(a != b for a, b in zip(expected, found))
+    return {"zones": len(rows), "queries": queries, "build_s": build, "linear_s": linear,
+            "indexed_s": indexed, "mismatches": mismatches, "hits": sum(bool(f) for f in found)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Indexed deliverability and delivery-charge lookups")
+    parser.add_argument("--zones", help="JSON export of the cities table")
+    parser.add_argument("--points", help="file of 'latitude,longitude' lines to look up")
+    parser.add_argument("--output", help="write one JSON result per point here instead of stdout")
+    parser.add_argument("--benchmark", action="store_true", help="compare against the linear is_in_polygon scan")
+    parser.add_argument("--synthetic-zones", type=int, default=50, help="zones to generate when --zones is not given")
+    parser.add_argument("--vertices", type=int, default=200, help="vertices per generated polygon")
+    parser.add_argument("--queries", type=int, default=5000, help="benchmark lookups")
+    parser.add_argument("--grid", type=int, default=GRID_SIZE, help="cells per polygon side")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = load_zones(args.zones) if args.zones else synthetic_zones(args.synthetic_zones, args.vertices, rng)
+
+    if args.benchmark or not args.points:
+        result = benchmark(rows, args.queries, rng, args.grid)
+        print(f"🗺️  {result['zones']} zones indexed in {result['build_s'] * 1000:.1f} ms")
+        print(f"🐢 Linear scan:  {result['linear_s'] / result['queries'] * 1e6:>9.1f} µs/point")
+        print(f"⚡ Grid index:   {result['indexed_s'] / result['queries'] * 1e6:>9.1f} µs/point "
+              f"({result['linear_s'] / max(result['indexed_s'], 1e-9):.0f}x)")
+        print(f"📊 {result['queries']} points, {result['hits']} inside a zone, {result['mismatches']} mismatches")
+    if args.points:
+        index = ZoneIndex(rows, grid_size=args.grid)
+        with open(args.points, encoding="utf-8") as f:
+            points = [tuple(float(v) for v in line.split(",")[:2]) for line in f if line.strip()]
+        lines = [json.dumps({"latitude": p[0], "longitude": p[1], "zones": z})
+                 for p, z in zip(points, index.zones_containing(points))]
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            print(f"📁 File: {args.output}")
+        else:
+            print("\n".join(lines))
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Static index advisor: cross-reference model/helper queries against the dump's indexes
+"""
+
+import argparse
+import glob
+import json
+import math
+import os
+import re
+
+from generate_postman_collection import CONTROLLERS, split_controller_methods
+from sql_schema import SCHEMA_FILE, parse_schema
+
+QUERY_SOURCES = ["application/models/*.php", "application/helpers/function_helper.php"]
+# relative cost of a scan, used when no --rows estimate is given
+TABLE_WEIGHTS = {"orders": 5, "order_items": 5, "cart": 4, "products": 4, "product_variants": 4,
+                 "transactions": 3, "users": 3, "addresses": 2, "live_tracking": 3, "pending_orders": 3,
+                 "product_rating": 2, "favorites": 2, "cart_add_ons": 3, "wallet_transactions": 2}
+SQL_WORDS = {"where", "left", "right", "inner", "outer", "join", "on", "group", "order", "limit", "set",
+             "using", "as", "and", "or", "union", "having", "select"}
+
+FUNCTION_RE = re.compile(r"^[ \t]*(?:(?:public|protected|private|static)\s+)*function\s+(\w+)\s*\(", re.M)
+TABLE_ARG_RE = re.compile(r"(?:join|from|get)\(\s*['\"]\s*`?(\w+)`?(?:\s+(?:as\s+)?`?(\w+)`?)?\s*['\"]", re.I)
+RAW_TABLE_RE = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+`?(\w+)`?(?:\s+(?:AS\s+)?`?(\w+)`?)?", re.I)
+DETAILS_RE = re.compile(r"(?:fetch_details|update_details|delete_details)\(\s*(\[[^\]]*\]|array\([^)]*\))?[^;]*?,\s*['\"](\w+)['\"]")
+JOIN_RE = re.compile(r"join\(\s*['\"]\s*`?(\w+)`?(?:\s+(?:as\s+)?`?(\w+)`?)?\s*['\"]\s*,\s*['\"]([^'\"]+)['\"]", re.I)
+RAW_JOIN_RE = re.compile(r"JOIN\s+`?(\w+)`?(?:\s+(?:AS\s+)?`?(\w+)`?)?\s+ON\s+(.+?)(?=\b(?:LEFT|RIGHT|INNER|JOIN|WHERE|GROUP|ORDER|LIMIT)\b|[\"']|$)",
+                         re.I | re.S)
+QUERY_END_RE = re.compile(r"->(?:get|get_where|query|count_all_results|update|delete|insert|insert_batch)\s*\([^;]*;")
+JOIN_COND_RE = re.compile(r"`?(\w+)`?\.`?(\w+)`?\s*=\s*`?(\w+)`?\.`?(\w+)`?")
+WHERE_COL_RE = re.compile(r"(?:where|where_in|where_not_in|or_where)\(\s*['\"]\s*`?([\w.]+)`?")
+WHERE_ARRAY_RE = re.compile(r"(?:where|or_where)\(\s*(?:\[|array\()(.*?)(?:\]|\))\s*\)", re.S)
+WHERE_VAR_RE = re.compile(r"\$where\[\s*['\"]([\w.]+)['\"]\s*\]")
+ARRAY_KEY_RE = re.compile(r"['\"]([\w.]+)['\"]\s*=>")
+RAW_FILTER_RE = re.compile(r"(?<![\w$>])(DATE\()?`?([a-z_]\w*)`?\.`?(\w+)`?\)?\s*(=|!=|<>|>=|<=|<|>|\bIN\b|\bBETWEEN\b)"
+                           r"(?!\s*`?[a-z_]\w*`?\.`?\w)", re.I)
+# flag-like columns are poor leading index columns, so they go last in a composite
+LOW_CARDINALITY_RE = re.compile(r"^(status|active|availability|type|is_\w+|active_status|\w+_status)$")
+TEXT_TYPES = {"text", "mediumtext", "longtext", "blob", "mediumblob", "longblob"}
+ORDER_RE = re.compile(r"order_by\(\s*['\"]\s*`?([\w.]+)`?")
+RAW_ORDER_RE = re.compile(r"ORDER BY\s+`?([\w.]+)`?", re.I)
+MODEL_CALL_RE = re.compile(r"->(\w+_model)->(\w+)\s*\(", re.I)
+SELF_CALL_RE = re.compile(r"\$this->(\w+)\s*\(")
+# plain function calls, not declarations, constructors or method/static calls
+BARE_CALL_RE = re.compile(r"(?<![\w>$:])(?<!function\s)(?<!new\s)(\w+)\s*\(")
+
+
+class QuerySite:
+    """Columns one PHP function filters, joins and sorts on, per query it builds"""
+
+    def __init__(self, key, path, line):
+        self.key = key
+        self.path = path
+        self.line = line
+        self.queries = []
+
+    def new_query(self):
+        self.queries.append({})
+        return self.queries[-1]
+
+
+def add_usage(query, table, kind, column):
+    columns = query.setdefault(table, {"filter": [], "range": [], "join": [], "sort": []})[kind]
+    if column not in columns:
+        columns.append(column)
+
+
+def split_functions(source):
+    """Yield (name, body, line) for every function in a PHP file"""
+    matches = list(FUNCTION_RE.finditer(source))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(source)
+        yield match.group(1), source[match.start():end], source.count("\n", 0, match.start()) + 1
+
+
+def alias_map(body):
+    aliases = {}
+    for regex in (TABLE_ARG_RE, RAW_TABLE_RE):
+        for table, alias in regex.findall(body):
+            aliases.setdefault(table.lower(), table)
+            if alias and alias.lower() not in SQL_WORDS:
+                aliases[alias.lower()] = table
+    return aliases
+
+
+def split_queries(body):
+    """Split a function body into query-builder segments, each ending at the call that runs it"""
+    start = 0
+    for match in QUERY_END_RE.finditer(body):
+        yield body[start:match.end()]
+        start = match.end()
+    if body[start:].strip():
+        yield body[start:]
+
+
+def analyze_function(key, path, line, body, schema):
+    """Extract filtered/joined/sorted columns of every query one function builds"""
+    site = QuerySite(key, path, line)
+
+    for where, table in DETAILS_RE.findall(body):
+        if table in schema:
+            query = site.new_query()
+            for column in ARRAY_KEY_RE.findall(where or ""):
+                if schema[table].column(column):
+                    add_usage(query, table, "filter", column)
+
+    for segment in split_queries(body):
+        aliases = {a: t for a, t in alias_map(segment).items() if t in schema}
+        if not aliases:
+            continue
+        tables = set(aliases.values())
+        query = site.new_query()
+
+        def resolve(ref):
+            alias, _, column = ref.strip("` ").rpartition(".")
+            if alias:
+                table = aliases.get(alias.strip("`").lower())
+            else:
+                table = next(iter(tables)) if len(tables) == 1 else None
+            column = column.strip("`")
+            if table and schema[table].column(column):
+                return table, column
+            return None, None
+
+        # only the joined table's side of a join condition is looked up through an index
+        for regex in (JOIN_RE, RAW_JOIN_RE):
+            for joined, alias, cond in regex.findall(segment):
+                joined_alias = (alias if alias and alias.lower() not in SQL_WORDS else joined).lower()
+                for a1, c1, a2, c2 in JOIN_COND_RE.findall(cond):
+                    for a, c in ((a1, c1), (a2, c2)):
+                        if a.lower() == joined_alias:
+                            table, column = resolve(f"{a}.{c}")
+                            if table:
+                                add_usage(query, table, "join", column)
+
+        refs = WHERE_COL_RE.findall(segment) + WHERE_VAR_RE.findall(segment)
+        for array in WHERE_ARRAY_RE.findall(segment):
+            refs.extend(ARRAY_KEY_RE.findall(array))
+        for ref in refs:
+            table, column = resolve(ref.split()[0])
+            if table:
+                add_usage(query, table, "filter", column)
+
+        for wrapped, alias, column, op in RAW_FILTER_RE.findall(segment):
+            table, column = resolve(f"{alias}.{column}")
+            if not table:
+                continue
+            if wrapped or op.upper() in (">=", "<=", "<", ">", "BETWEEN"):
+                add_usage(query, table, "range", column)
+            else:
+                add_usage(query, table, "filter", column)
+
+        for ref in ORDER_RE.findall(segment) + RAW_ORDER_RE.findall(segment):
+            table, column = resolve(ref)
+            if table:
+                add_usage(query, table, "sort", column)
+    return site
+
+
+def calls_in(body, helpers):
+    """Return the model methods and the `helpers` functions a PHP body calls"""
+    calls = {f"{model.lower()}::{method}" for model, method in MODEL_CALL_RE.findall(body)}
+    calls.update(name for name in BARE_CALL_RE.findall(body) if name in helpers)
+    return calls
+
+
+def load_query_sites(root, schema):
+    """Analyze every model method and helper function; return (sites, callees) keyed by name"""
+    functions = []
+    for pattern in QUERY_SOURCES:
+        for path in sorted(glob.glob(os.path.join(root, pattern))):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                source = f.read()
+            model = os.path.splitext(os.path.basename(path))[0].lower() if "/models/" in path else None
+            functions.extend((os.path.relpath(path, root), model, *function) for function in split_functions(source))
+    helpers = {name for _, model, name, _, _ in functions if not model}
+
+    sites = {}
+    callees = {}
+    for rel, model, name, body, line in functions:
+        key = f"{model}::{name}" if model else name
+        sites[key] = analyze_function(key, rel, line, body, schema)
+        calls = calls_in(body, helpers)
+        if model:
+            calls.update(f"{model}::{method}" for method in SELF_CALL_RE.findall(body))
+        callees[key] = calls
+    return sites, callees
+
+
+def reachable(calls, callees, depth=3):
+    """Transitively expand a set of calls through known model/helper functions"""
+    seen = set()
+    frontier = {c for c in calls if c in callees}
+    for _ in range(depth + 1):
+        frontier -= seen
+        if not frontier:
+            break
+        seen |= frontier
+        frontier = {c for key in frontier for c in callees[key] if c in callees}
+    return seen
+
+
+def candidate_indexes(site, schema):
+    """Yield (table, columns, reason) for each index a query of this site would use"""
+    for query in site.queries:
+        for table, usage in query.items():
+            definition = schema[table]
+            usable = [c for c in usage["filter"] if definition.column(c).type not in TEXT_TYPES]
+            if len(definition.primary_key) == 1 and definition.primary_key[0] in usable:
+                continue  # a primary-key lookup needs nothing else
+            if usable or usage["range"]:
+                columns = sorted(usable, key=lambda c: bool(LOW_CARDINALITY_RE.match(c)))
+                columns = (columns + usage["range"][:1])[:3]
+                if usage["sort"] and len(columns) < 3 and usage["sort"][0] not in columns and not usage["range"]:
+                    columns.append(usage["sort"][0])
+                if not all(LOW_CARDINALITY_RE.match(c) for c in columns):
+                    yield table, columns, "filter"
+            for column in usage["join"]:
+                yield table, [column], "join"
+            if usage["sort"] and not (usable or usage["range"]) and usage["sort"][0] not in definition.primary_key:
+                yield table, usage["sort"][:1], "sort"
+
+
+def coverage(table, columns):
+    """Return 'covered', 'partial' (leading column indexed only) or 'missing'"""
+    indexes = [cols for _, cols in table.all_indexes()]
+    if any(cols[:len(columns)] == columns for cols in indexes):
+        return "covered"
+    if any(cols and cols[0] == columns[0] for cols in indexes):
+        return "partial"
+    return "missing"
+
+
+def advise(root=os.path.dirname(os.path.abspath(__file__)), schema_path=SCHEMA_FILE, rows=None):
+    """Return the ranked list of missing composite indexes, with the API methods that reach them"""
+    schema = parse_schema(os.path.join(root, schema_path))
+    sites, callees = load_query_sites(root, schema)
+    helpers = {key for key in callees if "::" not in key}
+    rows = rows or {}
+
+    reached_by = {}
+    for base, rel_path in CONTROLLERS:
+        prefix = "rider/" if "rider" in base else ""
+        with open(os.path.join(root, rel_path), encoding="utf-8", errors="replace") as f:
+            source = f.read()
+        for visibility, name, body in split_controller_methods(source):
+            if visibility != "public" or name.startswith("_"):
+                continue
+            for key in reachable(calls_in(body, helpers), callees):
+                reached_by.setdefault(key, set()).add(prefix + name)
+
+    findings = {}
+    for key, site in sites.items():
+        for table, columns, reason in candidate_indexes(site, schema):
+            state = coverage(schema[table], columns)
+            if state == "covered":
+                continue
+            finding = findings.setdefault((table, tuple(columns)), {
+                "table": table, "columns": columns, "reason": reason, "state": state,
+                "sites": [], "api_methods": set()})
+            location = f"{site.path}:{site.line} {key}"
+            if location not in finding["sites"]:
+                finding["sites"].append(location)
+            finding["api_methods"] |= reached_by.get(key, set())
+
+    ranked = []
+    for finding in findings.values():
+        weight = math.log10(rows[finding["table"]]) if finding["table"] in rows else TABLE_WEIGHTS.get(finding["table"], 1)
+        finding["score"] = round(weight * (1 + len(finding["api_methods"])) * (3 if finding["state"] == "missing" else 1)
+                                 * len(finding["sites"]) ** 0.5, 1)
+        finding["api_methods"] = sorted(finding["api_methods"])
+        finding["ddl"] = "ALTER TABLE `%s` ADD INDEX `idx_%s` (%s);" % (
+            finding["table"], "_".join(finding["columns"]), ", ".join(f"`{c}`" for c in finding["columns"]))
+        ranked.append(finding)
+    ranked.sort(key=lambda f: -f["score"])
+    return ranked
+
+
+def by_api_method(ranked):
+    """Regroup findings per API method, heaviest first"""
+    methods = {}
+    for finding in ranked:
+        for method in finding["api_methods"]:
+            methods.setdefault(method, []).append(finding)
+    return sorted(methods.items(), key=lambda kv: -sum(f["score"] for f in kv[1]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rank missing composite indexes for model/helper queries")
+    parser.add_argument("--schema", default=SCHEMA_FILE)
+    parser.add_argument("--rows", nargs="*", help="row estimates used for weighting, e.g. orders=20000000")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--json", help="write the full report to this file")
+    args = parser.parse_args()
+
+    estimates = {}
+    for pair in args.rows or ():
+        table, _, count = pair.partition("=")
+        estimates[table] = max(10, int(count))
+    ranked = advise(schema_path=args.schema, rows=estimates)
+
+    print(f"🔍 {len(ranked)} index candidates not covered by the dump's indexes")
+    for finding in ranked[:args.top]:
+        print(f"\n[{finding['score']:>6}] {finding['state']:<8} {finding['ddl']}")
+        print(f"         {finding['reason']} · API: {', '.join(finding['api_methods'][:8]) or '(admin/cron only)'}"
+              + (" …" if len(finding["api_methods"]) > 8 else ""))
+        for site in finding["sites"][:3]:
+            print(f"         ↳ {site}")
+
+    print("\n📊 Per API method")
+    for method, findings in by_api_method(ranked)[:args.top]:
+        tables = ", ".join(f"{f['table']}({','.join(f['columns'])})" for f in findings[:4])
+        print(f"  {method:<32} {len(findings):>3} uncovered · {tables}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"findings": ranked, "api_methods": {m: [f["ddl"] for f in fs] for m, fs in by_api_method(ranked)}},
+                      f, indent=2)
+        print(f"📁 File: {args.json}")
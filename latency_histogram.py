@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Fixed-bucket log-linear latency histogram that merges losslessly across processes
+"""
+
+from array import array
+
+
+class LatencyHistogram:
+    """HDR-style histogram of integer microsecond values.
+
+    Values below 2**precision are counted exactly; above that every power of
+    two is split into 2**(precision - 1) linear sub-buckets, which bounds the
+    relative error to 2**-(precision - 1). The bucket layout depends only on
+    (precision, max_value), so histograms with the same layout merge by adding
+    counts and no raw samples ever need to be kept or shipped.
+    """
+
+    __slots__ = ("precision", "max_value", "counts", "count", "total", "min", "max")
+
+    def __init__(self, precision=7, max_value=3600 * 1000000):
+        self.precision = precision
+        self.max_value = max_value
+        self.counts = array("Q", bytes(8 * (self._index(max_value) + 1)))
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value):
+        sub = 1 << self.precision
+        if value < sub:
+            return value
+        shift = value.bit_length() - self.precision
+        return sub + (shift - 1) * (sub >> 1) + ((value >> shift) - (sub >> 1))
+
+    def _bounds(self, index):
+        """Return the [low, high) value range of a bucket"""
+        sub = 1 << self.precision
+        if index < sub:
+            return index, index + 1
+        half = sub >> 1
+        shift = (index - sub) // half + 1
+        low = (((index - sub) % half) + half) << shift
+        return low, low + (1 << shift)
+
+    def record(self, value, n=1):
+        """Record an integer microsecond value (clamped to max_value) n times"""
+        value = min(max(int(value), 0), self.max_value)
+        self.counts[self._index(value)] += n
+        self.count += n
+        self.total += value * n
+        if self.min is None or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Add another histogram with the same layout into this one"""
+        if (other.precision, other.max_value) != (self.precision, self.max_value):
+            raise ValueError("cannot merge histograms with different bucket layouts")
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, q):
+        """Return the value at percentile q (0-100), as a bucket midpoint"""
+        if not self.count:
+            return 0
+        rank = max(1, int(q / 100.0 * self.count + 0.5))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c:
+                seen += c
+                if seen >= rank:
+                    low, high = self._bounds(i)
+                    return min(max((low + high - 1) // 2, self.min), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def buckets(self):
+        """Yield (low, high, count) for every non-empty bucket"""
+        for i, c in enumerate(self.counts):
+            if c:
+                low, high = self._bounds(i)
+                yield low, high, c
+
+    def to_dict(self):
+        """Compact sparse representation, suitable for JSON"""
+        return {
+            "precision": self.precision,
+            "max_value": self.max_value,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "counts": [[i, c] for i, c in enumerate(self.counts) if c],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data["precision"], data["max_value"])
+        for i, c in data["counts"]:
+            histogram.counts[i] = c
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
+
+    def __reduce__(self):
+        return (LatencyHistogram.from_dict, (self.to_dict(),))
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Batched ingestion for rider live-tracking pings: coalesce per order, flush to live_tracking in bulk
+
+Serves manage_live_tracking / delete_live_tracking (rider API) and get_live_tracking_details
+(customer API) from memory, reading an order from the table only when it is not in memory yet.
+Token and order-status checks are left to the gateway in front of it; each flush replaces an
+order's rows (delete then insert by order_id), so ids stay AUTO_INCREMENT's.
+"""
+
+import argparse
+import asyncio
+import collections
+import random
+import shlex
+import time
+from collections import defaultdict
+from urllib.parse import parse_qsl
+
+from load_test import ConnectionPool, EndpointStats, print_report, send_spec
+from mock_server import _encode, _listen, http_response
+
+FLUSH_INTERVAL = 1.0
+BATCH_ROWS = 500
+ORDER_STATUSES = ("preparing", "out_for_delivery", "delivered", "cancelled")
+MANAGE_PATH = b"/rider/app/v1/api/manage_live_tracking"
+DELETE_PATH = b"/rider/app/v1/api/delete_live_tracking"
+DETAILS_PATH = b"/app/v1/api/get_live_tracking_details"
+
+
+def _reply(error, message, data=None):
+    return http_response(_encode({"error": error, "message": message, "data": [] if data is None else data}))
+
+
+def _details_reply(data):
+    if data:
+        return _reply(False, "Live Tracking Detail fetched successfully.", data)
+    return _reply(True, "Live Tracking Not available.")
+
+
+def _delete_reply(found):
+    if found:
+        return _reply(False, "Live Tracking Details Deleted Successfully.")
+    return _reply(True, "Live Tracking Details Not Found.")
+
+
+def _sql_string(value):
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+class TrackingStore:
+    """Latest position per order, plus the orders changed since the last flush.
+
+    manage_live_tracking overwrites every row of an order, so the newest
+    ping is the only state that ever reaches the table; pings arriving
+    within one flush window collapse into a single replaced row.
+    """
+
+    def __init__(self, loader=None):
+        self.rows = {}
+        self.dirty = set()
+        self.deleted = set()
+        # `loader(order_id)` reads an order's row from the table, for orders written before a restart
+        self.loader = loader
+        self.absent = set()
+        self.loading = {}
+        self.received = 0
+        self.flushed_rows = 0
+        self.statements = 0
+
+    def update(self, order_id, order_status, latitude, longitude):
+        """Record a ping; return True if the order/status pair was new (the PHP "Inserted" case)"""
+        self.received += 1
+        row = self.rows.get(order_id)
+        inserted = row is None or row["order_status"] != order_status
+        if row is None:
+            row = self.rows[order_id] = {"order_id": str(order_id)}
+        row.update(order_status=order_status, latitude=latitude, longitude=longitude,
+                   date_created=time.strftime("%Y-%m-%d %H:%M:%S"))
+        self.dirty.add(order_id)
+        self.deleted.discard(order_id)
+        self.absent.discard(order_id)
+        return inserted
+
+    def delete(self, order_id):
+        """Queue the order's DELETE even if it is not in memory; return whether it was"""
+        found = self.rows.pop(order_id, None) is not None
+        self.dirty.discard(order_id)
+        self.deleted.add(order_id)
+        self.absent.add(order_id)
+        return found
+
+    def details(self, order_id):
+        row = self.rows.get(order_id)
+        return [dict(row)] if row else []
+
+    def needs_lookup(self, order_id):
+        return self.loader is not None and order_id not in self.rows and order_id not in self.absent
+
+    async def lookup(self, order_id):
+        """Load an order missing from memory from the table once, caching found and absent rows alike"""
+        pending = self.loading.get(order_id)
+        if pending is None:
+            pending = self.loading[order_id] = asyncio.ensure_future(self.loader(order_id))
+            pending.add_done_callback(lambda _: self.loading.pop(order_id, None))
+        try:
+            row = await asyncio.shield(pending)
+        except OSError:
+            return self.details(order_id)
+        # a ping or delete that landed while the row was loading is newer than it
+        if order_id not in self.rows and order_id not in self.absent:
+            if row:
+                self.rows[order_id] = row
+            else:
+                self.absent.add(order_id)
+        return self.details(order_id)
+
+    def drain(self, batch_rows=BATCH_ROWS):
+        """Take the pending changes as bulk SQL statements.
+
+        Rows are keyed by order_id: each batch deletes the orders' existing
+        rows (duplicates included) and inserts one fresh row per order in the
+        same transaction, so rows written by PHP or an earlier run are replaced.
+        """
+        dirty, self.dirty = [self.rows[o] for o in sorted(self.dirty)], set()
+        deleted, self.deleted = sorted(self.deleted), set()
+        statements = []
+        for start in range(0, len(dirty), batch_rows):
+            batch = dirty[start:start + batch_rows]
+            values = ",".join("(%s,%s,%s,%s,%s)" % (row["order_id"], _sql_string(row["order_status"]),
+                                                   _sql_string(row["latitude"]), _sql_string(row["longitude"]),
+                                                   _sql_string(row["date_created"]))
+                              for row in batch)
+            statements.append("START TRANSACTION;")
+            statements.append("DELETE FROM `live_tracking` WHERE `order_id` IN (%s);"
+                              % ",".join(row["order_id"] for row in batch))
+            statements.append("INSERT INTO `live_tracking` (`order_id`,`order_status`,`latitude`,`longitude`,"
+                              "`date_created`) VALUES " + values + ";")
+            statements.append("COMMIT;")
+        for start in range(0, len(deleted), batch_rows):
+            statements.append("DELETE FROM `live_tracking` WHERE `order_id` IN (%s);"
+                              % ",".join(str(o) for o in deleted[start:start + batch_rows]))
+        self.flushed_rows += len(dirty) + len(deleted)
+        self.statements += sum(1 for sql in statements if sql not in ("START TRANSACTION;", "COMMIT;"))
+        return statements
+
+    def requeue(self, dirty, deleted):
+        """Mark the orders of a drain whose write failed as pending again, unless newer changes superseded them"""
+        self.dirty.update(o for o in dirty if o in self.rows and o not in self.deleted)
+        self.deleted.update(o for o in deleted if o not in self.rows)
+
+
+class MysqlRowLoader:
+    """Read one order's newest live_tracking row with a short-lived `mysql` client"""
+
+    def __init__(self, args):
+        self.args = shlex.split(args)
+
+    async def __call__(self, order_id):
+        sql = ("SELECT `order_id`,`order_status`,`latitude`,`longitude`,`date_created` FROM `live_tracking` "
+               "WHERE `order_id` = %d ORDER BY `id` DESC LIMIT 1;" % order_id)
+        process = await asyncio.create_subprocess_exec("mysql", "--batch", "--skip-column-names", "-e", sql,
+                                                       *self.args, stdout=asyncio.subprocess.PIPE)
+        output, _ = await process.communicate()
+        if process.returncode:
+            raise ConnectionError("mysql client exited with code %d" % process.returncode)
+        fields = output.decode("utf-8", "replace").rstrip("\n").split("\t")
+        if len(fields) != 5:
+            return None
+        return dict(zip(("order_id", "order_status", "latitude", "longitude", "date_created"), fields))
+
+
+class SqlFileSink:
+    """Append flushed statements to a file"""
+
+    def __init__(self, path):
+        self.file = open(path, "a", encoding="utf-8")
+
+    async def write(self, statements):
+        self.file.write("\n".join(statements) + "\n")
+        self.file.flush()
+
+    async def close(self):
+        self.file.close()
+
+
+class MysqlClientSink:
+    """Pipe flushed statements into a long-running `mysql` client process.
+
+    Each write ends with a SELECT of a sequence number and waits for it to be
+    echoed back, so a batch only counts as written once mysql has run it. The
+    client exits on the first SQL error; the write then raises and the next
+    one starts a new client.
+    """
+
+    def __init__(self, args):
+        self.args = shlex.split(args)
+        self.process = None
+        self.sequence = 0
+
+    async def write(self, statements):
+        if self.process is None:
+            self.process = await asyncio.create_subprocess_exec(
+                "mysql", "--batch", "--skip-column-names", *self.args,
+                stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE)
+        self.sequence += 1
+        marker = str(self.sequence).encode()
+        try:
+            self.process.stdin.write(("\n".join(statements) + "\nSELECT %d;\n" % self.sequence).encode())
+            await self.process.stdin.drain()
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    raise ConnectionError("mysql client exited with code %s" % await self.process.wait())
+                if line.strip() == marker:
+                    return
+        except OSError:
+            await self._stop()
+            raise
+
+    async def _stop(self):
+        process, self.process = self.process, None
+        if process.returncode is None:
+            process.kill()
+        await process.wait()
+
+    async def close(self):
+        if self.process is not None:
+            self.process.stdin.close()
+            await self.process.wait()
+
+
+class TrackingProtocol(asyncio.Protocol):
+    """HTTP/1.1 handler for the three live-tracking endpoints.
+
+    Requests that have to read the table are answered from a task; responses
+    are queued so pipelined requests are still answered in order.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.buffer = b""
+        self.pending = collections.deque()
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        buffer = self.buffer + data
+        while True:
+            end = buffer.find(b"\r\n\r\n")
+            if end == -1:
+                break
+            lines = buffer[:end].split(b"\r\n")
+            length = 0
+            for line in lines[1:]:
+                if line[:15].lower() == b"content-length:":
+                    length = int(line[15:])
+                    break
+            if len(buffer) < end + 4 + length:
+                break
+            path = lines[0].split(b" ", 2)[1].split(b"?", 1)[0].rstrip(b"/")
+            body = dict(parse_qsl(buffer[end + 4:end + 4 + length].decode("utf-8", "replace")))
+            buffer = buffer[end + 4 + length:]
+            response = self.handle(path, body)
+            if isinstance(response, bytes):
+                slot = [response]
+            else:
+                slot = [None]
+                task = asyncio.get_running_loop().create_task(response)
+                task.add_done_callback(lambda done, slot=slot: self._ready(slot, done.result()))
+            self.pending.append(slot)
+        self.buffer = buffer
+        self._flush()
+
+    def _ready(self, slot, response):
+        slot[0] = response
+        self._flush()
+
+    def _flush(self):
+        ready = []
+        while self.pending and self.pending[0][0] is not None:
+            ready.append(self.pending.popleft()[0])
+        if ready and not self.transport.is_closing():
+            self.transport.write(b"".join(ready))
+
+    def handle(self, path, body):
+        order_id = body.get("order_id", "").strip()
+        if path.endswith(MANAGE_PATH):
+            if not order_id.isdigit():
+                return _reply(True, "The Order Id field is required.")
+            if body.get("order_status") not in ORDER_STATUSES:
+                return _reply(True, "The Order Status field must be one of: " + ",".join(ORDER_STATUSES) + ".")
+            if not body.get("latitude") or not body.get("longitude"):
+                return _reply(True, "The latitude and longitude fields are required.")
+            inserted = self.store.update(int(order_id), body["order_status"], body["latitude"].strip(),
+                                         body["longitude"].strip())
+            return _reply(False, "Live Tracking Details %s Successfully." % ("Inserted" if inserted else "Updated"))
+        if path.endswith(DETAILS_PATH):
+            if not order_id.isdigit():
+                return _details_reply([])
+            if self.store.needs_lookup(int(order_id)):
+                return self._lookup_details(int(order_id))
+            return _details_reply(self.store.details(int(order_id)))
+        if path.endswith(DELETE_PATH):
+            if not order_id.isdigit():
+                return _delete_reply(False)
+            # the DELETE is queued either way, so rows left in the table by an earlier run go too
+            found = self.store.delete(int(order_id))
+            if found or self.store.loader is None:
+                return _delete_reply(found)
+            return self._lookup_delete(int(order_id))
+        return _reply(True, "Route not found")
+
+    async def _lookup_details(self, order_id):
+        return _details_reply(await self.store.lookup(order_id))
+
+    async def _lookup_delete(self, order_id):
+        try:
+            row = await self.store.loader(order_id)
+        except OSError:
+            row = None
+        return _delete_reply(row is not None)
+
+
+async def flush(store, sinks, batch_rows=BATCH_ROWS):
+    """Drain the store into every sink; a failed write puts the drained orders back for the next flush"""
+    dirty, deleted = set(store.dirty), set(store.deleted)
+    statements = store.drain(batch_rows)
+    for sink in sinks if statements else ():
+        try:
+            await sink.write(statements)
+        except OSError as e:
+            print(f"⚠️  {type(sink).__name__} flush of {len(dirty) + len(deleted)} orders failed, retrying: {e}")
+            store.requeue(dirty, deleted)
+
+
+async def flush_loop(store, sinks, interval=FLUSH_INTERVAL, batch_rows=BATCH_ROWS):
+    """Flush coalesced changes every `interval` seconds until cancelled, then once more"""
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            await flush(store, sinks, batch_rows)
+    finally:
+        await flush(store, sinks, batch_rows)
+
+
+async def start_service(store, host="127.0.0.1", port=9100, sinks=(), interval=FLUSH_INTERVAL):
+    """Start the HTTP listener and the flusher; return (server, flusher_task)"""
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(lambda: TrackingProtocol(store), sock=_listen(host, port))
+    flusher = loop.create_task(flush_loop(store, list(sinks), interval))
+    return server, flusher
+
+
+async def simulate(riders=2000, ping_interval=2.0, pollers=500, poll_interval=5.0, duration=10.0,
+                   flush_interval=FLUSH_INTERVAL, pool_size=200, seed=1):
+    """Run the service in-process against simulated riders and polling customers"""
+    rng = random.Random(seed)
+    store = TrackingStore()
+    server, flusher = await start_service(store, port=0, interval=flush_interval)
+    pool = ConnectionPool("http://127.0.0.1:%d" % server.sockets[0].getsockname()[1], size=pool_size)
+    stats = defaultdict(EndpointStats)
+    deadline = time.perf_counter() + duration
+
+    async def loop_requests(spec, interval, move, offset=0.0):
+        await asyncio.sleep(max(0.0, min(offset + rng.uniform(0, interval), deadline - time.perf_counter())))
+        while time.perf_counter() < deadline:
+            move(spec["body"])
+            try:
+                latency, response = await send_spec(pool, spec)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                stats[spec["key"]].failures += 1
+            else:
+                stats[spec["key"]].record(latency, response)
+            await asyncio.sleep(min(interval * rng.uniform(0.8, 1.2), max(0.0, deadline - time.perf_counter())))
+
+    def drift(body):
+        body["latitude"] = "%.6f" % (float(body["latitude"]) + rng.uniform(-1e-4, 1e-4))
+        body["longitude"] = "%.6f" % (float(body["longitude"]) + rng.uniform(-1e-4, 1e-4))
+
+    tasks = []
+    for order_id in range(1, riders + 1):
+        spec = {"key": "rider/manage_live_tracking", "path": MANAGE_PATH.decode(),
+                "body": {"order_id": str(order_id), "order_status": "out_for_delivery",
+                         "latitude": "%.6f" % rng.uniform(23.0, 23.5), "longitude": "%.6f" % rng.uniform(69.5, 70.0)}}
+        tasks.append(loop_requests(spec, ping_interval, drift))
+    for _ in range(pollers):
+        spec = {"key": "get_live_tracking_details", "path": DETAILS_PATH.decode(),
+                "body": {"order_id": str(rng.randint(1, riders))}}
+        # customers start polling once riders have had time to send a first ping
+        tasks.append(loop_requests(spec, poll_interval, lambda body: None, ping_interval * 1.2))
+
+    started = time.perf_counter()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    await pool.close()
+    flusher.cancel()
+    try:
+        await flusher
+    except asyncio.CancelledError:
+        pass
+    server.close()
+    await server.wait_closed()
+    return stats, elapsed, store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Coalescing live-tracking ingestion service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--flush-interval", type=float, default=FLUSH_INTERVAL, help="seconds between bulk flushes")
+    parser.add_argument("--sql-log", help="append flushed statements to this file")
+    parser.add_argument("--mysql", help="arguments for a mysql client to pipe flushes into, e.g. '-h db -u root erestro'")
+    parser.add_argument("--benchmark", action="store_true", help="simulate riders and customers in-process")
+    parser.add_argument("--riders", type=int, default=2000)
+    parser.add_argument("--ping-interval", type=float, default=2.0, help="seconds between one rider's pings")
+    parser.add_argument("--pollers", type=int, default=500, help="customers polling get_live_tracking_details")
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        stats, elapsed, store = asyncio.run(simulate(args.riders, args.ping_interval, args.pollers,
+                                                     duration=args.duration, flush_interval=args.flush_interval))
+        print_report(stats, elapsed)
+        # manage_live_tracking costs an is_exist() SELECT plus an UPDATE or INSERT per ping
+        naive = store.received * 2
+        print(f"🛰️  {store.received} pings coalesced into {store.flushed_rows} row writes "
+              f"in {store.statements} statements")
+        print(f"🗄️  DB statements: {naive} per-ping vs {store.statements} batched "
+              f"({naive / max(store.statements, 1):.0f}x fewer)")
+    else:
+        async def main():
+            sinks = []
+            if args.sql_log:
+                sinks.append(SqlFileSink(args.sql_log))
+            if args.mysql:
+                sinks.append(MysqlClientSink(args.mysql))
+            store = TrackingStore(MysqlRowLoader(args.mysql) if args.mysql else None)
+            server, flusher = await start_service(store, args.host, args.port, sinks, args.flush_interval)
+            print(f"✅ Live tracking ingestion on http://{args.host}:{args.port} "
+                  f"(flush every {args.flush_interval:g}s)")
+            if not sinks:
+                print("⚠️  No --sql-log or --mysql sink; flushed rows are discarded")
+            try:
+                await server.serve_forever()
+            finally:
+                flusher.cancel()
+                try:
+                    await flusher
+                except asyncio.CancelledError:
+                    pass
+                for sink in sinks:
+                    await sink.close()
+
+        try:
+            asyncio.run(main())
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,665 @@
+#!/usr/bin/env python3
+"""
+Asyncio load generator that replays the generated Postman collection
+"""
+
+import argparse
+import asyncio
+import heapq
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import random
+import ssl
+import time
+from collections import defaultdict
+from urllib.parse import urlencode, urlsplit
+
+from bench_store import STORE_FILE, save_run
+from generate_postman_collection import create_collection_from_controllers, create_postman_collection, request_params
+from latency_histogram import LatencyHistogram
+from token_pool import TokenPool
+
+API_BASES = {
+    "{{user_api_base}}": "/app/v1/api",
+    "{{rider_api_base}}": "/rider/app/v1/api",
+}
+# every request carries X-Request-Id "<run>-<pid>-<n>" so server-side timing
+# records (request_timing_report.py) can be matched to a run
+RUN_ID = os.environ.get("LOAD_TEST_RUN_ID") or os.urandom(4).hex()
+_request_numbers = itertools.count()
+
+
+def next_request_id():
+    return f"{RUN_ID}-{os.getpid():x}-{next(_request_numbers)}"
+
+
+class Response:
+    """A fully read HTTP response; repeated Set-Cookie headers are kept in `cookies`"""
+
+    __slots__ = ("status", "headers", "body", "cookies")
+
+    def __init__(self, status, headers, body, cookies=()):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.cookies = cookies
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connection pool for a single origin"""
+
+    def __init__(self, base_url, size=100, timeout=30.0):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or (443 if self.scheme == "https" else 80)
+        self.prefix = parts.path.rstrip("/")
+        self.host_header = parts.netloc or self.host
+        self.timeout = timeout
+        self.ssl = ssl.create_default_context() if self.scheme == "https" else None
+        self._slots = asyncio.Semaphore(size)
+        self._idle = []
+        self.opened = 0
+
+    async def _connect(self):
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+
+    async def request(self, method, path, body=b"", headers=None):
+        """Send one request, reusing an idle connection when possible.
+
+        `body` is bytes, or a list of bytes-like parts (e.g. memoryviews of a
+        mapped file) written in order without joining them first.
+        """
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else await self._connect()
+            try:
+                response, keep_alive = await asyncio.wait_for(
+                    self._exchange(conn, method, path, body, headers or {}), self.timeout)
+            except BaseException:
+                conn[1].close()
+                raise
+            if keep_alive:
+                self._idle.append(conn)
+            else:
+                conn[1].close()
+            return response
+
+    async def _exchange(self, conn, method, path, body, headers):
+        reader, writer = conn
+        parts = body if isinstance(body, list) else None
+        length = sum(len(part) for part in parts) if parts is not None else len(body)
+        lines = [f"{method} {self.prefix}{path} HTTP/1.1", f"Host: {self.host_header}",
+                 f"Content-Length: {length}", "Connection: keep-alive"]
+        lines.extend(f"{k}: {v}" for k, v in headers.items())
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        if parts is None:
+            writer.write(head + body)
+        else:
+            writer.write(head)
+            for part in parts:
+                writer.write(part)
+                await writer.drain()
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        status = int(status_line.split(None, 2)[1])
+        response_headers = {}
+        cookies = []
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            key = key.strip().lower()
+            if key == "set-cookie":
+                cookies.append(value.strip())
+            else:
+                response_headers[key] = value.strip()
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            payload = b"".join(chunks)
+            keep_alive = True
+        elif "content-length" in response_headers:
+            payload = await reader.readexactly(int(response_headers["content-length"]))
+            keep_alive = True
+        else:
+            payload = await reader.read()
+            keep_alive = False
+        if response_headers.get("connection", "").lower() == "close":
+            keep_alive = False
+        return Response(status, response_headers, payload, cookies), keep_alive
+
+    async def close(self):
+        while self._idle:
+            writer = self._idle.pop()[1]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+def collection_requests(collection, names=None):
+    """Flatten a collection into request specs, optionally filtered by name"""
+    specs = []
+    for folder in collection["item"]:
+        for item in folder["item"]:
+            raw = item["request"]["url"]["raw"]
+            base, _, endpoint = raw.partition("/")
+            if names and item["name"] not in names:
+                continue
+            params = request_params(item["request"])
+            specs.append({
+                "key": item["name"] if base != "{{rider_api_base}}" else "rider/" + item["name"],
+                "folder": folder["name"],
+                "name": item["name"],
+                "path": f"{API_BASES.get(base, '')}/{endpoint}",
+                "body": {p["key"]: p["value"] for p in params if p["type"] != "file"},
+                "files": [p["key"] for p in params if p["type"] == "file"],
+            })
+    return specs
+
+
+def encode_body(params):
+    """Encode body params the way Postman sends urlencoded bodies"""
+    return urlencode(params).encode("ascii")
+
+
+def encode_multipart(params, files, boundary=None):
+    """Encode a form-data body as (content_type, parts).
+
+    `files` holds (field, filename, content_type, data) tuples; each `data`
+    is passed through as its own part, so a memoryview of a mapped file is
+    sent without being copied into the body.
+    """
+    boundary = boundary or "----DailyDose" + os.urandom(12).hex()
+    parts = []
+    head = b""
+    for key, value in params.items():
+        head += (f'--{boundary}\r\nContent-Disposition: form-data; name="{key}"\r\n\r\n'
+                 f'{value}\r\n').encode()
+    for field, filename, content_type, data in files:
+        head += (f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+                 f'Content-Type: {content_type}\r\n\r\n').encode()
+        parts.extend((head, data))
+        head = b"\r\n"
+    parts.append(head + f"--{boundary}--\r\n".encode())
+    return f"multipart/form-data; boundary={boundary}", parts
+
+
+class EndpointStats:
+    """Latency histogram and outcome counters for one endpoint"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.http_errors = 0
+        self.api_errors = 0
+        self.failures = 0
+        self.bytes = 0
+
+    @property
+    def count(self):
+        return self.latency.count
+
+    @property
+    def errors(self):
+        return self.http_errors + self.api_errors + self.failures
+
+    def record(self, latency, response):
+        self.latency.record(latency * 1000000)
+        self.bytes += len(response.body)
+        if response.status >= 400:
+            self.http_errors += 1
+        elif response.body[:200].find(b'"error":true') != -1:
+            self.api_errors += 1
+
+    def merge(self, other):
+        self.latency.merge(other.latency)
+        self.http_errors += other.http_errors
+        self.api_errors += other.api_errors
+        self.failures += other.failures
+        self.bytes += other.bytes
+        return self
+
+
+def merge_stats(target, source):
+    """Merge a {key: EndpointStats} mapping into target"""
+    for key, endpoint in source.items():
+        target[key].merge(endpoint)
+    return target
+
+
+async def send_spec(pool, spec, headers=None, auth=None, files=None):
+    """Send one collection request and return (latency_seconds, response).
+
+    `auth` is a (user_id, token) pair from a TokenPool: the token is sent as
+    a Bearer Authorization header and replaces any user_id in the body.
+    `files` are (field, filename, content_type, data) tuples; when given the
+    body goes out as multipart/form-data instead of urlencoded.
+    """
+    all_headers = {"Content-Type": "application/x-www-form-urlencoded", "X-Request-Id": next_request_id()}
+    if headers:
+        all_headers.update(headers)
+    body = spec["body"]
+    if auth is not None:
+        all_headers["Authorization"] = "Bearer " + auth[1]
+        if "user_id" in body:
+            body = dict(body, user_id=auth[0])
+    if files:
+        all_headers["Content-Type"], payload = encode_multipart(body, files)
+    else:
+        payload = encode_body(body)
+    started = time.perf_counter()
+    response = await pool.request("POST", spec["path"], payload, all_headers)
+    return time.perf_counter() - started, response
+
+
+async def run_closed_loop(pool, specs, concurrency, total=None, duration=None, headers=None, stats=None,
+                          tokens=None, first_user=0):
+    """Drive `concurrency` workers round-robin over specs until total or duration is reached.
+
+    With a TokenPool, worker n acts as virtual user first_user + n.
+    """
+    stats = defaultdict(EndpointStats) if stats is None else stats
+    counter = iter(range(total)) if total else None
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def worker(offset):
+        i = offset
+        auth = tokens.user(first_user + offset) if tokens else None
+        while True:
+            if counter is not None and next(counter, None) is None:
+                return
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            spec = specs[i % len(specs)]
+            i += 1
+            try:
+                latency, response = await send_spec(pool, spec, headers, auth)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                stats[spec["key"]].failures += 1
+                continue
+            stats[spec["key"]].record(latency, response)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return stats, time.perf_counter() - started
+
+
+def load_scenario(path, collection):
+    """Load a traffic-mix scenario and resolve its entries against the collection.
+
+    Each entry names a collection folder and request and carries either a
+    "weight" (its share of the scenario-wide "rate") or its own "rate" in
+    arrivals per second. An optional "body" overrides collection values.
+    """
+    with open(path, encoding="utf-8") as f:
+        scenario = json.load(f)
+    specs = collection_requests(collection)
+    total_weight = sum(e.get("weight", 0) for e in scenario["requests"] if "rate" not in e)
+    entries = []
+    for entry in scenario["requests"]:
+        matches = [s for s in specs if s["name"] == entry["name"]
+                   and entry.get("folder", s["folder"]) == s["folder"]]
+        if not matches:
+            raise ValueError(f"scenario request {entry.get('folder', '*')}/{entry['name']} "
+                             f"is not in the collection")
+        spec = dict(matches[0], body=dict(matches[0]["body"], **entry.get("body", {})))
+        if "rate" in entry:
+            rate = float(entry["rate"])
+        elif total_weight:
+            rate = float(scenario.get("rate", 0)) * entry.get("weight", 0) / total_weight
+        else:
+            rate = 0.0
+        if rate > 0:
+            entries.append((spec, rate))
+    if not entries:
+        raise ValueError(f"scenario {path} has no request with a positive arrival rate")
+    return scenario, entries
+
+
+def poisson_schedule(entries, duration, rng):
+    """Yield (intended_offset, spec) for independent Poisson arrival streams in time order"""
+    heap = [(rng.expovariate(rate), i) for i, (_, rate) in enumerate(entries)]
+    heapq.heapify(heap)
+    while heap:
+        offset, i = heapq.heappop(heap)
+        if offset >= duration:
+            continue
+        spec, rate = entries[i]
+        yield offset, spec
+        heapq.heappush(heap, (offset + rng.expovariate(rate), i))
+
+
+async def run_open_loop(pool, entries, duration, headers=None, seed=None, stats=None, tokens=None):
+    """Issue requests at Poisson arrival times regardless of outstanding responses.
+
+    Latency is measured from the intended send time, so time spent queued
+    behind slow responses (or behind a late scheduler) is counted instead of
+    being hidden by coordinated omission.
+    """
+    stats = defaultdict(EndpointStats) if stats is None else stats
+    rng = random.Random(seed)
+    loop = asyncio.get_running_loop()
+    lag = {"max": 0.0}
+    tasks = set()
+
+    async def fire(spec, intended, auth):
+        try:
+            _, response = await send_spec(pool, spec, headers, auth)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            stats[spec["key"]].failures += 1
+            return
+        stats[spec["key"]].record(time.perf_counter() - intended, response)
+
+    started = time.perf_counter()
+    for offset, spec in poisson_schedule(entries, duration, rng):
+        intended = started + offset
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        lag["max"] = max(lag["max"], time.perf_counter() - intended)
+        task = loop.create_task(fire(spec, intended, tokens.next_user() if tokens else None))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+    return stats, time.perf_counter() - started, lag["max"]
+
+
+def print_report(stats, elapsed):
+    """Print per-endpoint throughput and latency percentiles"""
+    print(f"{'endpoint':<34}{'count':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, s in sorted(stats.items(), key=lambda kv: -kv[1].count):
+        h = s.latency
+        print(f"{name:<34}{s.count:>8}{s.count / elapsed:>10.1f}"
+              f"{h.percentile(50) / 1000:>10.2f}{h.percentile(95) / 1000:>10.2f}"
+              f"{h.percentile(99) / 1000:>10.2f}{s.errors:>8}")
+    total = sum(s.count for s in stats.values())
+    print(f"📊 {total} responses in {elapsed:.2f}s ({total / elapsed:.1f} req/s)")
+
+
+async def serve_stand_in(host="127.0.0.1", port=0):
+    """Start a minimal keep-alive server answering every POST with an empty success envelope"""
+    payload = json.dumps({"error": False, "message": "ok", "data": []}).encode()
+    head = (f"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n").encode()
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                length = 0
+                line = await reader.readline()
+                if not line:
+                    break
+                while line not in (b"\r\n", b"\n", b""):
+                    if line[:15].lower() == b"content-length:":
+                        length = int(line[15:])
+                    line = await reader.readline()
+                await reader.readexactly(length)
+                writer.write(head + payload)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+async def _against_target(base_url, pool_size, stand_in, run):
+    server = None
+    if stand_in:
+        server = await serve_stand_in()
+        base_url = "http://127.0.0.1:%d" % server.sockets[0].getsockname()[1]
+    pool = ConnectionPool(base_url, size=pool_size)
+    try:
+        result = await run(pool)
+    finally:
+        await pool.close()
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+    return result, pool.opened
+
+
+def loadtest(collection, base_url, concurrency=10, total=None, duration=None, names=None,
+             headers=None, stand_in=False, tokens=None):
+    """Replay collection requests against base_url and return (stats, elapsed, connections)"""
+    specs = collection_requests(collection, names)
+    if not specs:
+        raise ValueError("no requests in the collection match the selection")
+    if total is None and duration is None:
+        total = len(specs)
+    (stats, elapsed), opened = asyncio.run(_against_target(
+        base_url, concurrency, stand_in,
+        lambda pool: run_closed_loop(pool, specs, concurrency, total, duration, headers, tokens=tokens)))
+    return stats, elapsed, opened
+
+
+def open_loop_test(collection, scenario_path, base_url, pool_size=100, duration=None, headers=None,
+                   seed=None, stand_in=False, tokens=None):
+    """Run a scenario file open-loop and return (stats, elapsed, max_lag, connections)"""
+    scenario, entries = load_scenario(scenario_path, collection)
+    duration = duration or float(scenario.get("duration", 60))
+    (stats, elapsed, max_lag), opened = asyncio.run(_against_target(
+        base_url, pool_size, stand_in,
+        lambda pool: run_open_loop(pool, entries, duration, headers, seed, tokens=tokens)))
+    return stats, elapsed, max_lag, opened
+
+
+def _drain(stats):
+    snapshot = dict(stats)
+    stats.clear()
+    return snapshot
+
+
+async def _run_shard(index, job, results):
+    stats = defaultdict(EndpointStats)
+    pool = ConnectionPool(job["base_url"], size=job["pool_size"])
+
+    async def reporter():
+        seq = 0
+        while True:
+            await asyncio.sleep(job["interval"])
+            results.put(("tick", index, _drain(stats), seq))
+            seq += 1
+
+    ticker = asyncio.get_running_loop().create_task(reporter())
+    max_lag = 0.0
+    try:
+        if job["entries"]:
+            seed = None if job["seed"] is None else job["seed"] + index
+            tokens = job["tokens"]
+            if tokens:
+                tokens._next = index * len(tokens.user_ids) // job["processes"]
+            _, elapsed, max_lag = await run_open_loop(pool, job["entries"], job["duration"],
+                                                      job["headers"], seed, stats, tokens)
+        else:
+            _, elapsed = await run_closed_loop(pool, job["specs"], job["concurrency"], job["total"],
+                                               job["duration"], job["headers"], stats,
+                                               job["tokens"], job["first_user"])
+    finally:
+        ticker.cancel()
+        await pool.close()
+    results.put(("done", index, _drain(stats), elapsed, max_lag, pool.opened))
+
+
+def _shard_main(index, job, results):
+    """Worker process entry point: run one shard of virtual users"""
+    asyncio.run(_run_shard(index, job, results))
+
+
+def _stand_in_main(ports):
+    async def serve():
+        server = await serve_stand_in()
+        ports.put(server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+def _split(value, parts, index):
+    return value // parts + (1 if index < value % parts else 0)
+
+
+def distributed_test(base_url, processes, specs=None, entries=None, concurrency=10, total=None,
+                     duration=None, headers=None, seed=None, interval=5.0, stand_in=False,
+                     on_interval=None, tokens=None):
+    """Shard virtual users across worker processes and merge their histograms.
+
+    Closed-loop runs split concurrency and the request budget across shards;
+    open-loop runs split every arrival rate, which keeps the aggregate
+    Poisson process unchanged. Workers send per-endpoint histogram deltas
+    every `interval` seconds and once more when they finish, so no raw
+    samples cross process boundaries. `on_interval(stats, interval)` is
+    called with each merged window once all running workers reported it. Returns (stats, elapsed, max_lag,
+    connections).
+    """
+    ctx = multiprocessing.get_context()
+    server = None
+    if stand_in:
+        ports = ctx.Queue()
+        server = ctx.Process(target=_stand_in_main, args=(ports,), daemon=True)
+        server.start()
+        base_url = "http://127.0.0.1:%d" % ports.get()
+
+    results = ctx.Queue()
+    workers = []
+    for index in range(processes):
+        job = {"base_url": base_url, "headers": headers, "seed": seed, "interval": interval,
+               "duration": duration, "specs": specs, "entries": None, "total": None,
+               "tokens": tokens, "processes": processes,
+               "first_user": sum(_split(concurrency, processes, i) for i in range(index))}
+        if entries:
+            job["entries"] = [(spec, rate / processes) for spec, rate in entries]
+            job["pool_size"] = max(1, _split(concurrency, processes, index))
+        else:
+            job["concurrency"] = job["pool_size"] = _split(concurrency, processes, index)
+            job["total"] = _split(total, processes, index) if total else None
+            if job["concurrency"] == 0 or job["total"] == 0:
+                continue
+        worker = ctx.Process(target=_shard_main, args=(index, job, results), daemon=True)
+        worker.start()
+        workers.append(worker)
+
+    totals = defaultdict(EndpointStats)
+    windows = {}
+    emitted = 0
+    elapsed = max_lag = 0.0
+    opened = 0
+    finished = set()
+    try:
+        while len(finished) < len(workers):
+            try:
+                message = results.get(timeout=1.0)
+            except queue.Empty:
+                if not any(w.is_alive() for w in workers):
+                    raise RuntimeError("load worker exited without reporting")
+                continue
+            merge_stats(totals, message[2])
+            if message[0] == "tick":
+                window = windows.setdefault(message[3], [defaultdict(EndpointStats), set()])
+                merge_stats(window[0], message[2])
+                window[1].add(message[1])
+            else:
+                finished.add(message[1])
+                elapsed = max(elapsed, message[3])
+                max_lag = max(max_lag, message[4])
+                opened += message[5]
+            # a window is complete once every worker has either reported it or finished;
+            # a worker can report a window and then finish, so count each one once
+            while emitted in windows and len(windows[emitted][1] | finished) >= len(workers):
+                window_stats = windows.pop(emitted)[0]
+                if on_interval:
+                    on_interval(window_stats, interval)
+                emitted += 1
+    finally:
+        for worker in workers:
+            worker.join(timeout=5)
+        if server is not None:
+            server.terminate()
+    return totals, elapsed, max_lag, opened
+
+
+def print_interval(stats, interval):
+    """Print a one-line-per-endpoint summary of the last reporting window"""
+    print(f"── last {interval:.0f}s ──")
+    print_report(stats, interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay the DailyDose collection as load")
+    parser.add_argument("--base-url", default="http://localhost:9000")
+    parser.add_argument("--concurrency", type=int, default=10,
+                        help="closed-loop workers, or the connection pool size with --scenario")
+    parser.add_argument("--scenario", help="open-loop scenario file with weighted arrival rates")
+    parser.add_argument("--seed", type=int, help="random seed for Poisson arrivals")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes to shard virtual users across")
+    parser.add_argument("--report-interval", type=float, default=5.0,
+                        help="seconds between merged interval reports with --processes")
+    parser.add_argument("--requests", type=int, help="total requests to send")
+    parser.add_argument("--duration", type=float, help="seconds to run instead of a request count")
+    parser.add_argument("--only", nargs="*", help="request names to include, e.g. get_products place_order")
+    parser.add_argument("--from-controllers", action="store_true",
+                        help="build the collection from the Api.php set_rules() calls")
+    parser.add_argument("--tokens", help="token pool cache from token_pool.py; sends Bearer tokens per virtual user")
+    parser.add_argument("--stand-in", action="store_true",
+                        help="target a built-in localhost stand-in instead of --base-url")
+    parser.add_argument("--run-id", help="prefix for X-Request-Id headers (default: random)")
+    parser.add_argument("--store", nargs="?", const=STORE_FILE,
+                        help=f"save the run for bench_store.py compare (default file: {STORE_FILE})")
+    parser.add_argument("--label", help="scenario label in the store (default: scenario file name or 'collection')")
+    args = parser.parse_args()
+    RUN_ID = os.environ["LOAD_TEST_RUN_ID"] = args.run_id or RUN_ID
+
+    collection = create_collection_from_controllers() if args.from_controllers else create_postman_collection()
+    tokens = TokenPool.load(args.tokens) if args.tokens else None
+    print(f"🏷️  Run id: {RUN_ID}")
+    if args.processes > 1:
+        entries = load_scenario(args.scenario, collection)[1] if args.scenario else None
+        specs = None if args.scenario else collection_requests(collection, set(args.only or ()))
+        duration = args.duration
+        if args.scenario and duration is None:
+            with open(args.scenario, encoding="utf-8") as f:
+                duration = float(json.load(f).get("duration", 60))
+        total = args.requests if args.requests or duration else len(specs)
+        stats, elapsed, max_lag, opened = distributed_test(
+            args.base_url, args.processes, specs, entries, args.concurrency, total, duration,
+            seed=args.seed, interval=args.report_interval, stand_in=args.stand_in,
+            on_interval=print_interval, tokens=tokens)
+        print("── total ──")
+    elif args.scenario:
+        stats, elapsed, max_lag, opened = open_loop_test(collection, args.scenario, args.base_url,
+                                                         args.concurrency, args.duration,
+                                                         seed=args.seed, stand_in=args.stand_in,
+                                                         tokens=tokens)
+    else:
+        stats, elapsed, opened = loadtest(collection, args.base_url, args.concurrency, args.requests,
+                                          args.duration, set(args.only or ()), stand_in=args.stand_in,
+                                          tokens=tokens)
+    print_report(stats, elapsed)
+    if args.scenario:
+        print(f"⏱️  Max scheduling lag: {max_lag * 1000:.2f} ms")
+    print(f"🔌 Connections opened: {opened}")
+    if args.store:
+        label = args.label or (os.path.splitext(os.path.basename(args.scenario))[0] if args.scenario else "collection")
+        run = save_run(stats, elapsed, label, "load_test", args.store)
+        print(f"💾 Stored as run #{run} ({label}) in {args.store}")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Parallel Apache access-log analyzer: per API method counts, status mix, bytes and %D latency percentiles
+
+Expects the common or combined log format with the request time in microseconds
+appended, e.g.  LogFormat "%h %l %u %t \"%r\" %>s %b \"%{Referer}i\" \"%{User-Agent}i\" %D" timed
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import time
+from multiprocessing import Pool
+
+from generate_postman_collection import create_postman_collection
+from latency_histogram import LatencyHistogram
+from load_test import collection_requests
+
+CHUNK_SIZE = 64 * 1024 * 1024
+UNDOCUMENTED = "Undocumented"
+
+# matched directly against the mmap, so lines that are not API calls are never decoded
+LINE_RE = re.compile(
+    rb'^\S+ \S+ \S+ \[[^\]]*\] "[A-Z]+ [^ "]*?/(rider/)?app/v1/api/(\w+)[^ "]* ?[^"]*" (\d{3}) (\d+|-)'
+    rb'(?: "(?:[^"\\]|\\.)*" "(?:[^"\\]|\\.)*")?(?: (\d+))?[ \t]*\r?$', re.M)
+
+
+class MethodStats:
+    """Aggregated log lines of one API method; merges across chunks"""
+
+    __slots__ = ("count", "statuses", "bytes", "latency")
+
+    def __init__(self):
+        self.count = 0
+        self.statuses = {}
+        self.bytes = 0
+        self.latency = LatencyHistogram()
+
+    def merge(self, other):
+        self.count += other.count
+        for status, n in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + n
+        self.bytes += other.bytes
+        self.latency.merge(other.latency)
+
+    def __getstate__(self):
+        return self.count, self.statuses, self.bytes, self.latency
+
+    def __setstate__(self, state):
+        self.count, self.statuses, self.bytes, self.latency = state
+
+
+def line_aligned_chunks(path, chunk_size=CHUNK_SIZE):
+    """Split a file into (start, end) byte ranges that each end on a newline"""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    chunks = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = mm.find(b"\n", min(start + chunk_size, size) - 1)
+            end = size if end == -1 else end + 1
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+
+def analyze_chunk(path, start, end):
+    """Parse one line-aligned byte range; return (lines, {method_key: MethodStats})"""
+    stats = {}
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines = mm[start:end].count(b"\n") + (mm[end - 1:end] != b"\n")
+        for rider, method, status, size, micros in LINE_RE.findall(mm, start, end):
+            key = ("rider/" if rider else "") + method.decode("ascii")
+            s = stats.get(key)
+            if s is None:
+                s = stats[key] = MethodStats()
+            s.count += 1
+            status = status.decode("ascii")
+            s.statuses[status] = s.statuses.get(status, 0) + 1
+            if size != b"-":
+                s.bytes += int(size)
+            if micros:
+                s.latency.record(int(micros))
+    return lines, stats
+
+
+def analyze_log(path, processes=None, chunk_size=CHUNK_SIZE):
+    """Analyze a log with a process pool; return (total_lines, {method_key: MethodStats})"""
+    chunks = line_aligned_chunks(path, chunk_size)
+    total_lines = 0
+    merged = {}
+    with Pool(processes or os.cpu_count()) as pool:
+        for lines, stats in pool.starmap(analyze_chunk, [(path, start, end) for start, end in chunks]):
+            total_lines += lines
+            for key, s in stats.items():
+                if key in merged:
+                    merged[key].merge(s)
+                else:
+                    merged[key] = s
+    return total_lines, merged
+
+
+def folder_names(collection):
+    """Map method keys ('get_products', 'rider/login') to their collection folder names"""
+    return {spec["key"]: spec["folder"] for spec in collection_requests(collection)}
+
+
+def status_mix(statuses):
+    classes = {}
+    for status, n in statuses.items():
+        classes[status[0] + "xx"] = classes.get(status[0] + "xx", 0) + n
+    return classes
+
+
+def report_rows(stats, folders):
+    """Yield one dict per method, sorted by folder then request count"""
+    rows = []
+    for key, s in stats.items():
+        h = s.latency
+        rows.append({
+            "method": key,
+            "folder": folders.get(key, UNDOCUMENTED),
+            "count": s.count,
+            "statuses": dict(sorted(s.statuses.items())),
+            "bytes": s.bytes,
+            "timed": h.count,
+            "p50_ms": h.percentile(50) / 1000 if h.count else None,
+            "p95_ms": h.percentile(95) / 1000 if h.count else None,
+            "p99_ms": h.percentile(99) / 1000 if h.count else None,
+            "max_ms": h.max / 1000 if h.count else None,
+        })
+    order = {name: i for i, name in enumerate(dict.fromkeys(folders.values()))}
+    rows.sort(key=lambda r: (order.get(r["folder"], len(order)), -r["count"]))
+    return rows
+
+
+def _ms(value):
+    return f"{value:>10.1f}" if value is not None else f"{'-':>10}"
+
+
+def print_log_report(rows):
+    print(f"{'method':<36}{'count':>10}{'2xx':>8}{'4xx':>7}{'5xx':>7}{'avg KB':>9}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    folder = None
+    for row in rows:
+        if row["folder"] != folder:
+            folder = row["folder"]
+            print(f"📁 {folder}")
+        mix = status_mix(row["statuses"])
+        print(f"  {row['method']:<34}{row['count']:>10}{mix.get('2xx', 0):>8}{mix.get('4xx', 0):>7}"
+              f"{mix.get('5xx', 0):>7}{row['bytes'] / row['count'] / 1024:>9.1f}"
+              f"{_ms(row['p50_ms'])}{_ms(row['p95_ms'])}{_ms(row['p99_ms'])}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize an Apache access log per API method")
+    parser.add_argument("log", help="access log written with %%D appended to the combined format")
+    parser.add_argument("--processes", type=int, help="parser processes (default: all CPUs)")
+    parser.add_argument("--chunk-mb", type=int, default=CHUNK_SIZE // (1024 * 1024),
+                        help="size of the line-aligned chunks handed to each process")
+    parser.add_argument("--json", help="write the per-method report to this file")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    total_lines, stats = analyze_log(args.log, args.processes, args.chunk_mb * 1024 * 1024)
+    elapsed = time.perf_counter() - started
+    rows = report_rows(stats, folder_names(create_postman_collection()))
+
+    print_log_report(rows)
+    matched = sum(r["count"] for r in rows)
+    size_mb = os.path.getsize(args.log) / (1024 * 1024)
+    print(f"📊 {matched} API requests out of {total_lines} lines")
+    print(f"⏱️  {size_mb:.1f} MB parsed in {elapsed:.2f}s ({size_mb / max(elapsed, 1e-9):.1f} MB/s)")
+    if not any(r["timed"] for r in rows) and rows:
+        print("⚠️  No %D field found; latency percentiles need %D at the end of the LogFormat")
+    undocumented = [r["method"] for r in rows if r["folder"] == UNDOCUMENTED]
+    if undocumented:
+        print(f"📝 Not in the collection: {', '.join(undocumented)}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"lines": total_lines, "methods": rows}, f, indent=2)
+        print(f"📁 File: {args.json}")
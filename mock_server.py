@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Local asyncio mock of the DailyDose API surface for client-side benchmarking
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import multiprocessing
+import os
+import socket
+
+from generate_postman_collection import create_collection_from_controllers, create_postman_collection
+
+PREFIXES = {
+    "{{user_api_base}}": "/app/v1/api/",
+    "{{rider_api_base}}": "/rider/app/v1/api/",
+}
+DEFAULT_ROWS = 10
+IMAGE_BASE = "http://localhost:9000/uploads/media/2024/"
+
+
+def product_row(i):
+    """Shape of one fetch_product() row"""
+    return {
+        "id": str(i), "category_id": str(i % 12 + 1), "name": f"Product {i}", "slug": f"product-{i}",
+        "short_description": "Freshly prepared with seasonal ingredients", "indicator": "1",
+        "image": f"{IMAGE_BASE}product-{i}.jpg", "relative_path": f"uploads/media/2024/product-{i}.jpg",
+        "other_images": [], "rating": "4.20", "no_of_ratings": "17", "status": "1", "availability": "1",
+        "stock_type": "", "stock": "", "calories": "350", "total_allowed_quantity": "10",
+        "minimum_order_quantity": "1", "is_prices_inclusive_tax": "0", "tax_percentage": "5",
+        "category_name": "Burgers", "category_slug": "burgers", "highlights": ["spicy", "bestseller"],
+        "tags": ["burger", "combo"], "is_branch_open": "1", "best_seller": "0", "review_images": [],
+        "min_max_price": {"min_price": 120, "max_price": 180, "special_price": 110,
+                          "max_special_price": 170, "discount_in_percentage": 8},
+        "attributes": [{"ids": "1,2", "value": "Regular,Large", "attr_name": "Size", "name": "Size"}],
+        "variants": [
+            {"id": str(i * 2 + k), "product_id": str(i), "attribute_value_ids": str(k + 1),
+             "price": str(120 + 60 * k), "special_price": str(110 + 60 * k), "availability": "1",
+             "stock": "", "variant_values": ["Regular", "Large"][k], "attr_name": "Size",
+             "cart_count": "0", "add_ons_data": []}
+            for k in range(2)
+        ],
+        "product_add_ons": [
+            {"id": str(i * 3 + k), "product_id": str(i), "title": f"Extra {k}",
+             "description": "", "price": "20", "calories": "40", "status": "1"}
+            for k in range(3)
+        ],
+    }
+
+
+def category_row(i):
+    return {"id": str(i), "name": f"Category {i}", "slug": f"category-{i}", "image": f"{IMAGE_BASE}category-{i}.png",
+            "banner": "", "row_order": str(i), "status": "1", "branch_id": "1", "children": [], "total": "0"}
+
+
+def order_row(i):
+    return {
+        "id": str(i), "user_id": "1", "address_id": "1", "mobile": "9874565478", "total": "240",
+        "delivery_charge": "20", "tax_amount": "12", "final_total": "272", "promo_code": "",
+        "promo_discount": "0", "payment_method": "COD", "active_status": "pending",
+        "latitude": "23.24", "longitude": "69.66", "address": "#123, Time Square, Bhuj",
+        "date_added": "2024-01-01 12:00:00", "otp": "1234", "rider_id": "0", "branch_id": "1",
+        "status": [["pending", "01-01-2024 12:00:00pm"]],
+        "order_items": [
+            {"id": str(i * 2 + k), "order_id": str(i), "product_variant_id": str(k + 1), "name": f"Product {k}",
+             "variant_name": "Regular", "quantity": "1", "price": "120", "sub_total": "120",
+             "image": f"{IMAGE_BASE}product-{k}.jpg", "add_ons": []}
+            for k in range(2)
+        ],
+    }
+
+
+def cart_row(i):
+    return {"id": str(i), "user_id": "1", "product_variant_id": str(i), "qty": "1", "is_saved_for_later": "0",
+            "name": f"Product {i}", "image": f"{IMAGE_BASE}product-{i}.jpg", "price": "120",
+            "special_price": "110", "product_details": [product_row(i)], "product_add_ons": []}
+
+
+def generic_row(i):
+    return {"id": str(i), "name": f"Item {i}", "status": "1", "date_created": "2024-01-01 12:00:00"}
+
+
+def settings_data(padding=0):
+    """Shape of get_settings: one object holding every settings group"""
+    return {
+        "logo": [f"{IMAGE_BASE}logo.png"],
+        "system_settings": [{"app_name": "DailyDose", "support_number": "9876543210",
+                             "currency": "₹", "tax": "1", "is_rider_otp_setting_on": "1"}],
+        "currency": ["₹"],
+        "privacy_policy": ["<p>Privacy policy</p>" + "x" * (padding // 3)],
+        "terms_conditions": ["<p>Terms and conditions</p>" + "x" * (padding // 3)],
+        "about_us": ["<p>About us</p>" + "x" * (padding - 2 * (padding // 3))],
+        "contact_us": ["<p>Contact us</p>"],
+        "payment_method": [{"cod_method": "1", "paypal_payment_method": "1", "razorpay_payment_method": "1"}],
+        "time_slot_config": [{"is_time_slots_enabled": "1", "delivery_starts_from": "1", "allowed_days": "7"}],
+        "user_data": [],
+        "popular_categories": [category_row(i) for i in range(1, 6)],
+    }
+
+
+ROW_BUILDERS = [
+    ("get_products", product_row), ("get_offline_products", product_row), ("get_favorites", product_row),
+    ("get_sections", lambda i: {"id": str(i), "title": f"Section {i}", "short_description": "",
+                                "style": "style_1", "product_ids": "1,2,3", "row_order": str(i),
+                                "product_type": "custom_foods", "product_details": [product_row(i * 10 + k)
+                                                                                    for k in range(4)]}),
+    ("get_categories", category_row), ("get_orders", order_row), ("get_pending_orders", order_row),
+    ("get_user_cart", cart_row),
+]
+
+
+def _encode(envelope):
+    """Encode compactly, as PHP's json_encode() does"""
+    return json.dumps(envelope, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def build_body(name, rows=DEFAULT_ROWS, size=None):
+    """Build the canned JSON response body for an endpoint, padded up to `size` bytes"""
+    envelope = {"error": False, "message": f"{name.replace('_', ' ').capitalize()} retrieved successfully !"}
+    if name == "get_settings":
+        envelope["data"] = settings_data()
+        body = _encode(envelope)
+        if size and len(body) < size:
+            envelope["data"] = settings_data(size - len(body))
+        return _encode(envelope)
+    if name == "login":
+        envelope.update(token="eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9.mock.mock",
+                        data={"id": "1", "username": "John Doe", "mobile": "9874565478", "balance": "0"})
+        return _encode(envelope)
+    if name == "place_order":
+        envelope.update(message="Order Placed Successfully", order_id=1001,
+                        order_item_data=[{"product_variant_id": "1", "quantity": "1"}], balance=[{"balance": "0"}])
+        return _encode(envelope)
+    if name == "get_user_cart":
+        envelope.update(total_quantity="2", sub_total="240", tax_percentage="5", tax_amount="12",
+                        overall_amount="252", total_arr=252, variant_id=["1", "2"])
+
+    builder = next((b for n, b in ROW_BUILDERS if n == name), generic_row)
+    data = [builder(i) for i in range(1, rows + 1)]
+    envelope["total"] = str(rows)
+    envelope["data"] = data
+    body = _encode(envelope)
+    if size and len(body) < size and data:
+        per_row = max(1, (len(body) - 60) // len(data))
+        extra = (size - len(body)) // per_row + 1
+        data.extend(builder(i) for i in range(rows + 1, rows + 1 + extra))
+        envelope["total"] = str(len(data))
+        body = _encode(envelope)
+    return body
+
+
+def http_response(body, status="200 OK"):
+    head = (f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+def build_routes(collection, rows=None, sizes=None):
+    """Map every collection URL path to a precomputed HTTP response"""
+    rows = rows or {}
+    sizes = sizes or {}
+    routes = {}
+    for folder in collection["item"]:
+        for item in folder["item"]:
+            base, _, endpoint = item["request"]["url"]["raw"].partition("/")
+            name = item["name"]
+            body = build_body(name, rows.get(name, DEFAULT_ROWS), sizes.get(name))
+            routes[(PREFIXES[base] + endpoint).encode()] = http_response(body)
+    return routes
+
+
+NOT_FOUND = http_response(_encode({"error": True, "message": "Route not found", "data": []}),
+                          "404 Not Found")
+
+
+class MockProtocol(asyncio.Protocol):
+    """Pipelining-safe HTTP/1.1 handler that answers from the route table
+
+    Responses are queued in request order, so a delayed one holds back the
+    responses pipelined behind it instead of being overtaken by them.
+    """
+
+    def __init__(self, routes, delays):
+        self.routes = routes
+        self.delays = delays
+        self.buffer = b""
+        self.pending = collections.deque()
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        buffer = self.buffer + data
+        while True:
+            end = buffer.find(b"\r\n\r\n")
+            if end == -1:
+                break
+            head = buffer[:end]
+            lines = head.split(b"\r\n")
+            length = 0
+            for line in lines[1:]:
+                if line[:15].lower() == b"content-length:":
+                    length = int(line[15:])
+                    break
+            if len(buffer) < end + 4 + length:
+                break
+            path = lines[0].split(b" ", 2)[1].split(b"?", 1)[0].rstrip(b"/")
+            buffer = buffer[end + 4 + length:]
+            response = self.routes.get(path, NOT_FOUND)
+            delay = self.delays.get(path)
+            if delay:
+                slot = [None]
+                asyncio.get_running_loop().call_later(delay, self._ready, slot, response)
+            else:
+                slot = [response]
+            self.pending.append(slot)
+        self.buffer = buffer
+        self._flush()
+
+    def _ready(self, slot, response):
+        slot[0] = response
+        self._flush()
+
+    def _flush(self):
+        """Write every response at the head of the queue that is ready"""
+        ready = []
+        while self.pending and self.pending[0][0] is not None:
+            ready.append(self.pending.popleft()[0])
+        if ready and not self.transport.is_closing():
+            self.transport.write(b"".join(ready))
+
+
+def _listen(host, port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(4096)
+    sock.setblocking(False)
+    return sock
+
+
+async def serve(routes, host="127.0.0.1", port=9000, delays=None, sock=None):
+    """Start the mock server on a new or inherited listening socket"""
+    loop = asyncio.get_running_loop()
+    return await loop.create_server(lambda: MockProtocol(routes, delays or {}), sock=sock or _listen(host, port))
+
+
+def _worker_main(routes, host, port, delays):
+    async def run():
+        server = await serve(routes, host, port, delays)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+def parse_overrides(pairs, cast):
+    """Parse NAME=VALUE command-line overrides"""
+    result = {}
+    for pair in pairs or ():
+        name, _, value = pair.partition("=")
+        result[name] = cast(value)
+    return result
+
+
+def load_payload_config(path):
+    """Read {"endpoint": {"rows": N, "size": BYTES, "delay_ms": MS}} overrides"""
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    rows = {name: c["rows"] for name, c in config.items() if "rows" in c}
+    sizes = {name: c["size"] for name, c in config.items() if "size" in c}
+    delays = {name: c["delay_ms"] / 1000.0 for name, c in config.items() if "delay_ms" in c}
+    return rows, sizes, delays
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve canned DailyDose API responses")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processes sharing the port via SO_REUSEPORT")
+    parser.add_argument("--config", help="JSON file of per-endpoint rows/size/delay_ms overrides")
+    parser.add_argument("--rows", nargs="*", help="rows per list endpoint, e.g. get_sections=50")
+    parser.add_argument("--size", nargs="*", help="minimum body bytes, e.g. get_settings=500000")
+    parser.add_argument("--delay", nargs="*", help="server-side delay in ms, e.g. place_order=80")
+    parser.add_argument("--from-controllers", action="store_true",
+                        help="serve every public Api.php method instead of the documented collection")
+    args = parser.parse_args()
+
+    rows, sizes, delays = load_payload_config(args.config) if args.config else ({}, {}, {})
+    rows.update(parse_overrides(args.rows, int))
+    sizes.update(parse_overrides(args.size, int))
+    delays.update({k: v / 1000.0 for k, v in parse_overrides(args.delay, float).items()})
+
+    collection = create_collection_from_controllers() if args.from_controllers else create_postman_collection()
+    routes = build_routes(collection, rows, sizes)
+    path_delays = {path: delays[path.rsplit(b"/", 1)[1].decode()] for path in routes
+                   if path.rsplit(b"/", 1)[1].decode() in delays}
+
+    print(f"✅ Mock API serving {len(routes)} routes on http://{args.host}:{args.port}")
+    print(f"⚙️  Workers: {args.workers}")
+    for name in sorted(set(sizes) | set(rows)):
+        body = build_body(name, rows.get(name, DEFAULT_ROWS), sizes.get(name))
+        print(f"📦 {name}: {len(body)} bytes")
+
+    workers = [multiprocessing.Process(target=_worker_main, args=(routes, args.host, args.port, path_delays))
+               for _ in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Run the end-to-end order pipeline as concurrent virtual users and report orders/s and per-stage latency
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from bench_store import STORE_FILE, save_run
+from generate_postman_collection import create_collection_from_controllers, create_postman_collection
+from latency_histogram import LatencyHistogram
+from load_test import EndpointStats, _against_target, collection_requests, send_spec
+from token_pool import TokenPool
+
+SCENARIO_FILE = "scenarios/order_pipeline.json"
+
+
+class StepError(Exception):
+    """A pipeline step that cannot continue: failed request, error envelope, or missing value"""
+
+
+def load_pipeline(path, collection):
+    """Load a pipeline scenario and resolve each step against the collection.
+
+    Steps run in order for every iteration of a virtual user. A step's "body"
+    is merged over the collection body (null removes a param) and may refer
+    to earlier values as "{name}"; "extract" maps names to dotted paths into
+    the response ("*" picks a random list element). "once" steps run on the
+    first iteration only, "unless" skips a step when that value is already
+    known, "auth" names the value sent as the Bearer token, "think" is a
+    [min, max] pause in seconds after the step, and "allow_error" keeps the
+    pipeline going when the API answers with an error envelope.
+    """
+    with open(path, encoding="utf-8") as f:
+        scenario = json.load(f)
+    specs = collection_requests(collection)
+    steps = []
+    for entry in scenario["steps"]:
+        matches = [s for s in specs if s["name"] == entry["name"]
+                   and entry.get("folder", s["folder"]) == s["folder"]]
+        if not matches:
+            raise ValueError(f"pipeline step {entry.get('folder', '*')}/{entry['name']} is not in the collection")
+        body = dict(matches[0]["body"], **entry.get("body", {}))
+        steps.append(dict(entry, spec=dict(matches[0], body={k: v for k, v in body.items() if v is not None})))
+    if not steps:
+        raise ValueError(f"pipeline {path} has no steps")
+    return scenario, steps
+
+
+def extract(value, path, rng):
+    """Follow a dotted path ("data.*.variants.0.id") into decoded JSON and return the scalar as a string"""
+    for part in path.split("."):
+        if part == "*":
+            if not isinstance(value, list) or not value:
+                raise StepError(f"{path}: no list to pick from")
+            value = rng.choice(value)
+        elif isinstance(value, list):
+            try:
+                value = value[int(part)]
+            except (ValueError, IndexError):
+                raise StepError(f"{path}: no element {part}") from None
+        elif isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            raise StepError(f"{path}: no key {part}")
+    if value is None or isinstance(value, (dict, list)):
+        raise StepError(f"{path}: not a scalar")
+    return str(value)
+
+
+def render(body, values):
+    try:
+        return {k: v.format_map(values) if isinstance(v, str) and "{" in v else v for k, v in body.items()}
+    except KeyError as e:
+        raise StepError(f"no value for {e.args[0]} yet") from None
+
+
+class PipelineStats:
+    """Per-step latency and outcomes, plus completed orders and their end-to-end times.
+
+    `stalled` counts users whose very first request failed; when that is every
+    user, the target is misconfigured rather than slow.
+    """
+
+    def __init__(self, steps):
+        self.steps = [EndpointStats() for _ in steps]
+        self.aborted = [0] * len(steps)
+        self.skipped = [0] * len(steps)
+        self.completed = 0
+        self.stalled = 0
+        self.pipeline = LatencyHistogram()
+        self.service = LatencyHistogram()
+
+
+async def run_step(pool, step, values, stats, rng):
+    """Send one step, record it, and copy its extracted values into `values`"""
+    auth = None
+    if step.get("auth"):
+        if step["auth"] not in values:
+            raise StepError(f"no {step['auth']} to authenticate with")
+        auth = (values.get("user_id"), values[step["auth"]])
+    spec = dict(step["spec"], body=render(step["spec"]["body"], values))
+    try:
+        latency, response = await send_spec(pool, spec, auth=auth)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+        stats.failures += 1
+        raise StepError(f"request failed: {e!r}") from None
+    stats.record(latency, response)
+    if response.status >= 400:
+        raise StepError(f"HTTP {response.status}")
+    try:
+        envelope = response.json()
+    except ValueError:
+        raise StepError("response is not JSON") from None
+    if isinstance(envelope, dict) and envelope.get("error") is True:
+        if step.get("allow_error"):
+            return latency
+        raise StepError(envelope.get("message") or "error envelope")
+    for name, path in step.get("extract", {}).items():
+        values[name] = extract(envelope, path, rng)
+    return latency
+
+
+async def virtual_user(pool, steps, index, stats, deadline, iterations, seed_values, think_scale, rng, errors):
+    """Loop the pipeline for one user until the deadline or iteration count is reached"""
+    values = dict(seed_values)
+    iteration = 0
+    attempted = False
+    while (iterations is None or iteration < iterations) and time.perf_counter() < deadline:
+        started = time.perf_counter()
+        service = 0.0
+        for i, step in enumerate(steps):
+            if (step.get("once") and iteration) or (step.get("unless") and step["unless"] in values):
+                stats.skipped[i] += 1
+                continue
+            try:
+                service += await run_step(pool, step, values, stats.steps[i], rng)
+            except StepError as e:
+                stats.aborted[i] += 1
+                stats.stalled += not attempted
+                errors.setdefault(f"{step['spec']['key']}: {e}", index)
+                break
+            finally:
+                attempted = True
+            if step.get("think") and think_scale:
+                pause = rng.uniform(*step["think"]) * think_scale
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(pause, remaining))
+        else:
+            stats.completed += 1
+            stats.pipeline.record((time.perf_counter() - started) * 1000000)
+            stats.service.record(service * 1000000)
+        iteration += 1
+
+
+async def run_pipeline(pool, scenario, steps, users, duration=None, iterations=None, think_scale=1.0,
+                       ramp=0.0, tokens=None, seed=None):
+    """Start `users` virtual users (staggered over `ramp` seconds) and return (stats, elapsed, errors)"""
+    stats = PipelineStats(steps)
+    errors = {}
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    deadline = started + duration if duration else float("inf")
+
+    async def user(index):
+        if ramp:
+            await asyncio.sleep(ramp * index / users)
+        values = {k: v.format(user=index) for k, v in scenario.get("vars", {}).items()}
+        if tokens:
+            values["user_id"], values["token"] = (str(v) for v in tokens.user(index))
+        await virtual_user(pool, steps, index, stats, deadline, iterations, values, think_scale,
+                           random.Random(rng.random()), errors)
+
+    await asyncio.gather(*(user(i) for i in range(users)))
+    return stats, time.perf_counter() - started, errors
+
+
+def print_pipeline_report(steps, stats, elapsed):
+    print(f"{'stage':<40}{'count':>7}{'ok/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'errors':>8}{'aborted':>9}")
+    for i, (step, s) in enumerate(zip(steps, stats.steps), 1):
+        h = s.latency
+        label = f"{i}. {step['spec']['key']}"
+        print(f"{label:<40}{s.count:>7}{(s.count - s.errors) / elapsed:>9.2f}"
+              f"{h.percentile(50) / 1000:>10.2f}{h.percentile(95) / 1000:>10.2f}{h.percentile(99) / 1000:>10.2f}"
+              f"{s.errors:>8}{stats.aborted[i - 1]:>9}")
+    print(f"📦 Orders completed: {stats.completed} in {elapsed:.2f}s ({stats.completed / elapsed:.2f} orders/s)")
+    if stats.completed:
+        print(f"⏱️  Pipeline p50 {stats.pipeline.percentile(50) / 1000000:.2f}s · "
+              f"p95 {stats.pipeline.percentile(95) / 1000000:.2f}s with think time; "
+              f"request time p50 {stats.service.percentile(50) / 1000:.2f} ms · "
+              f"p95 {stats.service.percentile(95) / 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drive the login-to-delivery order pipeline with virtual users")
+    parser.add_argument("--scenario", default=SCENARIO_FILE, help="pipeline scenario JSON")
+    parser.add_argument("--base-url", default="http://localhost:9000")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, help="seconds to run (default: until --iterations)")
+    parser.add_argument("--iterations", type=int, help="pipelines per user")
+    parser.add_argument("--think-scale", type=float, default=1.0, help="multiply think times; 0 disables them")
+    parser.add_argument("--ramp", type=float, default=0.0, help="seconds over which users start")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--from-controllers", action="store_true",
+                        help="resolve steps against the collection built from the Api.php set_rules() calls")
+    parser.add_argument("--tokens", help="token pool cache from token_pool.py; users start logged in")
+    parser.add_argument("--stand-in", action="store_true",
+                        help="target a built-in localhost stand-in instead of --base-url")
+    parser.add_argument("--store", nargs="?", const=STORE_FILE,
+                        help=f"save per-stage results for bench_store.py compare (default file: {STORE_FILE})")
+    args = parser.parse_args()
+    if args.duration is None and args.iterations is None:
+        args.iterations = 1
+
+    collection = create_collection_from_controllers() if args.from_controllers else create_postman_collection()
+    scenario, steps = load_pipeline(args.scenario, collection)
+    tokens = TokenPool.load(args.tokens) if args.tokens else None
+    (stats, elapsed, errors), opened = asyncio.run(_against_target(
+        args.base_url, args.users, args.stand_in,
+        lambda pool: run_pipeline(pool, scenario, steps, args.users, args.duration, args.iterations,
+                                  args.think_scale, args.ramp, tokens, args.seed)))
+
+    print(f"🛒 {scenario['name']}: {args.users} users, {len(steps)} steps")
+    if stats.stalled == args.users:
+        print("❌ Every virtual user failed its first step; no pipeline ran. Causes:")
+        for cause in list(errors)[:10]:
+            print(f"   {cause}")
+        sys.exit(1)
+    print_pipeline_report(steps, stats, elapsed)
+    print(f"🔌 Connections opened: {opened}")
+    if errors:
+        print(f"⚠️  {sum(stats.aborted)} pipelines stopped early; first causes:")
+        for cause in list(errors)[:10]:
+            print(f"   {cause}")
+    if args.store:
+        stages = {f"{i}. {step['spec']['key']}": s for i, (step, s) in enumerate(zip(steps, stats.steps), 1)}
+        run = save_run(stages, elapsed, scenario["name"], "order_pipeline", args.store)
+        print(f"💾 Stored as run #{run} ({scenario['name']}) in {args.store}")
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Walk every limit/offset endpoint at increasing offsets and report how latency grows with page depth
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import statistics
+
+from generate_postman_collection import create_collection_from_controllers, create_postman_collection
+from load_test import _against_target, collection_requests, send_spec
+from token_pool import TokenPool
+
+OFFSETS = (0, 100, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+SAMPLES = 5
+# flagged when the deepest page is this many times slower than the first and the fit is linear
+GROWTH_THRESHOLD = 1.5
+MIN_R_SQUARED = 0.8
+BAR_WIDTH = 40
+
+
+def paginated_specs(collection, names=None):
+    """Collection requests that page with both `limit` and `offset` in the body.
+
+    `names` are matched against the spec key, so rider endpoints are picked as
+    rider/<name> and a bare name only selects the customer endpoint.
+    """
+    return [spec for spec in collection_requests(collection)
+            if "limit" in spec["body"] and "offset" in spec["body"] and (not names or spec["key"] in names)]
+
+
+def linear_fit(points):
+    """Least-squares (slope, intercept, r_squared) of [(x, y), ...]"""
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    syy = sum((y - mean_y) ** 2 for _, y in points)
+    if sxx == 0:
+        return 0.0, mean_y, 0.0
+    slope = sxy / sxx
+    r_squared = sxy * sxy / (sxx * syy) if syy else 0.0
+    return slope, mean_y - slope * mean_x, r_squared
+
+
+def page_rows(response):
+    """(rows on the page, reported total or None, id of the last row or None)"""
+    try:
+        envelope = response.json()
+    except ValueError:
+        return 0, None, None
+    if not isinstance(envelope, dict):
+        return 0, None, None
+    data = envelope.get("data")
+    rows = data if isinstance(data, list) else []
+    total = envelope.get("total")
+    try:
+        total = int(total) if total is not None else None
+    except (TypeError, ValueError):
+        total = None
+    last = rows[-1].get("id") if rows and isinstance(rows[-1], dict) else None
+    return len(rows), total, last
+
+
+class DepthProfile:
+    """Median latency per offset for one endpoint, optionally alongside keyset-cursor latency"""
+
+    def __init__(self, key):
+        self.key = key
+        self.offset_ms = {}
+        self.cursor_ms = {}
+        self.errors = 0
+        self.end = None
+
+    def fit(self):
+        return linear_fit(sorted(self.offset_ms.items())) if len(self.offset_ms) >= 3 else (0.0, 0.0, 0.0)
+
+    def growth(self):
+        """Latency of the deepest page measured over the first one"""
+        if len(self.offset_ms) < 2:
+            return 1.0
+        first, deepest = min(self.offset_ms), max(self.offset_ms)
+        return self.offset_ms[deepest] / self.offset_ms[first] if self.offset_ms[first] else 1.0
+
+    def degrades(self, threshold=GROWTH_THRESHOLD):
+        slope, _, r_squared = self.fit()
+        return slope > 0 and r_squared >= MIN_R_SQUARED and self.growth() >= threshold
+
+
+async def timed_page(pool, spec, body, samples, auth, profile):
+    """Median latency in ms over `samples` sequential requests, plus the last page's rows"""
+    latencies = []
+    page = (0, None, None)
+    for _ in range(samples):
+        try:
+            latency, response = await send_spec(pool, dict(spec, body=body), auth=auth)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            profile.errors += 1
+            continue
+        if response.status >= 400:
+            profile.errors += 1
+            continue
+        latencies.append(latency * 1000)
+        page = page_rows(response)
+    return (statistics.median(latencies) if latencies else None), page
+
+
+async def crawl_endpoint(pool, spec, offsets, samples, auth=None, cursor=None):
+    """Measure one endpoint at each offset in order, stopping once pages run past the end.
+
+    With `cursor`, each depth is also fetched keyset-style: the id of the row
+    just before the offset (found with limit=1) is sent as that param instead
+    of the offset, so both columns describe the same page.
+    """
+    profile = DepthProfile(spec["key"])
+    first_rows = 0
+    for offset in offsets:
+        if profile.end is not None and offset >= profile.end:
+            break
+        median, (rows, total, _) = await timed_page(pool, spec, dict(spec["body"], offset=offset), samples,
+                                                    auth, profile)
+        if median is None:
+            continue
+        if total is not None:
+            profile.end = total
+        if offset == offsets[0]:
+            first_rows = rows
+        elif rows == 0 and first_rows:
+            profile.end = offset
+            break
+        profile.offset_ms[offset] = median
+
+        if cursor and offset:
+            try:
+                _, response = await send_spec(pool, dict(spec, body=dict(spec["body"], offset=offset - 1, limit=1)),
+                                              auth=auth)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                profile.errors += 1
+                continue
+            anchor = page_rows(response)[2]
+            if anchor is not None:
+                body = {k: v for k, v in spec["body"].items() if k != "offset"}
+                body[cursor] = anchor
+                median, _ = await timed_page(pool, spec, body, samples, auth, profile)
+                if median is not None:
+                    profile.cursor_ms[offset] = median
+    return profile
+
+
+async def crawl(pool, specs, offsets=OFFSETS, samples=SAMPLES, concurrency=None, tokens=None, cursor=None):
+    """Crawl all endpoints concurrently (at most `concurrency` at once) and return their DepthProfiles"""
+    limit = asyncio.Semaphore(concurrency or len(specs))
+    auth = tokens.user(0) if tokens else None
+
+    async def one(spec):
+        async with limit:
+            return await crawl_endpoint(pool, spec, offsets, samples, auth, cursor)
+
+    return await asyncio.gather(*(one(spec) for spec in specs))
+
+
+def print_profile(profile, threshold=GROWTH_THRESHOLD):
+    if not profile.offset_ms:
+        print(f"\n{profile.key}: no successful pages ({profile.errors} errors)")
+        return
+    slope, _, r_squared = profile.fit()
+    flag = "⚠️  grows with offset" if profile.degrades(threshold) else "✅ flat"
+    print(f"\n{profile.key}: {flag} · {slope * 10000:+.2f} ms per 10k rows skipped · r²={r_squared:.2f} · "
+          f"deepest/first {profile.growth():.1f}x"
+          + (f" · ends at {profile.end}" if profile.end is not None else ""))
+    widest = max(max(profile.offset_ms.values()), max(profile.cursor_ms.values(), default=0)) or 1
+    for offset, ms in sorted(profile.offset_ms.items()):
+        bar = "█" * max(1, round(ms / widest * BAR_WIDTH))
+        line = f"  {offset:>8}  {ms:8.2f} ms  {bar}"
+        if offset in profile.cursor_ms:
+            line += f"  (cursor {profile.cursor_ms[offset]:.2f} ms)"
+        print(line)
+
+
+def write_csv(profiles, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["endpoint", "offset", "offset_ms", "cursor_ms"])
+        for profile in profiles:
+            for offset, ms in sorted(profile.offset_ms.items()):
+                cursor_ms = profile.cursor_ms.get(offset)
+                writer.writerow([profile.key, offset, f"{ms:.3f}", "" if cursor_ms is None else f"{cursor_ms:.3f}"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure latency against page depth for every paginated endpoint")
+    parser.add_argument("names", nargs="*", help="endpoint names to crawl (rider ones as rider/<name>); default all")
+    parser.add_argument("--base-url", default="http://localhost:9000")
+    parser.add_argument("--offsets", type=lambda s: sorted({int(o) for o in s.split(",")}), default=OFFSETS,
+                        help="comma-separated offsets to sample")
+    parser.add_argument("--samples", type=int, default=SAMPLES, help="requests per offset; the median is kept")
+    parser.add_argument("--concurrency", type=int, help="endpoints crawled at once (default: all)")
+    parser.add_argument("--cursor", metavar="PARAM",
+                        help="also time keyset pages by sending the previous row's id as PARAM instead of offset")
+    parser.add_argument("--threshold", type=float, default=GROWTH_THRESHOLD,
+                        help="deepest/first latency ratio above which a linear trend is flagged")
+    parser.add_argument("--csv", help="write endpoint,offset,offset_ms,cursor_ms rows for plotting")
+    parser.add_argument("--json", action="store_true", help="print the profiles as JSON instead of charts")
+    parser.add_argument("--from-controllers", action="store_true",
+                        help="use the collection built from the Api.php set_rules() calls")
+    parser.add_argument("--tokens", help="token pool cache from token_pool.py; crawls as its first user")
+    parser.add_argument("--stand-in", action="store_true",
+                        help="target a built-in localhost stand-in instead of --base-url")
+    args = parser.parse_args()
+
+    collection = create_collection_from_controllers() if args.from_controllers else create_postman_collection()
+    specs = paginated_specs(collection, args.names or None)
+    if not specs:
+        parser.error("no limit/offset endpoints match the selection")
+    tokens = TokenPool.load(args.tokens) if args.tokens else None
+    profiles, opened = asyncio.run(_against_target(
+        args.base_url, args.concurrency or len(specs), args.stand_in,
+        lambda pool: crawl(pool, specs, args.offsets, args.samples, args.concurrency, tokens, args.cursor)))
+
+    if args.json:
+        print(json.dumps([{"endpoint": p.key, "offset_ms": p.offset_ms, "cursor_ms": p.cursor_ms,
+                           "fit": dict(zip(("slope_ms_per_row", "intercept_ms", "r_squared"), p.fit())),
+                           "degrades": p.degrades(args.threshold), "errors": p.errors} for p in profiles], indent=2))
+    else:
+        for profile in profiles:
+            print_profile(profile, args.threshold)
+        flagged = [p.key for p in profiles if p.degrades(args.threshold)]
+        print(f"\n📊 Endpoints crawled: {len(profiles)} · 🔌 Connections opened: {opened}")
+        if flagged:
+            print(f"⚠️  Latency grows linearly with offset: {', '.join(flagged)}")
+        else:
+            print("✅ No endpoint slows down linearly with offset")
+    if args.csv:
+        write_csv(profiles, args.csv)
+        print(f"📁 CSV: {args.csv}")
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Attribute response bytes to JSON field paths per endpoint, with duplicated subtrees and gzip/brotli savings
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import re
+import zlib
+from collections import defaultdict
+from json.decoder import scanstring
+
+from generate_postman_collection import create_collection_from_controllers, create_postman_collection
+from load_test import _against_target, collection_requests, send_spec
+from token_pool import TokenPool
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SAMPLES = 5
+TOP = 15
+# containers smaller than this are not worth reporting as duplicates
+MIN_DUPLICATE = 64
+WHITESPACE = re.compile(r"[ \t\r\n]*")
+SCALAR = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?|true|false|null")
+
+
+class PayloadProfile:
+    """Byte totals per field path for one endpoint, summed over sampled responses"""
+
+    def __init__(self):
+        self.responses = 0
+        self.bytes = 0
+        self.gzip = 0
+        self.brotli = 0
+        self.failed = 0
+        self.paths = defaultdict(int)  # bytes of the value, children included
+        self.keys = defaultdict(int)  # bytes of '"key":' for object members
+        self.duplicates = defaultdict(lambda: [0, 0])  # path -> [wasted bytes, extra copies]
+
+    def add(self, body):
+        """Profile one raw response body; returns False when it is not JSON"""
+        text = body.decode("latin-1")  # one char per byte, so spans are byte counts
+        containers = defaultdict(list)
+        try:
+            end = walk(text, WHITESPACE.match(text).end(), "", self, containers)
+        except (ValueError, IndexError):
+            self.failed += 1
+            return False
+        if text[end:].strip():
+            self.failed += 1
+            return False
+        self.responses += 1
+        self.bytes += len(body)
+        self.gzip += len(zlib.compress(body, 6))
+        if brotli is not None:
+            self.brotli += len(brotli.compress(body))
+        count_duplicates(containers, self.duplicates)
+        return True
+
+
+def walk(text, i, path, profile, containers):
+    """Scan the value at text[i], add its span to `path` and return the index after it"""
+    start = i
+    c = text[i]
+    if c == "{":
+        i = WHITESPACE.match(text, i + 1).end()
+        if text[i] == "}":
+            i += 1
+        else:
+            while True:
+                if text[i] != '"':
+                    raise ValueError(f"expected key at {i}")
+                key_start = i
+                key, i = scanstring(text, i + 1)
+                i = WHITESPACE.match(text, i).end()
+                if text[i] != ":":
+                    raise ValueError(f"expected ':' at {i}")
+                child = f"{path}.{key}" if path else key
+                i = WHITESPACE.match(text, i + 1).end()
+                profile.keys[child] += i - key_start
+                i = WHITESPACE.match(text, walk(text, i, child, profile, containers)).end()
+                if text[i] == "}":
+                    i += 1
+                    break
+                if text[i] != ",":
+                    raise ValueError(f"expected ',' at {i}")
+                i = WHITESPACE.match(text, i + 1).end()
+    elif c == "[":
+        i = WHITESPACE.match(text, i + 1).end()
+        if text[i] == "]":
+            i += 1
+        else:
+            child = path + "[]"
+            while True:
+                i = WHITESPACE.match(text, walk(text, i, child, profile, containers)).end()
+                if text[i] == "]":
+                    i += 1
+                    break
+                if text[i] != ",":
+                    raise ValueError(f"expected ',' at {i}")
+                i = WHITESPACE.match(text, i + 1).end()
+    elif c == '"':
+        _, i = scanstring(text, i + 1)
+    else:
+        match = SCALAR.match(text, i)
+        if not match:
+            raise ValueError(f"unexpected {c!r} at {i}")
+        i = match.end()
+    profile.paths[path] += i - start
+    if c in "{[" and i - start >= MIN_DUPLICATE:
+        containers[text[start:i]].append((start, i, path))
+    return i
+
+
+def count_duplicates(containers, duplicates):
+    """Add the bytes repeated by identical subtrees, counting each copy only at its outermost level.
+
+    Groups are taken largest first; a copy inside an already-counted repeat
+    of a bigger subtree is part of that waste and is skipped.
+    """
+    covered_starts, covered = [], []
+    for spans in sorted((s for s in containers.values() if len(s) > 1), key=lambda s: s[0][0] - s[0][1]):
+        kept = []
+        for start, end, path in spans:
+            at = bisect.bisect_right(covered_starts, start) - 1
+            if at >= 0 and covered[at][1] >= end:
+                continue
+            kept.append((start, end, path))
+        if len(kept) < 2:
+            continue
+        start, end, path = kept[0]
+        duplicates[path][0] += (end - start) * (len(kept) - 1)
+        duplicates[path][1] += len(kept) - 1
+        for span in kept[1:]:
+            at = bisect.bisect_left(covered_starts, span[0])
+            covered_starts.insert(at, span[0])
+            covered.insert(at, span)
+
+
+async def profile_endpoints(pool, specs, samples, tokens=None):
+    """Send each spec `samples` times and return {key: PayloadProfile}"""
+    profiles = {spec["key"]: PayloadProfile() for spec in specs}
+
+    async def one(spec):
+        for n in range(samples):
+            auth = tokens.user(n) if tokens else None
+            try:
+                _, response = await send_spec(pool, spec, auth=auth)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                profiles[spec["key"]].failed += 1
+                continue
+            profiles[spec["key"]].add(response.body)
+
+    await asyncio.gather(*(one(spec) for spec in specs))
+    return profiles
+
+
+def size(n):
+    return f"{n / 1024:.1f} KB" if n >= 1024 else f"{n:.0f} B"
+
+
+def print_profile(key, profile, top=TOP):
+    if not profile.responses:
+        print(f"\n{key}: no JSON responses ({profile.failed} failed)")
+        return
+    n = profile.responses
+    average = profile.bytes / n
+    line = (f"\n{key}: {size(average)} per response over {n} · gzip {size(profile.gzip / n)} "
+            f"({1 - profile.gzip / profile.bytes:.0%} smaller)")
+    if brotli is not None:
+        line += f" · brotli {size(profile.brotli / n)} ({1 - profile.brotli / profile.bytes:.0%} smaller)"
+    print(line)
+    key_bytes = sum(profile.keys.values())
+    print(f"  field names: {size(key_bytes / n)} ({key_bytes / profile.bytes:.0%} of the body)")
+    heaviest = sorted(((p, b) for p, b in profile.paths.items() if p), key=lambda pb: -pb[1])[:top]
+    for path, total in heaviest:
+        print(f"  {path:<56}{size(total / n):>10}{total / profile.bytes:>6.0%}"
+              f"{'  names ' + size(profile.keys[path] / n) if profile.keys.get(path) else ''}")
+    repeated = sorted(profile.duplicates.items(), key=lambda kv: -kv[1][0])[:top]
+    for path, (wasted, copies) in repeated:
+        print(f"  ♻️  {path or '(root)'}: {copies / n:.1f} repeated copies, {size(wasted / n)} "
+              f"({wasted / profile.bytes:.0%}) per response")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show which JSON fields make up each endpoint's response bytes")
+    parser.add_argument("names", nargs="*", help="endpoints to sample (rider ones as rider/<name>); default all get_*")
+    parser.add_argument("--base-url", default="http://localhost:9000")
+    parser.add_argument("--samples", type=int, default=SAMPLES, help="responses sampled per endpoint")
+    parser.add_argument("--top", type=int, default=TOP, help="paths and duplicates listed per endpoint")
+    parser.add_argument("--json", action="store_true", help="print the profiles as JSON")
+    parser.add_argument("--from-controllers", action="store_true",
+                        help="use the collection built from the Api.php set_rules() calls")
+    parser.add_argument("--tokens", help="token pool cache from token_pool.py; samples rotate through its users")
+    parser.add_argument("--stand-in", action="store_true",
+                        help="target a built-in localhost stand-in instead of --base-url")
+    args = parser.parse_args()
+
+    collection = create_collection_from_controllers() if args.from_controllers else create_postman_collection()
+    specs = [spec for spec in collection_requests(collection)
+             if (spec["key"] in args.names or spec["name"] in args.names if args.names
+                 else spec["name"].startswith("get_"))]
+    if not specs:
+        parser.error("no endpoints match the selection")
+    tokens = TokenPool.load(args.tokens) if args.tokens else None
+    profiles, opened = asyncio.run(_against_target(
+        args.base_url, min(len(specs), 50), args.stand_in,
+        lambda pool: profile_endpoints(pool, specs, args.samples, tokens)))
+
+    ranked = sorted(profiles.items(), key=lambda kv: -(kv[1].bytes / (kv[1].responses or 1)))
+    if args.json:
+        print(json.dumps({key: {"responses": p.responses, "bytes": p.bytes, "gzip": p.gzip,
+                                "brotli": p.brotli if brotli is not None else None,
+                                "paths": dict(p.paths), "keys": dict(p.keys),
+                                "duplicates": {path: {"bytes": w, "copies": c} for path, (w, c) in p.duplicates.items()}}
+                          for key, p in ranked}, indent=2))
+    else:
+        for key, profile in ranked:
+            print_profile(key, profile, args.top)
+        total = sum(p.bytes for p in profiles.values())
+        if total:
+            print(f"\n📊 {len(profiles)} endpoints, {size(total)} sampled · gzip would send "
+                  f"{sum(p.gzip for p in profiles.values()) / total:.0%} of it · 🔌 Connections opened: {opened}")
+        if brotli is None:
+            print("ℹ️  brotli module not installed; brotli sizes skipped")
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Replay captured API traffic against a staging stack, time-compressed, preserving per-user order
+
+A capture is JSON lines (optionally .gz), one request per line:
+  {"ts": 1760781600.25, "method": "manage_cart", "params": {"user_id": "12", ...}}
+Rider endpoints are written as "rider/<method>". The user comes from "user_id" on the
+record or in its params; requests without one are replayed unordered.
+"""
+
+import argparse
+import asyncio
+import gzip
+import heapq
+import itertools
+import json
+import time
+from collections import defaultdict
+
+from generate_postman_collection import create_collection_from_controllers, create_postman_collection
+from load_test import EndpointStats, _against_target, collection_requests, print_report, send_spec
+from token_pool import TokenPool
+
+REORDER_WINDOW = 2.0
+MAX_IN_FLIGHT = 1000
+
+
+def read_capture(path):
+    """Stream capture records one line at a time"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                record["ts"] = float(record["ts"])
+                if not isinstance(record.get("method"), str):
+                    raise KeyError("method")
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"{path}:{number}: not a capture record ({e})") from None
+            yield record
+
+
+def in_time_order(records, window=REORDER_WINDOW):
+    """Re-sort records that arrive up to `window` seconds out of order, holding only that window"""
+    heap = []
+    counter = itertools.count()
+    for record in records:
+        heapq.heappush(heap, (record["ts"], next(counter), record))
+        while heap[0][0] <= record["ts"] - window:
+            yield heapq.heappop(heap)[2]
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def resolve_endpoints(records, specs, strict=False, unknown=None):
+    """Attach the collection spec to each record; unknown endpoints are counted and dropped"""
+    by_key = {spec["key"]: spec for spec in specs}
+    unknown = defaultdict(int) if unknown is None else unknown
+    for record in records:
+        spec = by_key.get(record["method"])
+        if spec is None:
+            if strict:
+                raise ValueError(f"captured endpoint {record['method']!r} is not in the collection")
+            unknown[record["method"]] += 1
+            continue
+        yield spec, record
+
+
+async def replay(pool, resolved, speed=1.0, headers=None, tokens=None, max_in_flight=MAX_IN_FLIGHT,
+                 stats=None):
+    """Send resolved (spec, record) pairs at their captured offsets divided by `speed`.
+
+    speed=None sends as fast as the in-flight limit allows. Requests of the
+    same user are chained, so each starts only after the previous one has
+    completed; their latency is measured from the moment they became
+    eligible to send, not from the captured timestamp.
+    """
+    stats = defaultdict(EndpointStats) if stats is None else stats
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max_in_flight)
+    last_by_user = {}
+    auth_by_user = {}
+    tasks = set()
+    counters = {"max_lag": 0.0, "ordering_waits": 0, "sent": 0}
+
+    async def fire(spec, body, intended, previous, auth):
+        if previous is not None and not previous.done():
+            counters["ordering_waits"] += 1
+            await asyncio.wait([previous])
+            intended = max(intended, time.perf_counter())
+        try:
+            _, response = await send_spec(pool, dict(spec, body=body), headers, auth)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            stats[spec["key"]].failures += 1
+            return
+        stats[spec["key"]].record(time.perf_counter() - intended, response)
+
+    def finished(task, user):
+        tasks.discard(task)
+        slots.release()
+        if user is not None and last_by_user.get(user) is task:
+            del last_by_user[user]
+
+    started = time.perf_counter()
+    first_ts = None
+    for spec, record in resolved:
+        await slots.acquire()
+        if first_ts is None:
+            first_ts = record["ts"]
+        now = time.perf_counter()
+        intended = now if speed is None else started + (record["ts"] - first_ts) / speed
+        if intended > now:
+            await asyncio.sleep(intended - now)
+        counters["max_lag"] = max(counters["max_lag"], time.perf_counter() - intended)
+
+        body = record.get("params") or {}
+        user = record.get("user_id", body.get("user_id"))
+        user = None if user in (None, "") else str(user)
+        auth = None
+        if tokens is not None and user is not None:
+            auth = auth_by_user.get(user)
+            if auth is None:
+                auth = auth_by_user[user] = ((user, tokens.tokens[user]) if user in tokens.tokens
+                                             else tokens.next_user())
+        task = loop.create_task(fire(spec, body, intended, last_by_user.get(user), auth))
+        counters["sent"] += 1
+        tasks.add(task)
+        if user is not None:
+            last_by_user[user] = task
+        task.add_done_callback(lambda t, u=user: finished(t, u))
+    if tasks:
+        await asyncio.gather(*tasks)
+    return stats, time.perf_counter() - started, counters
+
+
+def parse_speed(value):
+    """'1', '10x' or 'max'/'asap' -> speed multiplier, None meaning as fast as possible"""
+    value = value.lower()
+    if value in ("max", "asap", "0"):
+        return None
+    speed = float(value[:-1] if value.endswith("x") else value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive or 'max'")
+    return speed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a captured day of API traffic")
+    parser.add_argument("capture", help="JSON-lines capture file, optionally gzipped")
+    parser.add_argument("--base-url", default="http://localhost:9000")
+    parser.add_argument("--speed", type=parse_speed, default=1.0, help="1, 10x, or max for as fast as possible")
+    parser.add_argument("--pool-size", type=int, default=100, help="keep-alive connections to the target")
+    parser.add_argument("--max-in-flight", type=int, default=MAX_IN_FLIGHT,
+                        help="outstanding requests before reading further into the capture")
+    parser.add_argument("--reorder-window", type=float, default=REORDER_WINDOW,
+                        help="seconds of out-of-order capture records to re-sort")
+    parser.add_argument("--strict", action="store_true", help="fail on endpoints missing from the collection")
+    parser.add_argument("--from-controllers", action="store_true",
+                        help="validate against the collection built from the Api.php set_rules() calls")
+    parser.add_argument("--tokens", help="token pool cache from token_pool.py; sends Bearer tokens per user")
+    parser.add_argument("--stand-in", action="store_true",
+                        help="target a built-in localhost stand-in instead of --base-url")
+    args = parser.parse_args()
+
+    collection = create_collection_from_controllers() if args.from_controllers else create_postman_collection()
+    tokens = TokenPool.load(args.tokens) if args.tokens else None
+    unknown = defaultdict(int)
+    resolved = resolve_endpoints(in_time_order(read_capture(args.capture), args.reorder_window),
+                                 collection_requests(collection), args.strict, unknown)
+    (stats, elapsed, counters), opened = asyncio.run(_against_target(
+        args.base_url, args.pool_size, args.stand_in,
+        lambda pool: replay(pool, resolved, args.speed, tokens=tokens, max_in_flight=args.max_in_flight)))
+
+    print_report(stats, elapsed)
+    print(f"▶️  Speed: {'max' if args.speed is None else f'{args.speed:g}x'} · {counters['sent']} requests replayed")
+    print(f"⏱️  Max scheduling lag: {counters['max_lag'] * 1000:.2f} ms")
+    print(f"🔗 Requests held back for per-user ordering: {counters['ordering_waits']}")
+    print(f"🔌 Connections opened: {opened}")
+    if unknown:
+        print(f"⚠️  Skipped {sum(unknown.values())} requests to endpoints not in the collection: "
+              + ", ".join(f"{name} ({n})" for name, n in sorted(unknown.items(), key=lambda kv: -kv[1])))
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Aggregate the Request_timing hook's NDJSON log into per-endpoint phase breakdowns and folded flame stacks
+"""
+
+import argparse
+import gzip
+import json
+import sys
+from collections import defaultdict
+
+from latency_histogram import LatencyHistogram
+
+BAR_WIDTH = 40
+# phase -> bar character, in stacking order
+PHASES = {"db": "█", "outbound": "▓", "controller": "▒", "framework": "░"}
+
+
+class EndpointPhases:
+    """Running totals for one route; nothing per request is kept besides the histogram"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.queries = 0
+        self.total = LatencyHistogram()
+        self.phase_ms = dict.fromkeys(PHASES, 0.0)
+        self.hosts = defaultdict(lambda: [0, 0.0])
+
+    def add(self, record):
+        total, controller = record["t"], record.get("c", record["t"])
+        db, outbound = record.get("qt", 0.0), record.get("ot", 0.0)
+        self.count += 1
+        if record.get("st", 200) >= 400:
+            self.errors += 1
+        self.queries += record.get("q", 0)
+        self.total.record(total * 1000)
+        self.phase_ms["db"] += db
+        self.phase_ms["outbound"] += outbound
+        self.phase_ms["controller"] += max(controller - db - outbound, 0.0)
+        self.phase_ms["framework"] += max(total - controller, 0.0)
+        for host, (calls, ms) in record.get("out", {}).items():
+            self.hosts[host][0] += calls
+            self.hosts[host][1] += ms
+
+    def shares(self):
+        whole = sum(self.phase_ms.values()) or 1.0
+        return {phase: ms / whole for phase, ms in self.phase_ms.items()}
+
+
+def read_records(paths):
+    """Yield decoded records from NDJSON files (gzip by .gz suffix, '-' for stdin), skipping torn lines"""
+    for path in paths:
+        if path == "-":
+            f = sys.stdin
+        elif path.endswith(".gz"):
+            f = gzip.open(path, "rt", encoding="utf-8")
+        else:
+            f = open(path, encoding="utf-8")
+        try:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    yield None
+                    continue
+                yield record if isinstance(record, dict) and "m" in record and "t" in record else None
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+def aggregate(records, run=None, routes=None):
+    """Fold records into {route: EndpointPhases}; returns (endpoints, matched, skipped)"""
+    endpoints = defaultdict(EndpointPhases)
+    matched = skipped = 0
+    for record in records:
+        if record is None:
+            skipped += 1
+            continue
+        if run and not str(record.get("id", "")).startswith(run + "-"):
+            continue
+        if routes and not any(r in record["m"] for r in routes):
+            continue
+        endpoints[record["m"]].add(record)
+        matched += 1
+    return endpoints, matched, skipped
+
+
+def stacked_bar(shares, width=BAR_WIDTH):
+    return "".join(PHASES[phase] * round(share * width) for phase, share in shares.items())
+
+
+def print_breakdown(endpoints, sort="time", top=None):
+    keys = {"time": lambda kv: -sum(kv[1].phase_ms.values()), "p95": lambda kv: -kv[1].total.percentile(95),
+            "count": lambda kv: -kv[1].count}
+    rows = sorted(endpoints.items(), key=keys[sort])[:top]
+    print(f"{'route':<40}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}{'q/req':>7}{'db':>6}{'out':>6}{'ctl':>6}{'fw':>6}")
+    for route, e in rows:
+        shares = e.shares()
+        print(f"{route[-40:]:<40}{e.count:>7}{e.total.percentile(50) / 1000:>9.2f}{e.total.percentile(95) / 1000:>9.2f}"
+              f"{e.queries / e.count:>7.1f}" + "".join(f"{shares[p]:>6.0%}" for p in PHASES))
+        print(f"  {stacked_bar(shares)}")
+        for host, (calls, ms) in sorted(e.hosts.items(), key=lambda kv: -kv[1][1]):
+            print(f"    ↳ {host}: {calls} calls, {ms / calls:.1f} ms each")
+    print("  " + "  ".join(f"{char} {phase}" for phase, char in PHASES.items()))
+
+
+def folded_stacks(endpoints):
+    """Lines of flamegraph.pl folded format, weighted by total µs per frame"""
+    for route, e in sorted(endpoints.items()):
+        frame = route.replace(";", ":")
+        if e.phase_ms["framework"]:
+            yield f"{frame};framework {round(e.phase_ms['framework'] * 1000)}"
+        if e.phase_ms["db"]:
+            yield f"{frame};controller;db {round(e.phase_ms['db'] * 1000)}"
+        attributed = 0.0
+        for host, (_, ms) in sorted(e.hosts.items()):
+            attributed += ms
+            yield f"{frame};controller;outbound;{host} {round(ms * 1000)}"
+        if e.phase_ms["outbound"] - attributed > 0.0005:
+            yield f"{frame};controller;outbound {round((e.phase_ms['outbound'] - attributed) * 1000)}"
+        if e.phase_ms["controller"]:
+            yield f"{frame};controller {round(e.phase_ms['controller'] * 1000)}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarise per-request phase timing written by the Request_timing hook")
+    parser.add_argument("logs", nargs="+", help="NDJSON logs ($config['request_timing_log']); .gz or - for stdin")
+    parser.add_argument("--run", help="only records whose X-Request-Id came from this load_test.py run id")
+    parser.add_argument("--route", action="append", help="only routes containing this text (repeatable)")
+    parser.add_argument("--sort", choices=("time", "p95", "count"), default="time",
+                        help="order by total time spent, p95 latency, or request count")
+    parser.add_argument("--top", type=int, help="show only the first N routes")
+    parser.add_argument("--folded", help="write folded stacks for flamegraph.pl / speedscope to this file")
+    parser.add_argument("--json", action="store_true", help="print the breakdown as JSON")
+    args = parser.parse_args()
+
+    endpoints, matched, skipped = aggregate(read_records(args.logs), args.run, args.route)
+    if args.json:
+        print(json.dumps({route: {"count": e.count, "errors": e.errors, "queries": e.queries,
+                                  "p50_ms": e.total.percentile(50) / 1000, "p95_ms": e.total.percentile(95) / 1000,
+                                  "phase_ms": e.phase_ms, "hosts": dict(e.hosts)}
+                          for route, e in endpoints.items()}, indent=2))
+    else:
+        print_breakdown(endpoints, args.sort, args.top)
+        print(f"📊 Records: {matched} across {len(endpoints)} routes"
+              + (f" for run {args.run}" if args.run else "") + (f" · ⚠️  {skipped} unreadable lines" if skipped else ""))
+    if args.folded:
+        with open(args.folded, "w", encoding="utf-8") as f:
+            for line in folded_stacks(endpoints):
+                f.write(line + "\n")
+        print(f"📁 Folded stacks: {args.folded}")
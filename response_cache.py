@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Read-through caching proxy for near-static catalog endpoints, invalidated by admin writes
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlencode
+
+from generate_postman_collection import CONTROLLERS, create_postman_collection, extract_rules, split_controller_methods
+from load_test import ConnectionPool, collection_requests
+
+DEFAULT_TTL = 120
+MAX_BYTES = 64 * 1024 * 1024
+CACHED_ENDPOINTS = {
+    "get_settings": 300, "get_categories": DEFAULT_TTL, "get_sections": 60, "get_slider_images": 300,
+    "get_offer_images": 300, "get_cities": 600, "get_faqs": 600, "get_languages": 600,
+    "rider/get_settings": 300,
+}
+# admin controller -> cached endpoints its writes can change
+INVALIDATES = {
+    "category": ["get_categories", "get_sections"],
+    "featured_sections": ["get_sections"],
+    "product": ["get_sections", "get_categories"],
+    "combo_products": ["get_sections"],
+    "attributes": ["get_sections"],
+    "taxes": ["get_sections"],
+    "tag": ["get_sections"],
+    "slider": ["get_slider_images"],
+    "offer": ["get_offer_images"],
+    "area": ["get_cities"],
+    "faq": ["get_faqs"],
+    "language": ["get_languages"],
+    "branch": ["get_categories", "get_sections", "get_slider_images", "get_offer_images", "get_settings"],
+}
+for _controller in ("setting", "web_setting", "payment_settings", "authentication_settings", "email_settings",
+                    "notification_settings", "sms_gateway_settings", "privacy_policy", "about_us", "contact_us",
+                    "rider_privacy_policy", "partner_privacy_policy", "time_slots"):
+    INVALIDATES[_controller] = ["get_settings", "rider/get_settings"]
+ADMIN_READ_RE = re.compile(r"^(index|get_\w+|view_\w+|\w+_list)$")
+# admin actions that write whatever the method; the admin UI sends deletes and reorders as GET
+ADMIN_WRITE_RE = re.compile(r"^(add|update|delete|remove|change|process|set|save|toggle)_\w+$")
+POST_FIELD_RE = re.compile(r"->post\(\s*['\"](\w+)['\"]")
+HOP_BY_HOP = {"connection", "keep-alive", "transfer-encoding", "content-length", "host", "proxy-connection", "te",
+              "upgrade", "trailer"}
+# never replayed from a stored HIT: they belong to the client whose miss filled the entry
+PER_CLIENT = {"set-cookie", "date", "age", "expires", "last-modified", "etag"}
+
+
+def cache_key_schema(collection, root=os.path.dirname(os.path.abspath(__file__)), endpoints=CACHED_ENDPOINTS):
+    """{endpoint_key: {"params": [...], "auth": bool}} for the cached endpoints.
+
+    Parameters are the collection's documented body params plus every
+    set_rules()/post() field the controller method reads, so undocumented
+    inputs such as branch_id still separate cache entries.
+    """
+    schema = {}
+    for spec in collection_requests(collection):
+        if spec["key"] in endpoints:
+            schema[spec["key"]] = {"path": spec["path"], "params": set(spec["body"]), "auth": False}
+    for base, rel_path in CONTROLLERS:
+        prefix = "rider/" if base == "{{rider_api_base}}" else ""
+        with open(os.path.join(root, rel_path), encoding="utf-8", errors="replace") as f:
+            source = f.read()
+        for _, name, body in split_controller_methods(source):
+            entry = schema.get(prefix + name)
+            if entry is None:
+                continue
+            entry["params"].update(rule["field"] for rule in extract_rules(body))
+            entry["params"].update(POST_FIELD_RE.findall(body))
+            entry["auth"] = "verify_tokens()" in body
+    for entry in schema.values():
+        entry["params"] = sorted(entry["params"])
+    return schema
+
+
+def normalize_body(body, params):
+    """Canonical key for a POST body, or None if it carries a parameter outside the schema"""
+    pairs = []
+    for name, value in parse_qsl(body.decode("utf-8", "replace"), keep_blank_values=True):
+        if name not in params:
+            return None
+        value = value.strip()
+        if value == "":
+            continue
+        if name in ("order", "p_order"):
+            value = value.upper()
+        elif value.isdigit():
+            value = str(int(value))
+        pairs.append((name, value))
+    return urlencode(sorted(pairs))
+
+
+class ResponseCache:
+    """Byte-bounded LRU of responses with per-entry TTLs and per-endpoint invalidation"""
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.entries = OrderedDict()
+        self.by_endpoint = {}
+        self.generations = {}
+        self.stats = {}
+
+    def _stats(self, endpoint):
+        stats = self.stats.get(endpoint)
+        if stats is None:
+            stats = self.stats[endpoint] = {"hits": 0, "misses": 0, "bypass": 0, "stores": 0, "evictions": 0,
+                                            "invalidated": 0, "expired": 0}
+        return stats
+
+    def count(self, endpoint, event):
+        self._stats(endpoint)[event] += 1
+
+    def get(self, endpoint, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._remove(key)
+            self.count(endpoint, "expired")
+            return None
+        self.entries.move_to_end(key)
+        return entry[2]
+
+    def generation(self, endpoint):
+        """Counter bumped by every invalidate(); a put() carrying an older value is dropped"""
+        return self.generations.get(endpoint, 0)
+
+    def put(self, endpoint, key, response, ttl, generation=None):
+        if generation is not None and generation != self.generation(endpoint):
+            return
+        if key in self.entries:
+            self._remove(key)
+        size = len(response) + len(key)
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (time.monotonic() + ttl, endpoint, response, size)
+        self.by_endpoint.setdefault(endpoint, set()).add(key)
+        self.bytes += size
+        self.count(endpoint, "stores")
+        while self.bytes > self.max_bytes:
+            oldest = next(iter(self.entries))
+            self.count(self.entries[oldest][1], "evictions")
+            self._remove(oldest)
+
+    def _remove(self, key):
+        _, endpoint, _, size = self.entries.pop(key)
+        self.bytes -= size
+        self.by_endpoint[endpoint].discard(key)
+
+    def invalidate(self, endpoint):
+        self.generations[endpoint] = self.generation(endpoint) + 1
+        keys = self.by_endpoint.pop(endpoint, set())
+        for key in keys:
+            self.bytes -= self.entries.pop(key)[3]
+        self._stats(endpoint)["invalidated"] += len(keys)
+        return len(keys)
+
+    def report(self):
+        rows = {}
+        for endpoint, stats in sorted(self.stats.items()):
+            lookups = stats["hits"] + stats["misses"]
+            rows[endpoint] = dict(stats, hit_ratio=round(stats["hits"] / lookups, 3) if lookups else None,
+                                  entries=len(self.by_endpoint.get(endpoint, ())))
+        return {"bytes": self.bytes, "max_bytes": self.max_bytes, "entries": len(self.entries), "endpoints": rows}
+
+
+def render_response(status, headers, body, cache_state=None, cookies=()):
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ""
+    lines = [f"HTTP/1.1 {status} {reason}"]
+    lines.extend(f"{k}: {v}" for k, v in headers.items() if k not in HOP_BY_HOP)
+    lines.extend("Set-Cookie: " + cookie for cookie in cookies)
+    if cache_state:
+        lines.append("X-Cache: " + cache_state)
+    lines.append(f"Content-Length: {len(body)}")
+    lines.append("Connection: keep-alive")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+class CachingProxy:
+    """Forward everything upstream, answering cacheable catalog POSTs from the cache"""
+
+    def __init__(self, upstream, schema, cache, ttls=None, pool_size=100):
+        self.pool = ConnectionPool(upstream, size=pool_size)
+        self.cache = cache
+        self.ttls = dict(CACHED_ENDPOINTS, **(ttls or {}))
+        self.routes = {entry["path"]: (key, entry) for key, entry in schema.items()}
+        self.in_flight = {}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                writer.write(await self.respond(method, target, headers, body))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, method, target, headers, body):
+        path = target.split("?", 1)[0].rstrip("/")
+        if path.startswith("/__cache/"):
+            return self.control(path, target, body)
+        route = self.routes.get(path) if method == "POST" else None
+        if route is None:
+            response = await self.forward(method, target, headers, body)
+            self.invalidate_for(method, path)
+            return response
+
+        endpoint, entry = route
+        normalized = normalize_body(body, entry["params"])
+        if normalized is None:
+            self.cache.count(endpoint, "bypass")
+            return await self.forward(method, target, headers, body, "BYPASS")
+        key = endpoint + "?" + normalized
+        if entry["auth"]:
+            auth = headers.get("authorization", "")
+            key += "#" + hashlib.sha1(auth.encode()).hexdigest()
+        cached = self.cache.get(endpoint, key)
+        if cached is not None:
+            self.cache.count(endpoint, "hits")
+            return cached
+        self.cache.count(endpoint, "misses")
+
+        # concurrent misses for one key share a single upstream request
+        pending = self.in_flight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = self.in_flight[key] = asyncio.get_running_loop().create_future()
+        # an invalidation landing while this miss is upstream makes its response unsafe to store
+        generation = self.cache.generation(endpoint)
+        try:
+            upstream = await self.pool.request(method, target, body, self._forward_headers(headers))
+            response = render_response(upstream.status, upstream.headers, upstream.body, "MISS", upstream.cookies)
+            if upstream.status == 200 and upstream.body[:200].find(b'"error":false') != -1:
+                shared = {k: v for k, v in upstream.headers.items() if k not in PER_CLIENT}
+                hit = render_response(upstream.status, shared, upstream.body, "HIT")
+                self.cache.put(endpoint, key, hit, self.ttls.get(endpoint, DEFAULT_TTL), generation)
+            future.set_result(response)
+            return response
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+            response = self._bad_gateway(e)
+            future.set_result(response)
+            return response
+        finally:
+            del self.in_flight[key]
+
+    @staticmethod
+    def _forward_headers(headers):
+        return {k: v for k, v in headers.items() if k not in HOP_BY_HOP}
+
+    @staticmethod
+    def _bad_gateway(error):
+        body = json.dumps({"error": True, "message": f"Upstream unavailable: {error}", "data": []}).encode()
+        return render_response(502, {"content-type": "application/json"}, body)
+
+    async def forward(self, method, target, headers, body, cache_state=None):
+        try:
+            upstream = await self.pool.request(method, target, body, self._forward_headers(headers))
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+            return self._bad_gateway(e)
+        return render_response(upstream.status, upstream.headers, upstream.body, cache_state, upstream.cookies)
+
+    def invalidate_for(self, method, path):
+        """Drop the endpoints an admin controller write can change, whether or not the write succeeded.
+
+        Writes are any POST that is not a read, plus add_/update_/delete_...
+        actions sent with any method.
+        """
+        parts = path.strip("/").split("/")
+        if len(parts) < 2 or parts[0] != "admin":
+            return
+        action = parts[2] if len(parts) > 2 else "index"
+        if not ADMIN_WRITE_RE.match(action) and (method != "POST" or ADMIN_READ_RE.match(action)):
+            return
+        for endpoint in INVALIDATES.get(parts[1].lower(), ()):
+            self.cache.invalidate(endpoint)
+
+    def control(self, path, target, body):
+        """/__cache/stats and /__cache/invalidate?entity=category or ?endpoint=get_sections"""
+        if path == "/__cache/stats":
+            payload = self.cache.report()
+        elif path == "/__cache/invalidate":
+            query = dict(parse_qsl(target.partition("?")[2]))
+            query.update(parse_qsl(body.decode("utf-8", "replace")))
+            if "endpoint" in query:
+                endpoints = [query["endpoint"]]
+            else:
+                endpoints = INVALIDATES.get(query.get("entity", "").lower(), [])
+            payload = {"invalidated": {e: self.cache.invalidate(e) for e in endpoints}}
+        else:
+            return render_response(404, {"content-type": "application/json"}, b'{"error":true}')
+        return render_response(200, {"content-type": "application/json"}, json.dumps(payload).encode())
+
+    async def close(self):
+        await self.pool.close()
+
+
+def print_cache_report(report):
+    print(f"{'endpoint':<24}{'hits':>9}{'misses':>9}{'bypass':>8}{'hit %':>8}{'entries':>9}{'evicted':>9}{'invalid':>9}")
+    for endpoint, s in report["endpoints"].items():
+        ratio = f"{s['hit_ratio'] * 100:.1f}" if s["hit_ratio"] is not None else "-"
+        print(f"{endpoint:<24}{s['hits']:>9}{s['misses']:>9}{s['bypass']:>8}{ratio:>8}{s['entries']:>9}"
+              f"{s['evictions']:>9}{s['invalidated']:>9}")
+    print(f"📦 {report['entries']} entries · {report['bytes'] / 1024:.0f} KB of {report['max_bytes'] / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Caching proxy for near-static catalog endpoints")
+    parser.add_argument("--upstream", default="http://localhost:9000", help="the PHP API origin")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9080)
+    parser.add_argument("--max-mb", type=float, default=MAX_BYTES / (1024 * 1024), help="cache size bound")
+    parser.add_argument("--ttl", nargs="*", help="per-endpoint TTL overrides in seconds, e.g. get_sections=30")
+    parser.add_argument("--report-interval", type=float, default=60.0, help="seconds between hit/miss reports")
+    parser.add_argument("--show-schema", action="store_true", help="print the derived cache-key schema and exit")
+    args = parser.parse_args()
+
+    schema = cache_key_schema(create_postman_collection())
+    if args.show_schema:
+        for endpoint, entry in sorted(schema.items()):
+            print(f"{endpoint:<22} {entry['path']:<40} {'🔒 ' if entry['auth'] else ''}{', '.join(entry['params'])}")
+        raise SystemExit(0)
+    ttls = {}
+    for pair in args.ttl or ():
+        name, _, seconds = pair.partition("=")
+        ttls[name] = float(seconds)
+
+    async def main():
+        cache = ResponseCache(int(args.max_mb * 1024 * 1024))
+        proxy = CachingProxy(args.upstream, schema, cache, ttls)
+        server = await asyncio.start_server(proxy.handle, args.host, args.port)
+        print(f"✅ Caching {len(schema)} endpoints on http://{args.host}:{args.port} → {args.upstream}")
+        try:
+            while True:
+                await asyncio.sleep(args.report_interval)
+                print_cache_report(cache.report())
+        finally:
+            server.close()
+            await proxy.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Parse table definitions and indexes out of the eRestro phpMyAdmin dump
+"""
+
+import re
+
+SCHEMA_FILE = "eRestro Single Vendor blank database - v1.1.2.sql"
+
+CREATE_RE = re.compile(r"^CREATE TABLE `(\w+)` \(")
+COLUMN_RE = re.compile(r"^\s*`(\w+)` (\w+)(?:\(([^)]*)\))?(.*?),?$")
+ALTER_RE = re.compile(r"^ALTER TABLE `(\w+)`")
+INDEX_RE = re.compile(r"ADD (PRIMARY KEY|UNIQUE KEY|KEY|FULLTEXT KEY|INDEX) ?(?:`(\w+)`)? ?\(([^)]*(?:\(\d+\))?[^)]*)\)")
+ENGINE_RE = re.compile(r"ENGINE=(\w+)")
+
+
+class Column:
+    """One column of a CREATE TABLE statement"""
+
+    __slots__ = ("name", "type", "size", "nullable", "default", "auto_increment")
+
+    def __init__(self, name, type_, size, nullable, default):
+        self.name = name
+        self.type = type_
+        self.size = size
+        self.nullable = nullable
+        self.default = default
+        self.auto_increment = False
+
+    def __repr__(self):
+        return f"Column({self.name!r}, {self.type!r})"
+
+
+class Table:
+    """Columns, engine and declared indexes of one table"""
+
+    def __init__(self, name):
+        self.name = name
+        self.columns = []
+        self.engine = None
+        self.primary_key = []
+        self.indexes = {}
+        self.unique = set()
+
+    def column(self, name):
+        for column in self.columns:
+            if column.name == name:
+                return column
+        return None
+
+    @property
+    def column_names(self):
+        return [c.name for c in self.columns]
+
+    def all_indexes(self):
+        """Yield (name, [columns]) for the primary key and every secondary index"""
+        if self.primary_key:
+            yield "PRIMARY", self.primary_key
+        yield from self.indexes.items()
+
+
+def _parse_default(rest):
+    match = re.search(r"DEFAULT ('(?:[^']|'')*'|\S+)", rest)
+    if not match:
+        return None
+    value = match.group(1)
+    if value.startswith("'"):
+        return value[1:-1].replace("''", "'")
+    return None if value == "NULL" else value
+
+
+def parse_schema(path=SCHEMA_FILE):
+    """Return {table_name: Table} for every CREATE TABLE / ALTER TABLE in a dump.
+
+    The dump is read line by line, so INSERT data of any size is skipped
+    without being held in memory.
+    """
+    tables = {}
+    current = None
+    altering = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if current is not None:
+                if line.startswith(")"):
+                    engine = ENGINE_RE.search(line)
+                    current.engine = engine.group(1) if engine else None
+                    current = None
+                    continue
+                match = COLUMN_RE.match(line.rstrip())
+                if match:
+                    name, type_, size, rest = match.groups()
+                    current.columns.append(Column(name, type_.lower(), size, "NOT NULL" not in rest,
+                                                  _parse_default(rest)))
+                continue
+            match = CREATE_RE.match(line)
+            if match:
+                current = tables.setdefault(match.group(1), Table(match.group(1)))
+                continue
+            match = ALTER_RE.match(line)
+            if match:
+                altering = tables.get(match.group(1))
+                continue
+            if altering is not None:
+                for kind, name, columns in INDEX_RE.findall(line):
+                    names = [re.sub(r"\(\d+\)", "", c).strip(" `") for c in columns.split(",")]
+                    if kind == "PRIMARY KEY":
+                        altering.primary_key = names
+                    else:
+                        altering.indexes[name or "_".join(names)] = names
+                        if kind == "UNIQUE KEY":
+                            altering.unique.add(name)
+                if "AUTO_INCREMENT" in line and "MODIFY" in line:
+                    column = altering.column(re.search(r"MODIFY `(\w+)`", line).group(1))
+                    if column is not None:
+                        column.auto_increment = True
+                if line.rstrip().endswith(";"):
+                    altering = None
+    return tables
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Pre-mint HS256 JWT tokens for seeded users, matching generate_tokens() in function_helper.php
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import os
+import re
+import time
+
+CONSTANTS_FILE = "application/config/constants.php"
+TOKEN_CACHE_FILE = ".token_pool.json"
+TOKEN_TTL = 60 * 60 * 24 * 365
+REFRESH_MARGIN = 60 * 60 * 24
+
+
+def read_secret_key(root=os.path.dirname(os.path.abspath(__file__))):
+    """Read JWT_SECRET_KEY from application/config/constants.php"""
+    with open(os.path.join(root, CONSTANTS_FILE), encoding="utf-8") as f:
+        match = re.search(r"define\(\s*'JWT_SECRET_KEY'\s*,\s*'([^']*)'", f.read())
+    if not match:
+        raise ValueError("JWT_SECRET_KEY is not defined in " + CONSTANTS_FILE)
+    return match.group(1)
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def mint_token(user_id, secret, issued_at=None, ttl=TOKEN_TTL):
+    """Encode the same claims generate_tokens() puts in a login token"""
+    issued_at = int(time.time()) if issued_at is None else int(issued_at)
+    header = {"typ": "JWT", "alg": "HS256"}
+    payload = {
+        "iat": issued_at,
+        "iss": "erestro",
+        "exp": issued_at + ttl,
+        "sub": "erestro_authentication",
+        "user_id": str(user_id)
+    }
+    signing_input = ".".join(_b64(json.dumps(part, separators=(",", ":")).encode()) for part in (header, payload))
+    signature = hmac.new(secret.encode(), signing_input.encode("ascii"), hashlib.sha256).digest()
+    return signing_input + "." + _b64(signature)
+
+
+def decode_claims(token):
+    """Decode a token payload without verifying it, like Jwt::decode_unsafe()"""
+    segment = token.split(".")[1]
+    return json.loads(base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4)))
+
+
+def parse_user_ids(spec):
+    """Parse '1-500,720,900-910' into a list of user ids"""
+    ids = []
+    for part in spec.split(","):
+        low, _, high = part.strip().partition("-")
+        ids.extend(range(int(low), int(high or low) + 1))
+    return ids
+
+
+class TokenPool:
+    """Cached tokens for a fixed set of user ids, handed out round-robin.
+
+    verify_app_request() only accepts a token equal to users.apikey, so the
+    pool has to be written to the database (see apikey_sql()) whenever
+    tokens are minted or refreshed.
+    """
+
+    def __init__(self, tokens, secret=None):
+        self.tokens = dict(tokens)
+        self.user_ids = sorted(self.tokens, key=int)
+        self.secret = secret
+        self._next = 0
+
+    @classmethod
+    def mint(cls, user_ids, secret, ttl=TOKEN_TTL):
+        issued_at = int(time.time())
+        return cls({str(uid): mint_token(uid, secret, issued_at, ttl) for uid in user_ids}, secret)
+
+    @classmethod
+    def load(cls, path=TOKEN_CACHE_FILE, secret=None):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["tokens"], secret)
+
+    def save(self, path=TOKEN_CACHE_FILE):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"minted_at": int(time.time()), "tokens": self.tokens}, f)
+
+    def refresh(self, horizon=REFRESH_MARGIN, ttl=TOKEN_TTL):
+        """Re-mint every token expiring within `horizon` seconds; return the refreshed ids"""
+        if self.secret is None:
+            raise ValueError("a secret key is required to refresh tokens")
+        deadline = time.time() + horizon
+        refreshed = [uid for uid, token in self.tokens.items() if decode_claims(token)["exp"] <= deadline]
+        issued_at = int(time.time())
+        for uid in refreshed:
+            self.tokens[uid] = mint_token(uid, self.secret, issued_at, ttl)
+        return refreshed
+
+    def user(self, index):
+        """Return (user_id, token) for virtual user number `index`"""
+        uid = self.user_ids[index % len(self.user_ids)]
+        return uid, self.tokens[uid]
+
+    def next_user(self):
+        self._next += 1
+        return self.user(self._next - 1)
+
+    def apikey_sql(self, user_ids=None):
+        """UPDATE statements that store the pooled tokens as each user's apikey"""
+        for uid in user_ids or self.user_ids:
+            yield f"UPDATE `users` SET `apikey` = '{self.tokens[uid]}' WHERE `id` = {int(uid)};\n"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-mint a JWT token pool for load testing")
+    parser.add_argument("--users", default="1-1000", help="user id ranges, e.g. 1-500,720")
+    parser.add_argument("--cache", default=TOKEN_CACHE_FILE)
+    parser.add_argument("--ttl", type=int, default=TOKEN_TTL, help="token lifetime in seconds")
+    parser.add_argument("--horizon", type=int, default=REFRESH_MARGIN,
+                        help="refresh cached tokens expiring within this many seconds")
+    parser.add_argument("--sql", help="write UPDATE users SET apikey statements to this file")
+    args = parser.parse_args()
+
+    secret = read_secret_key()
+    wanted = [str(uid) for uid in parse_user_ids(args.users)]
+    if os.path.exists(args.cache):
+        pool = TokenPool.load(args.cache, secret)
+        missing = [uid for uid in wanted if uid not in pool.tokens]
+        refreshed = pool.refresh(args.horizon, args.ttl)
+        pool = TokenPool(dict(pool.tokens, **TokenPool.mint(missing, secret, args.ttl).tokens), secret)
+        changed = set(missing) | set(refreshed)
+    else:
+        pool = TokenPool.mint(wanted, secret, args.ttl)
+        changed = set(wanted)
+    pool.save(args.cache)
+
+    print(f"✅ Token pool ready: {len(pool.tokens)} users")
+    print(f"📁 File: {args.cache}")
+    print(f"🔑 Minted or refreshed: {len(changed)}")
+    if args.sql:
+        with open(args.sql, "w", encoding="utf-8") as f:
+            f.writelines(pool.apikey_sql())
+        print(f"🗄️  apikey updates written to {args.sql}")
+    elif changed:
+        print("⚠️  Re-run with --sql and load it so users.apikey matches the pool")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Benchmark the image-upload endpoints with multipart bodies streamed from memory-mapped fixtures
+"""
+
+import argparse
+import asyncio
+import mmap
+import os
+import random
+import struct
+import zlib
+
+from generate_postman_collection import create_collection_from_controllers, create_postman_collection
+from load_test import EndpointStats, _against_target, collection_requests, send_spec
+from token_pool import TokenPool
+
+FIXTURE_DIR = "upload_fixtures"
+# name -> (width, height); noise pixels so the PNGs barely compress, like photos
+SIZE_CLASSES = {
+    "thumb": (200, 150),
+    "vga": (640, 480),
+    "photo": (1280, 960),
+    "camera": (2000, 1500),
+}
+# set_product_rating documents `images[]`, but the controller reads the files
+# from product_rating_data[n][images][], so that is where they must go to be resized
+FIELD_OVERRIDES = {"set_product_rating": "product_rating_data[0][images][]"}
+ORDER_ID = "1"
+CONTROL = "get_settings"
+REQUESTS = 20
+CONCURRENCY = 4
+
+
+def write_png(path, width, height, seed):
+    """Write a valid RGB PNG of random pixels"""
+    rng = random.Random(seed)
+    rows = b"".join(b"\x00" + rng.randbytes(width * 3) for _ in range(height))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(rows, 6)))
+        f.write(chunk(b"IEND", b""))
+
+
+def ensure_fixtures(directory=FIXTURE_DIR, classes=SIZE_CLASSES):
+    """Create any missing fixture images and return {class: path}"""
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for i, (name, (width, height)) in enumerate(classes.items()):
+        path = os.path.join(directory, f"{name}_{width}x{height}.png")
+        if not os.path.exists(path):
+            write_png(path, width, height, seed=i)
+        paths[name] = path
+    return paths
+
+
+class MappedFixtures:
+    """Fixture files mapped read-only once; every request sends the same memoryview"""
+
+    def __init__(self, paths):
+        self.maps = {}
+        self.views = {}
+        for name, path in paths.items():
+            with open(path, "rb") as f:
+                self.maps[name] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.views[name] = memoryview(self.maps[name])
+        self.names = {name: os.path.basename(path) for name, path in paths.items()}
+
+    def files(self, name, field, count=1):
+        return [(field, self.names[name], "image/png", self.views[name]) for _ in range(count)]
+
+    def close(self):
+        for view in self.views.values():
+            view.release()
+        for mapped in self.maps.values():
+            mapped.close()
+
+
+def upload_specs(collection, names=None):
+    """Collection requests that carry at least one file param"""
+    return [spec for spec in collection_requests(collection, names) if spec["files"]]
+
+
+async def bench(pool, spec, files, requests, concurrency, auth=None):
+    """Send `requests` identical uploads, `concurrency` at a time, and return their EndpointStats"""
+    stats = EndpointStats()
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            try:
+                latency, response = await send_spec(pool, spec, auth=auth, files=files)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                stats.failures += 1
+                continue
+            stats.record(latency, response)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return stats
+
+
+def rating_body(body, order_id):
+    """Nest set_product_rating's flat product_id/rating/comment under product_rating_data[0]
+
+    The controller requires order_id and only reads product_rating_data, and it
+    checks the product was delivered in that order before uploading anything.
+    """
+    body = dict(body)
+    nested = {key: body.pop(key, default) for key, default in (("product_id", "1"), ("rating", "4"), ("comment", "Done"))}
+    body["order_id"] = order_id
+    body.update({f"product_rating_data[0][{key}]": value for key, value in nested.items()})
+    return body
+
+
+BODY_OVERRIDES = {"set_product_rating": rating_body}
+
+
+async def run_bench(pool, specs, control, fixtures, classes, requests, concurrency, files_per_request, tokens):
+    """Measure every upload endpoint and the control endpoint at each size class.
+
+    Returns {(endpoint, class): (EndpointStats, bytes per request, wall seconds)}.
+    The control endpoint ignores files, so it prices transferring and parsing
+    the same body without the upload library and resize work.
+    """
+    auth = tokens.user(0) if tokens else None
+    results = {}
+    for name in classes:
+        size = len(fixtures.views[name]) * files_per_request
+        for spec in [control] + specs:
+            field = FIELD_OVERRIDES.get(spec["name"], spec["files"][0] if spec["files"] else "image")
+            started = asyncio.get_running_loop().time()
+            stats = await bench(pool, spec, fixtures.files(name, field, files_per_request), requests, concurrency,
+                                auth)
+            results[spec["key"], name] = (stats, size, asyncio.get_running_loop().time() - started)
+    return results
+
+
+def print_upload_report(results, specs, control, classes):
+    print(f"{'endpoint':<24}{'class':<8}{'KB':>8}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'MB/s':>9}"
+          f"{'errors':>8}{'server ms':>11}")
+    for spec in [control] + specs:
+        for name in classes:
+            stats, size, wall = results[spec["key"], name]
+            h = stats.latency
+            p50 = h.percentile(50) / 1000
+            line = (f"{spec['key']:<24}{name:<8}{size / 1024:>8.0f}{stats.count:>7}{p50:>10.2f}"
+                    f"{h.percentile(95) / 1000:>10.2f}{stats.count * size / wall / 1e6 if wall else 0:>9.2f}"
+                    f"{stats.errors + stats.failures:>8}")
+            if spec is not control:
+                line += f"{p50 - results[control['key'], name][0].latency.percentile(50) / 1000:>11.2f}"
+            print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure upload throughput and server-side resize cost per image size")
+    parser.add_argument("names", nargs="*", help="upload endpoints to hit; default all with file params")
+    parser.add_argument("--base-url", default="http://localhost:9000")
+    parser.add_argument("--classes", type=lambda s: s.split(","), default=list(SIZE_CLASSES),
+                        help=f"comma-separated size classes ({', '.join(SIZE_CLASSES)})")
+    parser.add_argument("--requests", type=int, default=REQUESTS, help="uploads per endpoint and size class")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--files", type=int, default=1, help="file parts per request")
+    parser.add_argument("--control", default=CONTROL,
+                        help="endpoint that ignores uploads; its latency is subtracted to get server-side cost")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR, help="directory holding the generated PNG fixtures")
+    parser.add_argument("--from-controllers", action="store_true",
+                        help="use the collection built from the Api.php set_rules() calls")
+    parser.add_argument("--tokens", help="token pool cache from token_pool.py; uploads as its first user")
+    parser.add_argument("--order-id", default=ORDER_ID,
+                        help="delivered order of the uploading user that holds the rated product (set_product_rating)")
+    parser.add_argument("--stand-in", action="store_true",
+                        help="target a built-in localhost stand-in instead of --base-url")
+    args = parser.parse_args()
+
+    unknown = set(args.classes) - set(SIZE_CLASSES)
+    if unknown:
+        parser.error(f"unknown size classes: {', '.join(sorted(unknown))}")
+    collection = create_collection_from_controllers() if args.from_controllers else create_postman_collection()
+    specs = [dict(spec, body=BODY_OVERRIDES[spec["name"]](spec["body"], args.order_id))
+             if spec["name"] in BODY_OVERRIDES else spec
+             for spec in upload_specs(collection, args.names or None)]
+    if not specs:
+        parser.error("no endpoints with file params match the selection")
+    controls = collection_requests(collection, [args.control])
+    if not controls:
+        parser.error(f"control endpoint {args.control} is not in the collection")
+    tokens = TokenPool.load(args.tokens) if args.tokens else None
+
+    paths = ensure_fixtures(args.fixtures, {name: SIZE_CLASSES[name] for name in args.classes})
+    print(f"📁 Fixtures: {', '.join(f'{n} {os.path.getsize(p) / 1024:.0f} KB' for n, p in paths.items())}")
+    fixtures = MappedFixtures(paths)
+    try:
+        results, opened = asyncio.run(_against_target(
+            args.base_url, args.concurrency, args.stand_in,
+            lambda pool: run_bench(pool, specs, controls[0], fixtures, args.classes, args.requests,
+                                   args.concurrency, args.files, tokens)))
+    finally:
+        fixtures.close()
+
+    print_upload_report(results, specs, controls[0], args.classes)
+    print(f"📊 server ms = p50 minus {args.control} p50 for the same body · 🔌 Connections opened: {opened}")
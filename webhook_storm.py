@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Replay correctly signed payment-provider webhooks at high rates, with retries and reordering, and check for double credits
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import random
+import shlex
+import subprocess
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlencode
+
+from load_test import EndpointStats, _against_target
+
+API_PREFIX = "/app/v1/api/"
+# test secrets; the local stack's payment_method settings must hold the same values
+SECRETS = {
+    "stripe": "whsec_dailydose_test",
+    "razorpay": "rzp_webhook_test_secret",
+    "flutterwave": "FLW_TEST_SECRET_HASH",
+    "midtrans": "SB-Mid-server-dailydose-test",
+    "phonepe": "phonepe-test-salt-key",
+    "phonepe_salt_index": "1",
+}
+# handlers that call the provider's API while processing; on a local stack those calls
+# must be answered by a sandbox or stub
+CALLS_BACK = {"flutterwave": "transaction verify", "phonepe": "status check", "ipn": "IPN postback",
+              "razorpay": "capture on payment.authorized"}
+# handlers that leave one success transactions row per payment, keyed by the txn id they store;
+# midtrans_webhook never writes a row for a settlement
+ROW_CHECKED = {"stripe", "razorpay", "flutterwave", "phonepe", "ipn"}
+# handlers that credit the refill amount to the right user on every delivery; razorpay credits
+# amount/100/100, and only once a transactions row exists to take the user from
+BALANCE_CHECKED = {"stripe", "flutterwave", "phonepe", "ipn"}
+
+
+class Payment:
+    """One logical payment: an order payment, or a wallet refill when the order id is wallet-refill-user-*"""
+
+    __slots__ = ("provider", "order_id", "user_id", "amount", "txn_id", "wallet")
+
+    def __init__(self, provider, order_id, user_id, amount, txn_id, wallet):
+        self.provider = provider
+        self.order_id = order_id
+        self.user_id = user_id
+        self.amount = amount
+        self.txn_id = txn_id
+        self.wallet = wallet
+
+
+def hmac_sha256(secret, payload):
+    return hmac.new(secret.encode(), payload, hashlib.sha256).hexdigest()
+
+
+def stripe_request(payment, status, secrets, now):
+    """Stripe-Signature: t=<ts>,v1=HMAC-SHA256(secret, "<ts>.<body>"), as Stripe::construct_event checks"""
+    event_type = {"success": "charge.succeeded", "failed": "charge.failed", "pending": "charge.pending"}[status]
+    body = json.dumps({
+        "id": "evt_" + hashlib.sha1(f"{payment.txn_id}{status}".encode()).hexdigest()[:24], "type": event_type,
+        "data": {"object": {"id": "ch_" + payment.txn_id[3:], "payment_intent": payment.txn_id,
+                            "amount": round(payment.amount * 100), "currency": "inr",
+                            "balance_transaction": "txn_" + payment.txn_id[3:],
+                            "metadata": {"order_id": payment.order_id}},
+                 "metadata": {"order_id": payment.order_id}},
+    }).encode()
+    timestamp = str(int(now))
+    signature = hmac_sha256(secrets["stripe"], f"{timestamp}.".encode() + body)
+    return "stripe_webhook", {"Content-Type": "application/json",
+                              "Stripe-Signature": f"t={timestamp},v1={signature}"}, body
+
+
+def razorpay_request(payment, status, secrets, now):
+    """X-Razorpay-Signature: HMAC-SHA256(webhook secret, raw body)"""
+    event = {"success": "payment.captured", "failed": "payment.failed", "pending": "payment.authorized"}[status]
+    notes = {"order_id": payment.order_id, "user_id": str(payment.user_id)}
+    body = json.dumps({
+        "entity": "event", "event": event, "created_at": int(now),
+        "payload": {"payment": {"entity": {"id": payment.txn_id, "amount": round(payment.amount * 100),
+                                           "currency": "INR", "status": status, "notes": notes}},
+                    "order": {"entity": {"id": "order_" + payment.txn_id[4:], "receipt": payment.order_id,
+                                         "notes": notes}}},
+    }).encode()
+    return "razorpay_webhook", {"Content-Type": "application/json",
+                                "X-Razorpay-Signature": hmac_sha256(secrets["razorpay"], body)}, body
+
+
+def flutterwave_id(payment):
+    """Numeric Flutterwave transaction id; the handler stores it (event.data.id) as txn_id"""
+    return int(hashlib.sha1(payment.txn_id.encode()).hexdigest()[:8], 16)
+
+
+def flutterwave_request(payment, status, secrets, now):
+    """verif-hash carries the dashboard secret hash verbatim"""
+    flw_status = {"success": "successful", "failed": "failed", "pending": "pending"}[status]
+    txn = flutterwave_id(payment)
+    body = json.dumps({
+        "id": txn, "txRef": payment.order_id, "event": "charge.completed", "status": flw_status,
+        "amount": payment.amount, "currency": "NGN",
+        "data": {"id": txn, "tx_ref": payment.order_id, "amount": payment.amount, "currency": "NGN",
+                 "status": flw_status, "customer": {"email": f"user{payment.user_id}@example.com"}},
+    }).encode()
+    return "flutterwave_webhook", {"Content-Type": "application/json", "verif-hash": secrets["flutterwave"]}, body
+
+
+def midtrans_request(payment, status, secrets, now):
+    """signature_key = SHA512(order_id + status_code + gross_amount + server_key)"""
+    transaction_status, status_code = {"success": ("settlement", "200"), "failed": ("deny", "202"),
+                                       "pending": ("pending", "201")}[status]
+    gross_amount = f"{payment.amount:.2f}"
+    signature = hashlib.sha512(
+        f"{payment.order_id}{status_code}{gross_amount}{secrets['midtrans']}".encode()).hexdigest()
+    body = json.dumps({
+        "transaction_id": payment.txn_id, "order_id": payment.order_id, "status_code": status_code,
+        "gross_amount": gross_amount, "transaction_status": transaction_status, "payment_type": "credit_card",
+        "fraud_status": "accept", "status_message": "midtrans payment notification", "signature_key": signature,
+        "transaction_time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)),
+    }).encode()
+    return "midtrans_webhook", {"Content-Type": "application/json"}, body
+
+
+def phonepe_request(payment, status, secrets, now):
+    """X-VERIFY = SHA256(base64 response + salt key) + "###" + salt index"""
+    code = {"success": "PAYMENT_SUCCESS", "failed": "PAYMENT_ERROR", "pending": "PAYMENT_PENDING"}[status]
+    response = base64.b64encode(json.dumps({
+        "success": status == "success", "code": code, "message": code.replace("_", " ").title(),
+        "data": {"merchantId": "DAILYDOSETEST", "merchantTransactionId": payment.txn_id,
+                 "transactionId": "T" + payment.txn_id[4:], "amount": round(payment.amount * 100),
+                 "state": {"success": "COMPLETED", "failed": "FAILED", "pending": "PENDING"}[status]},
+    }).encode()).decode()
+    verify = (hashlib.sha256((response + secrets["phonepe"]).encode()).hexdigest()
+              + "###" + secrets["phonepe_salt_index"])
+    body = json.dumps({"response": response}).encode()
+    return "phonepe_webhook", {"Content-Type": "application/json", "X-VERIFY": verify}, body
+
+
+def ipn_request(payment, status, secrets, now):
+    """PayPal IPN is an unsigned form post; the handler validates it by posting it back to PayPal"""
+    body = urlencode({
+        "item_number": payment.order_id, "txn_id": payment.txn_id, "mc_gross": f"{payment.amount:.2f}",
+        "mc_currency": "USD", "custom": f"{payment.user_id}|{payment.order_id}",
+        "payment_status": {"success": "Completed", "failed": "Failed", "pending": "Pending"}[status],
+        "payer_email": f"user{payment.user_id}@example.com",
+    }).encode()
+    return "ipn", {"Content-Type": "application/x-www-form-urlencoded"}, body
+
+
+PROVIDERS = {
+    "stripe": stripe_request, "razorpay": razorpay_request, "flutterwave": flutterwave_request,
+    "midtrans": midtrans_request, "phonepe": phonepe_request, "ipn": ipn_request,
+}
+
+
+def make_payments(count, providers, users, orders, wallet_share, rng):
+    """Distinct payments spread over providers; wallet refills use the wallet-refill-user-<id>-<ts>-<n> ids"""
+    payments = []
+    for i in range(count):
+        provider = providers[i % len(providers)]
+        user_id = rng.choice(users)
+        wallet = rng.random() < wallet_share
+        order_id = (f"wallet-refill-user-{user_id}-{int(time.time())}-{rng.randint(10, 1000)}" if wallet
+                    else str(rng.choice(orders)))
+        txn_id = {"stripe": "pi_", "razorpay": "pay_", "phonepe": "TXN_"}.get(provider, "tx_") + f"{rng.getrandbits(56):014x}"
+        payments.append(Payment(provider, order_id, user_id, round(rng.uniform(50, 2000), 2), txn_id, wallet))
+    return payments
+
+
+def storm(payments, duplicate_rate, max_retries, reorder_window, pending_share, rng):
+    """Build the delivery list: (payment, status) with retries and locally shuffled order.
+
+    Some payments first deliver a "pending" event; each delivery is retried
+    1..max_retries more times with probability `duplicate_rate`; deliveries
+    are then shuffled within windows of `reorder_window`, so retries and the
+    final success can overtake earlier events as they do during incidents.
+    """
+    deliveries = []
+    for payment in payments:
+        events = ["pending", "success"] if rng.random() < pending_share else ["success"]
+        for status in events:
+            deliveries.append((payment, status))
+            if rng.random() < duplicate_rate:
+                deliveries.extend([(payment, status)] * rng.randint(1, max_retries))
+    if reorder_window > 1:
+        for start in range(0, len(deliveries), reorder_window):
+            window = deliveries[start:start + reorder_window]
+            rng.shuffle(window)
+            deliveries[start:start + reorder_window] = window
+    return deliveries
+
+
+async def send_storm(pool, deliveries, secrets, rate=None, concurrency=50):
+    """Send every delivery at `rate` per second (or as fast as `concurrency` allows) and return stats"""
+    stats = defaultdict(EndpointStats)
+    queue = asyncio.Queue()
+    for delivery in deliveries:
+        queue.put_nowait(delivery)
+    started = time.perf_counter()
+    sent = [0]
+
+    async def worker():
+        while not queue.empty():
+            payment, status = queue.get_nowait()
+            if rate:
+                delay = started + sent[0] / rate - time.perf_counter()
+                sent[0] += 1
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            endpoint, headers, body = PROVIDERS[payment.provider](payment, status, secrets, time.time())
+            began = time.perf_counter()
+            try:
+                response = await pool.request("POST", API_PREFIX + endpoint, body, headers)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                stats[payment.provider].failures += 1
+                continue
+            stats[payment.provider].record(time.perf_counter() - began, response)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return stats, time.perf_counter() - started
+
+
+def mysql_rows(args, sql):
+    """Run one query through the mysql client and return tab-separated rows"""
+    result = subprocess.run(["mysql", "--batch", "--skip-column-names", *shlex.split(args)], input=sql,
+                            capture_output=True, text=True, check=True)
+    return [line.split("\t") for line in result.stdout.splitlines() if line]
+
+
+def wallet_balances(mysql, user_ids):
+    ids = ",".join(str(int(u)) for u in sorted(set(user_ids)))
+    return {int(uid): float(balance or 0)
+            for uid, balance in mysql_rows(mysql, f"SELECT id, balance FROM users WHERE id IN ({ids});")}
+
+
+def stored_txn_id(payment):
+    return str(flutterwave_id(payment)) if payment.provider == "flutterwave" else payment.txn_id
+
+
+def seed_pending(mysql, payments):
+    """Insert the pending transactions rows checkout creates; phonepe_webhook ignores payments without one"""
+    rows = [p for p in payments if p.provider == "phonepe"]
+    for start in range(0, len(rows), 500):
+        values = ",".join("('%s',%d,'%s','phonepe','%s',%.2f,'pending','Payment pending')"
+                          % ("wallet" if p.wallet else "transaction", p.user_id, p.order_id, p.txn_id, p.amount)
+                          for p in rows[start:start + 500])
+        mysql_rows(mysql, "INSERT INTO transactions (transaction_type, user_id, order_id, type, txn_id, amount, "
+                          f"status, message) VALUES {values};")
+    return len(rows)
+
+
+def integrity_report(mysql, payments, before):
+    """Check each payment against what exactly-once delivery would leave behind.
+
+    Every ROW_CHECKED payment should have exactly one success transactions
+    row under the txn id its handler stores. Wallet deltas are compared only
+    for users whose refills all went through BALANCE_CHECKED providers, so a
+    provider's known mis-credit cannot cancel out another's double credit.
+    Returns ({user_id: excess}, {user_id: shortfall}, {txn_id: rows},
+    [payments without a row], users left out of the wallet check).
+    """
+    after = wallet_balances(mysql, before)
+    expected = defaultdict(float)
+    unchecked = set()
+    for payment in payments:
+        if payment.wallet:
+            expected[payment.user_id] += payment.amount
+            if payment.provider not in BALANCE_CHECKED:
+                unchecked.add(payment.user_id)
+    drift = {uid: after.get(uid, 0.0) - before[uid] - expected[uid] for uid in before if uid not in unchecked}
+
+    checked = [p for p in payments if p.provider in ROW_CHECKED]
+    rows = {}
+    for start in range(0, len(checked), 1000):
+        txn_ids = ",".join("'" + stored_txn_id(p) + "'" for p in checked[start:start + 1000])
+        rows.update((txn, int(n)) for txn, n in mysql_rows(
+            mysql, f"SELECT txn_id, COUNT(*) FROM transactions WHERE status = 'success' AND txn_id IN ({txn_ids}) "
+                   f"GROUP BY txn_id;"))
+    duplicated = {stored_txn_id(p): rows[stored_txn_id(p)] for p in checked if rows.get(stored_txn_id(p), 0) > 1}
+    missing = [p for p in checked if not rows.get(stored_txn_id(p))]
+    return ({uid: d for uid, d in drift.items() if d > 0.005}, {uid: -d for uid, d in drift.items() if d < -0.005},
+            duplicated, missing, unchecked)
+
+
+def print_storm_report(stats, elapsed, deliveries, payments):
+    print(f"{'provider':<14}{'sent':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for provider, s in sorted(stats.items()):
+        h = s.latency
+        print(f"{provider:<14}{s.count:>8}{s.count / elapsed:>10.1f}{h.percentile(50) / 1000:>10.2f}"
+              f"{h.percentile(95) / 1000:>10.2f}{h.percentile(99) / 1000:>10.2f}{s.errors:>8}")
+    total = sum(s.count for s in stats.values())
+    print(f"📊 {total} deliveries of {len(payments)} payments in {elapsed:.2f}s ({total / elapsed:.1f}/s); "
+          f"{len(deliveries) - len(payments)} were retries or earlier-status events")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Storm the payment webhooks with signed, duplicated, reordered events")
+    parser.add_argument("--base-url", default="http://localhost:9000")
+    parser.add_argument("--providers", default=",".join(PROVIDERS),
+                        help="comma-separated subset of: " + ", ".join(PROVIDERS))
+    parser.add_argument("--payments", type=int, default=1000, help="distinct payments to generate")
+    parser.add_argument("--wallet-share", type=float, default=0.5, help="share of payments that are wallet refills")
+    parser.add_argument("--pending-share", type=float, default=0.3,
+                        help="share of payments that deliver a pending event before success")
+    parser.add_argument("--duplicate-rate", type=float, default=0.3, help="chance each delivery is retried")
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--reorder-window", type=int, default=20, help="deliveries shuffled together")
+    parser.add_argument("--rate", type=float, help="deliveries per second (default: as fast as possible)")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", default="2-101", help="existing user ids, e.g. 2-101")
+    parser.add_argument("--orders", default="1-1000", help="existing order ids for order payments, e.g. 1-1000")
+    parser.add_argument("--secrets", help="JSON file overriding the test secrets")
+    parser.add_argument("--mysql", help="mysql client arguments for the integrity check, e.g. '-h 127.0.0.1 -u root erestro'")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--stand-in", action="store_true",
+                        help="target a built-in localhost stand-in instead of --base-url")
+    args = parser.parse_args()
+
+    providers = args.providers.split(",")
+    unknown = [p for p in providers if p not in PROVIDERS]
+    if unknown:
+        parser.error("unknown providers: " + ", ".join(unknown))
+    secrets = dict(SECRETS)
+    if args.secrets:
+        with open(args.secrets, encoding="utf-8") as f:
+            secrets.update(json.load(f))
+    low, _, high = args.users.partition("-")
+    users = list(range(int(low), int(high or low) + 1))
+    low, _, high = args.orders.partition("-")
+    orders = list(range(int(low), int(high or low) + 1))
+
+    rng = random.Random(args.seed)
+    payments = make_payments(args.payments, providers, users, orders, args.wallet_share, rng)
+    deliveries = storm(payments, args.duplicate_rate, args.max_retries, args.reorder_window, args.pending_share, rng)
+    before = wallet_balances(args.mysql, users) if args.mysql else None
+    if args.mysql and "phonepe" in providers:
+        print(f"🧾 Seeded {seed_pending(args.mysql, payments)} pending phonepe transactions")
+
+    (stats, elapsed), opened = asyncio.run(_against_target(
+        args.base_url, args.concurrency, args.stand_in,
+        lambda pool: send_storm(pool, deliveries, secrets, args.rate, args.concurrency)))
+    print_storm_report(stats, elapsed, deliveries, payments)
+    print(f"🔌 Connections opened: {opened}")
+    for provider in providers:
+        if provider in CALLS_BACK:
+            print(f"⚠️  {provider} handler calls the provider API ({CALLS_BACK[provider]}); "
+                  f"point it at a sandbox or stub on the local stack")
+
+    if args.mysql:
+        over_credited, under_credited, duplicated, missing, unchecked = integrity_report(args.mysql, payments, before)
+        if over_credited:
+            print(f"💸 Double-credited wallets: {len(over_credited)} users, "
+                  f"{sum(over_credited.values()):.2f} credited beyond the refills sent")
+            for uid, excess in sorted(over_credited.items(), key=lambda kv: -kv[1])[:10]:
+                print(f"   user {uid}: +{excess:.2f}")
+        else:
+            print("✅ No wallet was credited more than once")
+        if under_credited:
+            print(f"📉 Under-credited wallets: {len(under_credited)} users, "
+                  f"{sum(under_credited.values()):.2f} short of the refills sent")
+        if unchecked:
+            print(f"ℹ️  {len(unchecked)} users left out of the wallet check: they had refills through "
+                  + ", ".join(sorted(set(providers) - BALANCE_CHECKED)) + ", which do not credit the amount sent")
+        if duplicated:
+            print(f"🧾 Duplicated transaction rows: {len(duplicated)} txn_ids, "
+                  f"{sum(duplicated.values()) - len(duplicated)} extra rows")
+            for txn, n in sorted(duplicated.items(), key=lambda kv: -kv[1])[:10]:
+                print(f"   {txn}: {n} rows")
+        else:
+            print("✅ No payment has more than one success transaction row")
+        if missing:
+            print(f"📭 Payments without a success transaction row: {len(missing)} ("
+                  + ", ".join(f"{provider} {n}" for provider, n in sorted(
+                      Counter(p.provider for p in missing).items())) + ")")
+        if "midtrans" in providers:
+            print("ℹ️  midtrans_webhook writes nothing on settlement; its payments are not checked")
+    elif "phonepe" in providers:
+        print("⚠️  phonepe_webhook ignores payments without a pending transactions row; pass --mysql to seed them")
+    if not args.mysql:
+        print("ℹ️  Pass --mysql to check wallets and transaction rows for double credits")